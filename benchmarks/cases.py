@@ -0,0 +1,344 @@
+'''
+This module defines the set of benchmark cases timed by this project's main.py
+Every input a case needs is generated synthetically into a scratch folder, so the benchmarks run the same way on any machine with the application's
+requirements installed
+'''
+
+import json
+import numpy as np
+
+from pathlib import Path
+
+import led.src.actions as actions
+
+from led.src.ledmodels import Gauges, QuarterWave, ScrollingWindow
+from led.src.signalaggregators import SimpleAggregator
+from led.src.signalgenerators import ConstantGenerator, MorseCodeGenerator, SignalRepeater, SineWaveGenerator
+from led.src.video import video_mode_filename
+
+# Define a set of defaults used by the next functions
+default_wavelength = 40.0
+default_gauges = 10
+default_colormap_name = "hot"
+morse_message = "the quick brown fox jumps over the lazy dog 0123456789 "
+
+def morse_characters_needed(samples:int):
+	'''
+	This function returns a number of message characters whose Morse code is sure to be at least samples bits long
+	Each Morse code character takes at least four bits (a single dit and the three bits of spacing after it)
+	'''
+
+	return (samples // 4) + 1
+
+
+class BenchmarkInputs:
+	'''
+	This class generates and holds the synthetic input files used by the benchmark cases, all written into one scratch folder
+	Files are only generated the first time a case asks for them, and a file generated for a larger number of samples is reused for smaller ones
+	'''
+
+	folder = None
+	files = None
+
+	def __init__(self, folder:str):
+		'''
+		Parameters
+		----------
+		folder : str
+			The scratch folder into which the input files are written
+		'''
+
+		self.folder = Path(folder)
+		self.files = {}
+
+	def signal_file(self, samples:int):
+		'''
+		This method returns a JSON-formatted list file holding a random-walk signal of at least samples values, for led.src.signalgenerators.SignalRepeater
+
+		Parameters
+		----------
+		samples : int
+			The smallest number of values the signal must hold
+
+		Returns
+		-------
+		pathlib.Path
+			The path to the signal file
+		'''
+
+		return self.generate("signal", samples, lambda size: json.dumps(np.cumsum(np.random.default_rng(0).normal(size=size)).round(6).tolist()), "json")
+
+	def message_file(self, samples:int):
+		'''
+		This method returns a text file holding a message whose Morse code is at least samples bits long, for led.src.signalgenerators.MorseCodeGenerator
+
+		Parameters
+		----------
+		samples : int
+			The smallest number of Morse code bits the message must produce
+
+		Returns
+		-------
+		pathlib.Path
+			The path to the message file
+		'''
+
+		return self.generate("message", samples, lambda size: (morse_message * ((morse_characters_needed(size) // len(morse_message)) + 1)).strip(), "txt")
+
+	def signal_set_file(self, samples:int, gauges:int=default_gauges):
+		'''
+		This method returns a JSON-formatted signal set file for led.src.signalaggregators.SimpleAggregator, mixing sine wave, repeated and Morse code signals
+
+		Parameters
+		----------
+		samples : int
+			The smallest number of values each finite signal in the set must hold
+		gauges : int
+			The number of signals in the set
+
+		Returns
+		-------
+		pathlib.Path
+			The path to the signal set file
+		'''
+
+		# The aggregator looks for signal files named without a folder in its project folder, which is this scratch folder
+		signal_file = self.signal_file(samples).name
+		message_file = self.message_file(samples).name
+
+		def signal_set(size:int):
+			signals = []
+			for i in range(gauges):
+				if (i % 3 == 0):
+					signals.append({"generator": "SineWaveGenerator", "arguments": [default_wavelength + i, 50.0]})
+				elif (i % 3 == 1):
+					signals.append({"generator": "SignalRepeater", "arguments": [signal_file]})
+				else:
+					signals.append({"generator": "MorseCodeGenerator", "arguments": [message_file]})
+
+			return json.dumps(signals)
+
+		return self.generate(f"signalset{gauges}", samples, signal_set, "json")
+
+	def generate(self, name:str, samples:int, contents:any, extension:str):
+		'''
+		This method writes an input file with the contents built for at least samples values, unless one big enough was already written
+
+		Parameters
+		----------
+		name : str
+			The kind of input file
+		samples : int
+			The smallest number of values the file must hold
+		contents : any
+			A callable that takes a number of values and returns the file's contents as a string
+		extension : str
+			The file name extension
+
+		Returns
+		-------
+		pathlib.Path
+			The path to the input file
+		'''
+
+		if ((name not in self.files) or (self.files[name][0] < samples)):
+			path = self.folder / f"{name}_{samples}.{extension}"
+			with open(path, "w") as file_out:
+				file_out.write(contents(samples))
+
+			self.files[name] = (samples, path)
+
+		return self.files[name][1]
+
+
+def synthetic_frames(length:int, samples:int):
+	'''
+	This function generates a set of data frames that looks like a model run, a sine wave travelling along the LED string with a little noise
+
+	Parameters
+	----------
+	length : int
+		The number of LEDs in each frame
+	samples : int
+		The number of frames
+
+	Returns
+	-------
+	numpy.ndarray
+		The (samples, length) set of frames
+	'''
+
+	(times, positions) = np.meshgrid(np.arange(samples, dtype=float), np.arange(length, dtype=float), indexing="ij")
+
+	return np.sin(2.0 * np.pi * (times - positions) / default_wavelength) + (0.01 * np.random.default_rng(0).normal(size=(samples, length)))
+
+
+def static_frames(length:int, samples:int):
+	'''
+	This function generates a set of data frames that looks like a mostly static model run (e.g. gauges, or a scrolling window's zero-signal tail), a
+	handful of synthetic frames each held for a long run of frames
+	'''
+
+	distinct = synthetic_frames(length, 16)
+
+	return np.repeat(distinct, -(-samples // distinct.shape[0]), axis=0)[ : samples]
+
+
+def load_colormap(name:str=default_colormap_name):
+	'''
+	This function looks up a matplotlib colormap, matplotlib is only imported by the cases that need it
+	'''
+
+	from matplotlib import colormaps
+
+	return colormaps[name]
+
+
+# Each case function below is called once per timed repetition with (length, samples, inputs, folder)
+# It does all of its untimed set-up work and returns a callable with no arguments, and only that callable is timed
+
+def case_run_scrolling_window(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Run a scrolling window model with a sine wave
+	'''
+
+	(model, source) = (ScrollingWindow(length, "right", 0), SineWaveGenerator(default_wavelength))
+	return lambda: actions.run_model(model, source, samples)
+
+
+def case_run_quarter_wave(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Run a quarter-wave antenna model with a sine wave
+	'''
+
+	(model, source) = (QuarterWave(length), SineWaveGenerator(default_wavelength))
+	return lambda: actions.run_model(model, source, samples)
+
+
+def case_run_gauges(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Run a gauges model with an aggregator of mixed signals, one per gauge
+	'''
+
+	gauges = min(default_gauges, length // 3)
+	(model, source) = (Gauges(length, gauges), SimpleAggregator(inputs.signal_set_file(samples, gauges), str(inputs.folder)))
+	return lambda: actions.run_model(model, source, samples)
+
+
+def generator_case(create:any, block:bool):
+	'''
+	This function builds a case that pulls samples values out of a freshly created signal generator, either one at a time or as a single block
+	'''
+
+	def case(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+		generator = create(samples, inputs)
+		if (block):
+			return lambda: generator.next_block(samples)
+		else:
+			return lambda: [generator.next for i in range(samples)]
+
+	return case
+
+
+def case_aggregator(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Pull values one set at a time out of an aggregator of mixed signals
+	'''
+
+	aggregator = SimpleAggregator(inputs.signal_set_file(samples), str(inputs.folder))
+	return lambda: [aggregator.next for i in range(samples)]
+
+
+def case_aggregator_block(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Pull values out of an aggregator of mixed signals as a single block
+	'''
+
+	aggregator = SimpleAggregator(inputs.signal_set_file(samples), str(inputs.folder))
+	return lambda: aggregator.next_block(samples)
+
+
+def case_colorize_frames(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Colorize a set of frames with a matplotlib colormap
+	'''
+
+	(frames, colormap) = (synthetic_frames(length, samples), load_colormap())
+	return lambda: actions.colorize_frames(frames, colormap, frames[0].shape)
+
+
+def save_frames_case(extension:str, static:bool=False):
+	'''
+	This function builds a case that saves a set of synthetic frames (mostly static ones if static is True) to a file with the given extension
+	'''
+
+	def case(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+		frames = static_frames(length, samples) if (static) else synthetic_frames(length, samples)
+		return lambda: actions.save_frames(frames, str(folder / f"frames.{extension}"))
+
+	return case
+
+
+def case_save_frames_image(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Save a set of colorized frames as an image
+	'''
+
+	frames = synthetic_frames(length, samples)
+	(rgb_frames, brg_frames) = actions.colorize_frames(frames, load_colormap(), frames[0].shape)
+	return lambda: actions.save_frames_image(rgb_frames, str(folder / "frames.png"))
+
+
+def case_save_frames_video(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	Save a set of colorized frames as a video
+	'''
+
+	frames = synthetic_frames(length, samples)
+	(rgb_frames, brg_frames) = actions.colorize_frames(frames, load_colormap(), frames[0].shape)
+	return lambda: actions.save_frames_video(brg_frames, str(folder / "frames.mp4"), (length, 2))
+
+
+def save_frames_video_case(mode:str):
+	'''
+	This function builds a case that saves a set of colorized frames in the given video output mode, so that each mode's throughput can be compared with the
+	mp4v video of case_save_frames_video
+	'''
+
+	def case(length:int, samples:int, inputs:BenchmarkInputs, folder:Path):
+		frames = synthetic_frames(length, samples)
+		(rgb_frames, brg_frames) = actions.colorize_frames(frames, load_colormap(), frames[0].shape)
+		return lambda: actions.save_frames_video(brg_frames, video_mode_filename(str(folder / "frames.mp4"), mode), (length, 2), mode=mode)
+
+	return case
+
+
+# The full set of benchmark cases, in the order they are run
+# "uses_length" is False for cases that do not involve an LED string, they are only timed once per sample count
+benchmark_cases = [
+	{"name": "run_model/ScrollingWindow", "uses_length": True, "case": case_run_scrolling_window},
+	{"name": "run_model/QuarterWave", "uses_length": True, "case": case_run_quarter_wave},
+	{"name": "run_model/Gauges", "uses_length": True, "case": case_run_gauges},
+	{"name": "generator/SineWaveGenerator/next", "uses_length": False, "case": generator_case(lambda samples, inputs: SineWaveGenerator(default_wavelength), False)},
+	{"name": "generator/SineWaveGenerator/next_block", "uses_length": False, "case": generator_case(lambda samples, inputs: SineWaveGenerator(default_wavelength), True)},
+	{"name": "generator/ConstantGenerator/next", "uses_length": False, "case": generator_case(lambda samples, inputs: ConstantGenerator(1.0), False)},
+	{"name": "generator/ConstantGenerator/next_block", "uses_length": False, "case": generator_case(lambda samples, inputs: ConstantGenerator(1.0), True)},
+	{"name": "generator/MorseCodeGenerator/next", "uses_length": False, "case": generator_case(lambda samples, inputs: MorseCodeGenerator(inputs.message_file(samples)), False)},
+	{"name": "generator/MorseCodeGenerator/next_block", "uses_length": False, "case": generator_case(lambda samples, inputs: MorseCodeGenerator(inputs.message_file(samples)), True)},
+	{"name": "generator/SignalRepeater/next", "uses_length": False, "case": generator_case(lambda samples, inputs: SignalRepeater(inputs.signal_file(samples)), False)},
+	{"name": "generator/SignalRepeater/next_block", "uses_length": False, "case": generator_case(lambda samples, inputs: SignalRepeater(inputs.signal_file(samples)), True)},
+	{"name": "aggregator/SimpleAggregator/next", "uses_length": False, "case": case_aggregator},
+	{"name": "aggregator/SimpleAggregator/next_block", "uses_length": False, "case": case_aggregator_block},
+	{"name": "colorize_frames", "uses_length": True, "case": case_colorize_frames},
+	{"name": "save_frames/json", "uses_length": True, "case": save_frames_case("json")},
+	{"name": "save_frames/npy", "uses_length": True, "case": save_frames_case("npy")},
+	{"name": "save_frames/rle", "uses_length": True, "case": save_frames_case("rle")},
+	{"name": "save_frames/static-npy", "uses_length": True, "case": save_frames_case("npy", True)},
+	{"name": "save_frames/static-rle", "uses_length": True, "case": save_frames_case("rle", True)},
+	{"name": "save_frames_image", "uses_length": True, "case": case_save_frames_image},
+	{"name": "save_frames_video", "uses_length": True, "case": case_save_frames_video},
+	{"name": "save_frames_video/ffv1", "uses_length": True, "case": save_frames_video_case("ffv1")},
+	{"name": "save_frames_video/png", "uses_length": True, "case": save_frames_video_case("png")},
+	{"name": "save_frames_video/png-sequence", "uses_length": True, "case": save_frames_video_case("png-sequence")},
+	{"name": "save_frames_video/raw-sequence", "uses_length": True, "case": save_frames_video_case("raw-sequence")},
+]
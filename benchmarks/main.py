@@ -0,0 +1,278 @@
+'''
+This is the script that gets called when the benchmarks are run by the application's led.bat batch file
+It times the application's hot paths (model runs, signal generators, the aggregator, colorization and saving frames) over a matrix of LED lengths and
+sample counts, writes the results to a JSON-formatted file and compares them against a stored baseline to flag regressions
+Command line call -- led benchmarks <<command line parameters>>
+'''
+
+import json
+import numpy as np
+import platform
+import sys
+
+from argparse import ArgumentParser
+from datetime import datetime
+from os.path import exists
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cases import BenchmarkInputs, benchmark_cases
+
+default_results_file = "benchmark_results.json"
+default_baseline_file = "benchmark_baseline.json"
+default_lengths = "60,300,1000,5000"
+default_samples = "500,2000"
+default_repeat = 3
+default_tolerance = 0.25
+default_max_elements = 10000000
+
+
+def parse_integers(text:str, argument:str):
+	'''
+	This function parses a string of comma-separated positive integers from the command line
+
+	Parameters
+	----------
+	text : str
+		The command-line value
+	argument : str
+		The name of the command-line argument, used in error messages
+
+	Returns
+	-------
+	list[int]
+		The integers, in the order they were given
+	'''
+
+	try:
+		values = [int(value) for value in text.split(",") if (value.strip() != "")]
+	except:
+		raise Exception(f"{argument} argument must be a string of comma-separated positive integers, {text} is invalid")
+
+	if ((len(values) == 0) or (min(values) <= 0)):
+		raise Exception(f"{argument} argument must be a string of comma-separated positive integers, {text} is invalid")
+
+	return values
+
+
+def time_case(case:dict, length:int, samples:int, repeat:int, inputs:BenchmarkInputs, folder:Path):
+	'''
+	This function times one benchmark case at one LED length and sample count, repeating it and keeping both the best and the median time
+
+	Parameters
+	----------
+	case : dict
+		The benchmark case, an element of cases.benchmark_cases
+	length : int
+		The number of LEDs, None for cases that do not use an LED string
+	samples : int
+		The number of samples
+	repeat : int
+		The number of times the case is timed
+	inputs : cases.BenchmarkInputs
+		The set of synthetic input files
+	folder : pathlib.Path
+		The scratch folder for files written by the case
+
+	Returns
+	-------
+	dict
+		The result of the case, ready to be written out as JSON
+	'''
+
+	times = []
+	for i in range(repeat):
+		# Set-up work is done outside of the timed region, afresh for every repetition since model runs and generators change their own state
+		timed = case["case"](length, samples, inputs, folder)
+
+		start = perf_counter()
+		timed()
+		times.append(perf_counter() - start)
+
+	best_seconds = min(times)
+
+	return {
+		"case": case["name"],
+		"length": length,
+		"samples": samples,
+		"best_seconds": best_seconds,
+		"median_seconds": float(np.median(times)),
+		"samples_per_second": (samples / best_seconds) if (best_seconds > 0) else None,
+	}
+
+
+def result_key(result:dict):
+	'''
+	This function returns the key that matches a result to the same case, length and sample count in another set of results
+	'''
+
+	return (result["case"], result["length"], result["samples"])
+
+
+def compare_results(results:list, baseline:list, tolerance:float):
+	'''
+	This function compares a set of results against a baseline set of results
+
+	Parameters
+	----------
+	results : list[dict]
+		The results of this benchmark run
+	baseline : list[dict]
+		The results of the baseline benchmark run
+	tolerance : float
+		The fraction by which a result's best time can exceed the baseline's best time before it is flagged as a regression
+
+	Returns
+	-------
+	list[dict]
+		One comparison per result that has a matching baseline result, each holding the result's key, both best times, their ratio and whether
+		it is a regression
+	'''
+
+	baseline_results = {result_key(result): result for result in baseline}
+
+	return_comparisons = []
+	for result in results:
+		key = result_key(result)
+		if ((key in baseline_results) and (baseline_results[key]["best_seconds"] > 0)):
+			ratio = result["best_seconds"] / baseline_results[key]["best_seconds"]
+			return_comparisons.append({
+				"case": result["case"],
+				"length": result["length"],
+				"samples": result["samples"],
+				"baseline_seconds": baseline_results[key]["best_seconds"],
+				"best_seconds": result["best_seconds"],
+				"ratio": ratio,
+				"regression": ratio > (1.0 + tolerance),
+			})
+
+	return return_comparisons
+
+
+def compare_video_modes(results:list):
+	'''
+	This function compares the throughput of each video output mode (the save_frames_video/<mode> cases) with the lossy mp4v video (the save_frames_video
+	case) at the same LED length and sample count
+
+	Parameters
+	----------
+	results : list[dict]
+		The results of this benchmark run
+
+	Returns
+	-------
+	list[dict]
+		One comparison per video output mode result that has a matching mp4v result, each holding the mode, the result's length and sample count, both
+		throughputs and the mode's throughput as a multiple of mp4v's
+	'''
+
+	mp4v_results = {(result["length"], result["samples"]): result for result in results if (result["case"] == "save_frames_video")}
+
+	return_comparisons = []
+	for result in results:
+		key = (result["length"], result["samples"])
+		if ((result["case"].startswith("save_frames_video/")) and (key in mp4v_results) and (mp4v_results[key]["samples_per_second"] != None) and (result["samples_per_second"] != None)):
+			return_comparisons.append({
+				"mode": result["case"].split("/", 1)[1],
+				"length": result["length"],
+				"samples": result["samples"],
+				"mp4v_samples_per_second": mp4v_results[key]["samples_per_second"],
+				"samples_per_second": result["samples_per_second"],
+				"relative_throughput": result["samples_per_second"] / mp4v_results[key]["samples_per_second"],
+			})
+
+	return return_comparisons
+
+
+def main():
+	'''
+	This is the meat of this python script
+	'''
+
+	argument_parser = ArgumentParser()
+	argument_parser.add_argument("projectfolder", type=str, help="folder in which the benchmarks are located, the results and baseline files are kept in this folder by default")
+	argument_parser.add_argument("-l", "--lengths", type=str, default=default_lengths, help=f"LED lengths to benchmark (string of comma-separated ints, defaults to {default_lengths})")
+	argument_parser.add_argument("-n", "--samples", type=str, default=default_samples, help=f"Sample counts to benchmark (string of comma-separated ints, defaults to {default_samples})")
+	argument_parser.add_argument("-r", "--repeat", type=int, default=default_repeat, help=f"Number of times each case is timed, the best time is the one compared (int, defaults to {default_repeat})")
+	argument_parser.add_argument("-k", "--cases", type=str, help="Only run the cases whose names contain one of these strings (string of comma-separated strings)")
+	argument_parser.add_argument("-o", "--output", type=str, default=default_results_file, help=f"Destination file name for the results (defaults to {default_results_file})")
+	argument_parser.add_argument("-b", "--baseline", type=str, default=default_baseline_file, help=f"Baseline results file to compare against (defaults to {default_baseline_file})")
+	argument_parser.add_argument("--save-baseline", "--save_baseline", action="store_true", help="Flag indicating that these results should also be saved as the new baseline")
+	argument_parser.add_argument("--tolerance", type=float, default=default_tolerance, help=f"Fraction by which a best time can exceed the baseline before it is a regression (float, defaults to {default_tolerance})")
+	argument_parser.add_argument("--max-elements", "--max_elements", type=int, default=default_max_elements, help=f"Largest LED length times sample count to benchmark, larger combinations are skipped to bound memory use (int, defaults to {default_max_elements})")
+	arguments = argument_parser.parse_args()
+
+	lengths = parse_integers(arguments.lengths, "-l (--lengths)")
+	sample_counts = parse_integers(arguments.samples, "-n (--samples)")
+	repeat = max(arguments.repeat, 1)
+
+	(results_file, baseline_file) = [filename if (("/" in filename) or ("\\" in filename)) else f"{arguments.projectfolder}/{filename}" for filename in [arguments.output, arguments.baseline]]
+
+	cases = benchmark_cases
+	if ((arguments.cases != None) and (arguments.cases != "")):
+		patterns = [pattern for pattern in arguments.cases.split(",") if (pattern != "")]
+		cases = [case for case in benchmark_cases if (any([pattern in case["name"] for pattern in patterns]))]
+
+	results = []
+	with TemporaryDirectory() as scratch_folder:
+		inputs = BenchmarkInputs(scratch_folder)
+
+		for case in cases:
+			for samples in sample_counts:
+				for length in (lengths if (case["uses_length"]) else [None]):
+					if ((length != None) and (length * samples > arguments.max_elements)):
+						print(f"{case['name']:<42} length {length:>6} samples {samples:>8}  skipped (more than {arguments.max_elements} elements)")
+						continue
+
+					length_label = str(length) if (length != None) else "-"
+					result = time_case(case, length, samples, repeat, inputs, Path(scratch_folder))
+					results.append(result)
+					print(f"{case['name']:<42} length {length_label:>6} samples {samples:>8}  {result['best_seconds']:>10.4f} s  {result['samples_per_second']:>14.1f} samples/s")
+
+	report = {
+		"created": datetime.now().isoformat(timespec="seconds"),
+		"platform": platform.platform(),
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"repeat": repeat,
+		"results": results,
+	}
+
+	# Compare the throughput of the lossless video output modes with mp4v's, if both were run
+	report["video_modes"] = compare_video_modes(results)
+	if (report["video_modes"] != []):
+		print("")
+		for comparison in report["video_modes"]:
+			print(f"video mode {comparison['mode']:<14} length {comparison['length']:>6} samples {comparison['samples']:>8}  {comparison['relative_throughput']:>6.2f}x the throughput of mp4v")
+
+	# Compare against the baseline, if there is one
+	regressions = []
+	if (exists(baseline_file)):
+		with open(baseline_file) as file_in:
+			baseline = json.load(file_in)
+
+		report["baseline"] = baseline_file
+		report["comparisons"] = compare_results(results, baseline["results"], arguments.tolerance)
+
+		regressions = [comparison for comparison in report["comparisons"] if (comparison["regression"])]
+		print(f"\n{len(report['comparisons'])} result{'s' if (len(report['comparisons']) != 1) else ''} compared against baseline {baseline_file}, {len(regressions)} regression{'s' if (len(regressions) != 1) else ''}")
+		for comparison in regressions:
+			print(f"REGRESSION - {comparison['case']} length {comparison['length']} samples {comparison['samples']}: {comparison['baseline_seconds']:.4f} s -> {comparison['best_seconds']:.4f} s ({comparison['ratio']:.2f}x)")
+	else:
+		print(f"\nNo baseline file {baseline_file} was found, nothing was compared")
+
+	with open(results_file, "w") as file_out:
+		json.dump(report, file_out, indent=4)
+
+	if (arguments.save_baseline):
+		with open(baseline_file, "w") as file_out:
+			json.dump({key: value for (key, value) in report.items() if (key not in ["baseline", "comparisons", "video_modes"])}, file_out, indent=4)
+
+	# A non-zero exit status lets scripts and continuous integration jobs notice a regression
+	return 1 if (len(regressions) > 0) else 0
+
+
+if (__name__ == "__main__"):
+	# This Python script was invoked directly, call this script's main() method
+	sys.exit(main())
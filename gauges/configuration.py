@@ -1,9 +1,9 @@
 from argparse import ArgumentParser
-from matplotlib import colormaps
 from os.path import exists
 from pathlib import Path
 
 from led.src.baseclasses import Configuration as __BaseConfiguration__
+from led.src.framestream import channel_orders, default_channel_order
 
 class Configuration(__BaseConfiguration__):
 	'''
@@ -17,7 +17,11 @@ class Configuration(__BaseConfiguration__):
 	signal_file = None
 	scaling_factors = None
 	colormap_name = None
-	colormap = None
+	live = False
+	tick = None
+	duration = None
+	stream_file = None
+	channel_order = None
 
 	def __init__(self, **kwargs):
 		'''
@@ -62,6 +66,11 @@ class Configuration(__BaseConfiguration__):
 				self.argument_parser.add_argument("-s", "--signalset", "--messageset", type=str, required=True, help="JSON-formatted object file that contains a set of signals to be replayed and their desired configuration")
 				self.argument_parser.add_argument("-f", "--factors", "--scalingfactors", "--scaling-factors", type=str, help="Amount by which the signals being replayed will be scaled (string of comma-separated floats)")
 				self.argument_parser.add_argument("-m", "--map", type=str, help="matplotlib Colormap to be applied to the signal set generated by this project run (string)")
+				self.argument_parser.add_argument("--live", action="store_true", help="Flag indicating that the signal set file lists live sources (files, sockets or named pipes) instead of signal generators")
+				self.argument_parser.add_argument("--tick", type=float, help="For a live run, the number of seconds between frames (float)")
+				self.argument_parser.add_argument("--duration", type=float, help="For a live run, the number of seconds to run, until stopped with Ctrl+C if not present (float)")
+				self.argument_parser.add_argument("--stream", type=str, help="Optional destination file name for the colorized frames as a binary frame stream that an LED controller can play back (string)")
+				self.argument_parser.add_argument("--order", type=str, choices=list(channel_orders.keys()), default=default_channel_order, help=f"Channel order of the colors in the --stream file (defaults to {default_channel_order}, the order WS2812 LEDs expect)")
 
 				# The parser arguments for this configuration object have been set up, now parse the command line and check for the base set of expected/available
 				# arguments as defined by the superclass
@@ -98,11 +107,25 @@ class Configuration(__BaseConfiguration__):
 				if ((arguments.map != None) and (arguments.map != "")):
 					self.colormap_name = arguments.map
 
-				# Attempt to load the desired colormap from the matplotlib library
-				try:
-					self.colormap = colormaps[self.colormap_name]
-				except Exception as e:
-					self.errors.append(f"-m (--map) color map argument {self.colormap_name} was not found in matplotlib")
+				self.live = arguments.live
+
+				if ((arguments.tick != None) and (arguments.tick <= 0)):
+					self.errors.append(f"--tick argument must be a positive number, not {arguments.tick}")
+				else:
+					self.tick = arguments.tick
+
+				if ((arguments.duration != None) and (arguments.duration <= 0)):
+					self.errors.append(f"--duration argument must be a positive number, not {arguments.duration}")
+				else:
+					self.duration = arguments.duration
+
+				if (arguments.stream != None):
+					if (arguments.stream == ""):
+						self.errors.append("--stream argument must be a valid file name")
+					else:
+						self.stream_file = arguments.stream if (("/" in arguments.stream) or ("\\" in arguments.stream)) else f"{self.project_folder}/{arguments.stream}"
+
+				self.channel_order = arguments.order
 
 		# All configuration work has been done, check for errors and dipslay any that occurred
 		self.configured = len(self.errors) == 0
@@ -4,17 +4,25 @@ This also serves as an example project for how to set up any other projects
 Command line call -- led repeater <<command line parameters>>
 '''
 
+import asyncio
 import numpy as np
 
 from math import pi
-from  matplotlib import pyplot as plt
+from os.path import splitext
 
 import led.src.actions as actions
 
 from configuration import Configuration
+from led.src.colorschemes import alarm_level_colormap
+from led.src.deltaframes import DeltaFramesWriter
+from led.src.framestream import FrameStreamWriter
 from led.src.ledmodels import Gauges
+from led.src.liveaggregators import LiveAggregator, default_tick_seconds, run_live_model
 from led.src.signalaggregators import SimpleAggregator
 from led.src.signalgenerators import ConstantGenerator, SineWaveGenerator
+from led.src.sinks import ContactSheetSink, FramesSink, TimeSeriesSink
+from led.src.storage import BinaryFramesWriter, TimeSeriesWriter
+from led.src.video import video_sink
 
 default_time_series_file = "gauge_time_series.json"
 default_frames_file = "gauge_frames.json"
@@ -22,6 +30,51 @@ default_image_file = "gauge_image.png"
 default_video_file = "gauge_video.mp4"
 
 
+def live_sinks(configuration:Configuration, gauges:Gauges):
+	'''
+	This function builds the set of sinks that a live run streams its results into, writing the same files that a run of recorded signals saves at its end
+
+	Parameters
+	----------
+	configuration : Configuration
+		This project's configuration
+	gauges : led.src.ledmodels.Gauges
+		The gauges model being run
+
+	Returns
+	-------
+	list[led.src.baseclasses.FrameSink]
+		The time series, frames, image and video sinks, and the frame stream sink if there is a --stream file
+		A live run can go on indefinitely, so its image is a contact sheet overview that is built in bounded memory
+	'''
+
+	time_series_extension = splitext(configuration.time_series_file)[1].lower()
+	frames_extension = splitext(configuration.frames_file)[1].lower()
+
+	if (frames_extension == ".npy"):
+		frames_sink = BinaryFramesWriter(configuration.frames_file, gauges.frame.shape, float)
+	elif (frames_extension == ".rle"):
+		# Gauges hold their values between readings, so most of a live run's frames repeat the one before them
+		frames_sink = DeltaFramesWriter(configuration.frames_file, gauges.frame.shape, float)
+	elif (frames_extension == ".json"):
+		frames_sink = FramesSink(configuration.frames_file)
+	else:
+		raise Exception(f"the frames of a live run are written while it runs, so the frames file must end with .npy, .rle or .json, {configuration.frames_file} does not")
+
+	return_sinks = [
+		TimeSeriesWriter(configuration.time_series_file) if (time_series_extension in [".ndjson", ".jsonl", ".npy"]) else TimeSeriesSink(configuration.time_series_file),
+		frames_sink,
+		ContactSheetSink(configuration.image_file),
+		video_sink(configuration.video_file, configuration.video_mode),
+	]
+
+	if (configuration.stream_file != None):
+		# One frame is produced per tick, so that is the speed the frame stream is meant to be played at
+		return_sinks.append(FrameStreamWriter(configuration.stream_file, configuration.channel_order, 1.0 / (configuration.tick if (configuration.tick != None) else default_tick_seconds), led_count=int(np.prod(gauges.frame.shape))))
+
+	return return_sinks
+
+
 def main():
 	'''
 	This is the meat of this python script
@@ -32,58 +85,59 @@ def main():
 		# All required command-line parameters have been inspected and hav been found to be at least syntactically valid, attempt to run this project
 
 		# Initialize a simple signal aggregator that will be used to produce the signals that will be displayed by the gauges
-		aggregator = SimpleAggregator(configuration.signal_file, configuration.project_folder)
+		# For a live run, a live aggregator reads the latest value of each gauge from its files, sockets or named pipes instead
+		if (configuration.live):
+			aggregator = LiveAggregator(configuration.signal_file, configuration.project_folder, configuration.tick)
+		else:
+			aggregator = SimpleAggregator(configuration.signal_file, configuration.project_folder)
 
 		# Initialize the gauges window model
 		gauges = Gauges(configuration.length, len(aggregator.generators))
 
-		# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
-		# A pair of pyplot-based obects will be use to generate graphs while model is run
-		plt.ion()
-		figure = plt.figure()
-
-		# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
-		axis = figure.add_subplot(1, 1, 1)
-		axis.set_ylim(-2.1, 105.0)
-		line, = axis.plot(gauges.frame + 2)
+		# For a headless run, no graph is shown and the model runs without a live preview
+		figure = None
+		line = None
+		if (not configuration.headless):
+			# pyplot is only imported when there is a graph to show, a headless run never loads it
+			from matplotlib import pyplot as plt
+
+			# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
+			# A pair of pyplot-based obects will be use to generate graphs while model is run
+			plt.ion()
+			figure = plt.figure()
+
+			# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
+			axis = figure.add_subplot(1, 1, 1)
+			axis.set_ylim(-2.1, 105.0)
+			line, = axis.plot(gauges.frame + 2)
+
+		if (configuration.live):
+			# A live run can go on indefinitely, so its results are streamed into the files while it runs instead of being held until its end
+			# The gauges are colored with the same alarm-level color scheme as below
+			sinks = live_sinks(configuration, gauges)
+			try:
+				asyncio.run(run_live_model(gauges, aggregator, None, configuration.duration, figure, line, sinks, lambda frames: alarm_level_colormap.colorize_frames(frames, gauges.border_mask), False))
+			except KeyboardInterrupt:
+				print("The live run was stopped")
+			finally:
+				for sink in sinks:
+					sink.close()
+
+			print(aggregator)
+
+			if ((not configuration.headless) and (sinks[2].image != None)):
+				sinks[2].image.show()
+
+			return
 
 		(time_series, frames) = actions.run_model(gauges, aggregator, None, figure, line)
 
 		# Create colorized versions of the data frames using the colormap in the configuration
 		#(rgb_frames, brg_frames) = actions.colorize_frames(frames, configuration.colormap, window.frame.shape)
 
-		# Instead of using the colorize_frames method above, apply a specialized color filter to each frame
-
-		# First, initialize the color-related frames to be all zeros before iterating through the frames of data
-		rgb_frames = np.zeros((frames.shape[0], frames.shape[1], 3), dtype=np.uint8)
-		brg_frames = np.zeros((frames.shape[0], frames.shape[1], 3), dtype=np.uint8)
-
-		for i in range(frames.shape[0]):
-			for location in gauges.gauge_locations:
-				if (frames[i][location[0]] == None):
-					# This gauge is not returing any data, color this section black
-					rgb_frames[i][location[0] : location[1] + 1] = [0, 0, 0]
-					brg_frames[i][location[0] : location[1] + 1] = [0, 0, 0]
-				elif (frames[i][location[0]] <= 2):
-					# This gauge is very low (2 or lower), color this section green
-					rgb_frames[i][location[0] : location[1] + 1] = [0, 255, 0]
-					brg_frames[i][location[0] : location[1] + 1] = [0, 0, 255]
-				elif (frames[i][location[0]] <= 50):
-					# This gauge is high enough to be worth paying attention to (between 2 and 50), color this section a progressively brighter yellow based on its value
-					color_code = int(205 + (((frames[i][location[0]] - 2) / 48) * 50)) % 256
-					rgb_frames[i][location[0] : location[1] + 1] = [color_code, color_code , 0]
-					brg_frames[i][location[0] : location[1] + 1] = [0, color_code, color_code]
-				elif (frames[i][location[0]] <= 90):
-					# This gauge is high enough to pay closer attention to (between 50 and 90), color this section a progressively brighter orange based on its value
-					red_code = int(205 + (((frames[i][location[0]] - 50) / 40) * 50)) % 256
-					green_code = int(120 + (((frames[i][location[0]] - 50) / 40) * 45)) % 256
-					rgb_frames[i][location[0] : location[1] + 1] = [red_code, green_code, 0]
-					brg_frames[i][location[0] : location[1] + 1] = [0, red_code, green_code]
-				else:
-					# This gauge needs to be giving a warning (greater than 90), color this section a progressively brighter red based on its value
-					red_code = int(205 + (((min(frames[i][location[0]], 100) - 90) / 10) * 50)) % 256
-					rgb_frames[i][location[0] : location[1] + 1] = [red_code, 0, 0]
-					brg_frames[i][location[0] : location[1] + 1] = [0, red_code, 0]
+		# Instead of using the colorize_frames method above, apply the green / yellow / orange / red alarm-level color scheme to every gauge
+		# The border pixels between the gauges are left black
+		(rgb_frames, brg_frames) = alarm_level_colormap.colorize_frames(frames, gauges.border_mask)
 
 		# Save the time-series version of the model's result to a file
 		actions.save_time_series(time_series, configuration.time_series_file)
@@ -93,10 +147,15 @@ def main():
 
 		# Save the data frames from the model's result to an image file as a "temporal contact sheet"
 		image = actions.save_frames_image(rgb_frames, configuration.image_file)
-		image.show()
+		if (not configuration.headless):
+			image.show()
 
 		# Save the data frames from the model's result to a video file, with each frame of data representing a frame of video
-		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2))
+		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2), mode=configuration.video_mode)
+
+		if (configuration.stream_file != None):
+			# Save the colorized frames, exactly as they are, as a frame stream that an LED controller can play back
+			actions.save_frames_stream(rgb_frames, configuration.stream_file, configuration.channel_order)
 
 
 if (__name__ == "__main__"):
@@ -0,0 +1,176 @@
+'''
+This is a stand-in for a live data producer, it feeds the gauges project's live mode (--live) with made-up readings so that mode can be tried out without
+any real sensors
+Every tick it sends one line of comma-separated values, one per gauge, each a slow sine wave with a little noise that stays between 0 and 100
+It can append the lines to a file, serve them to every client of a TCP or UNIX socket server, or write them into a named pipe
+Command line call -- python producer.py <<file|tcp|unix|pipe>> <<file path, port or socket/pipe path>> <<command line parameters>>
+'''
+
+import asyncio
+import os
+import sys
+
+from argparse import ArgumentParser
+from math import pi, sin
+from random import Random
+from time import perf_counter
+
+default_gauges = 4
+default_rate = 20.0
+default_host = "127.0.0.1"
+
+
+class Readings:
+	'''
+	This class makes up the readings, each gauge has its own period, phase and noise
+	'''
+
+	def __init__(self, gauges:int, seed:int=None):
+		'''
+		Parameters
+		----------
+		gauges : int
+			The number of values in each line
+		seed : int
+			The seed of the random number generator, for repeatable readings
+		'''
+
+		self.random = Random(seed)
+		self.periods = [self.random.uniform(5.0, 30.0) for i in range(gauges)]
+		self.phases = [self.random.uniform(0.0, 2.0 * pi) for i in range(gauges)]
+		self.start = perf_counter()
+
+	def line(self):
+		'''
+		This method makes up the current line of readings
+
+		Returns
+		-------
+		bytes
+			The readings, comma-separated and ending in a newline
+		'''
+
+		seconds = perf_counter() - self.start
+		values = [50.0 + (45.0 * sin((2.0 * pi * seconds / period) + phase)) + self.random.gauss(0.0, 2.0) for (period, phase) in zip(self.periods, self.phases)]
+
+		return (",".join([f"{min(max(value, 0.0), 100.0):.2f}" for value in values]) + "\n").encode("utf-8")
+
+
+async def ticks(rate:float, duration:float=None):
+	'''
+	This asynchronous generator yields once per tick, for duration seconds or forever
+	'''
+
+	loop = asyncio.get_running_loop()
+	start = loop.time()
+	tick = 0
+	while ((duration == None) or (tick / rate < duration)):
+		tick = tick + 1
+		await asyncio.sleep(max(start + (tick / rate) - loop.time(), 0.0))
+		yield tick
+
+
+async def produce_file(filename:str, readings:Readings, rate:float, duration:float):
+	'''
+	This coroutine appends the readings to a file, flushing every line so a reader tailing the file sees it at once
+	'''
+
+	with open(filename, "ab", buffering=0) as file_out:
+		async for tick in ticks(rate, duration):
+			file_out.write(readings.line())
+
+
+async def produce_server(start_server:any, readings:Readings, rate:float, duration:float):
+	'''
+	This coroutine serves the readings to every client that connects to a server, started by calling start_server with the client handler
+	'''
+
+	clients = set()
+
+	async def client_connected(reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+		clients.add(writer)
+
+	server = await start_server(client_connected)
+	async with server:
+		async for tick in ticks(rate, duration):
+			line = readings.line()
+			for writer in list(clients):
+				if (writer.is_closing()):
+					clients.discard(writer)
+				else:
+					writer.write(line)
+
+		for writer in clients:
+			writer.close()
+
+
+async def produce_pipe(path:str, readings:Readings, rate:float, duration:float):
+	'''
+	This coroutine writes the readings into a named pipe, creating it if needed; while nothing is reading from the pipe the readings are thrown away
+	'''
+
+	if (not os.path.exists(path)):
+		os.mkfifo(path)
+
+	pipe = None
+	async for tick in ticks(rate, duration):
+		line = readings.line()
+		try:
+			if (pipe == None):
+				# A non-blocking open for writing fails until a reader has opened the pipe
+				pipe = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+
+			os.write(pipe, line)
+		except BlockingIOError:
+			# The reader is not keeping up, this line is dropped
+			pass
+		except OSError:
+			# There is no reader (yet, or any more)
+			if (pipe != None):
+				os.close(pipe)
+				pipe = None
+
+	if (pipe != None):
+		os.close(pipe)
+
+
+def main():
+	'''
+	This is the meat of this python script
+	'''
+
+	argument_parser = ArgumentParser()
+	argument_parser.add_argument("mode", type=str, choices=["file", "tcp", "unix", "pipe"], help="How the readings are sent")
+	argument_parser.add_argument("target", type=str, help="The file to append to, the TCP port to serve on, or the path of the UNIX socket or named pipe")
+	argument_parser.add_argument("-g", "--gauges", type=int, default=default_gauges, help=f"Number of values in each line (int, defaults to {default_gauges})")
+	argument_parser.add_argument("-r", "--rate", type=float, default=default_rate, help=f"Number of lines sent per second (float, defaults to {default_rate})")
+	argument_parser.add_argument("-d", "--duration", type=float, help="Number of seconds to keep sending, forever if not present (float)")
+	argument_parser.add_argument("--host", type=str, default=default_host, help=f"Address the TCP server listens on (defaults to {default_host})")
+	argument_parser.add_argument("--seed", type=int, help="Seed for the made-up readings, for repeatable runs (int)")
+	arguments = argument_parser.parse_args()
+
+	if ((arguments.gauges <= 0) or (arguments.rate <= 0)):
+		print("ERROR - -g (--gauges) and -r (--rate) arguments must be positive")
+		return 1
+
+	readings = Readings(arguments.gauges, arguments.seed)
+	if (arguments.mode == "file"):
+		producer = produce_file(arguments.target, readings, arguments.rate, arguments.duration)
+	elif (arguments.mode == "tcp"):
+		producer = produce_server(lambda handler: asyncio.start_server(handler, arguments.host, int(arguments.target)), readings, arguments.rate, arguments.duration)
+	elif (arguments.mode == "unix"):
+		producer = produce_server(lambda handler: asyncio.start_unix_server(handler, arguments.target), readings, arguments.rate, arguments.duration)
+	else:
+		producer = produce_pipe(arguments.target, readings, arguments.rate, arguments.duration)
+
+	try:
+		asyncio.run(producer)
+	except KeyboardInterrupt:
+		pass
+
+	return 0
+
+
+if (__name__ == "__main__"):
+	# This Python script was invoked directly, call this script's main() method
+	sys.exit(main())
@@ -2,7 +2,74 @@
 This module will contain functions or classes that are particularly relevant to Flowstate activities
 '''
 
-def map_alarm_count_to_rgb(alarm_count):
+import json
+
+
+# The alarm-level color scheme as a compact threshold table, the same one the desktop side builds with led.src.colorschemes.alarm_level_colormap
+# Each band row is [from, to, red, green, blue, red ramp, green ramp, blue ramp] and the final row is the RGB color used for missing values
+alarm_count_table = [
+    [None, 2.0, 0, 255, 0, 0, 0, 0],
+    [2.0, 50.0, 205, 205, 0, 50, 50, 0],
+    [50.0, 90.0, 205, 120, 0, 50, 45, 0],
+    [90.0, 100.0, 205, 0, 0, 50, 0, 0],
+    [0, 0, 0],
+]
+
+
+def load_threshold_table(table_file_name):
+    '''
+    This function loads a threshold table saved on the desktop side by led.src.colorschemes.ThresholdColormap.save_table
+
+    Parameters
+    ----------
+    table_file_name : str
+        The path to the JSON-formatted table file
+
+    Returns
+    -------
+    list[list]
+        The threshold table, in the same format as alarm_count_table
+    '''
+
+    with open(table_file_name, "r") as table_file:
+        return json.load(table_file)
+
+
+def map_value_to_rgb(value, table):
+    '''
+    This function maps a number to an RGB code using a threshold table
+
+    Parameters
+    ----------
+    value : float
+        the number to be mapped, or None if it is missing
+    table : list[list]
+        the threshold table to use, in the same format as alarm_count_table
+
+    Returns
+    -------
+    list[int, int, int]
+        an RGB code combination in the form of a list of three integers, all between 0 and 255
+    '''
+
+    if (value == None):
+        return list(table[-1])
+
+    # Values above the last band are clipped to the top of it, and the value falls into the first band whose "to" value it does not exceed
+    bands = table[0 : -1]
+    value = min(value, bands[-1][1])
+
+    for band in bands:
+        if ((value <= band[1]) or (band is bands[-1])):
+            return_list = band[2 : 5]
+            if (band[0] != None):
+                fraction = (value - band[0]) / (band[1] - band[0])
+                return_list = [(band[2 + i] + int(fraction * band[5 + i])) % 256 for i in range(3)]
+
+            return return_list
+
+
+def map_alarm_count_to_rgb(alarm_count, table=None):
     '''
     This function takes in a percentage value and maps it to an RGB code depending on its value
 
@@ -10,6 +77,8 @@ def map_alarm_count_to_rgb(alarm_count):
     ----------
     alarm_count : float
         a number between 0 and 100 that will be mapped to an RGB color code
+    table : list[list]
+        optional threshold table to use instead of the built-in alarm_count_table (see load_threshold_table)
 
     Returns
     -------
@@ -17,8 +86,6 @@ def map_alarm_count_to_rgb(alarm_count):
         an RGB code combination in the form of a list of three integers, all between 0 and 255
     '''
 
-    return_list = [0, 0, 0]
-
     # Do some checking and make sure that alarm_count is either a float, an int or a None
 
     if (type(alarm_count) == str):
@@ -30,22 +97,8 @@ def map_alarm_count_to_rgb(alarm_count):
     if ((alarm_count != None) and (type(alarm_count) not in [int, float])):
         alarm_count = None
 
-    if (alarm_count != None):
-        # alarm_count is a number, convert it to an RGB code
-
-        if (alarm_count <= 2):
-            # For an alarm_count of 2 or below, return green
-            return_list = [0, 255, 0]
-        elif (alarm_count <= 50):
-            # For an alarm_count between 2 and 50, return a progressively brighter yellow as alarm_count increases
-            red_green = (205 + int(((alarm_count - 2) / 48) * 50)) % 256
-            return_list = [red_green, red_green, 0]
-        elif (alarm_count <= 90):
-            # For an alarm_count between 50 and 90, return a progressively brighter orange as alarm_count increases
-            return_list = [(205 + int(((alarm_count - 50) / 40) * 50)) % 256, (120 + int(((alarm_count - 50) / 40) * 45)) % 256, 0]
-        else:
-            # For an alarm count above 90, return a progressively brighter red as alarm_count increases
-            return_list = [(205 + int(((min(alarm_count, 100) - 90) / 10) * 50)) % 256, 0, 0]
-
-    return return_list
-
+    # For an alarm_count of 2 or below, this is green
+    # For an alarm_count between 2 and 50, this is a progressively brighter yellow as alarm_count increases
+    # For an alarm_count between 50 and 90, this is a progressively brighter orange as alarm_count increases
+    # For an alarm count above 90, this is a progressively brighter red as alarm_count increases
+    return map_value_to_rgb(alarm_count, table if (table != None) else alarm_count_table)
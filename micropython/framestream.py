@@ -0,0 +1,77 @@
+'''
+This module contains a reader for frame stream files, the compact binary format the desktop application writes colorized frames in
+(see led.src.framestream), so that frames can be played back on the LED strip without any decoding, each frame's bytes go straight into the LED buffer
+'''
+
+import struct
+
+# These must match the desktop application's led.src.framestream module, the padding is read as byte string fields since MicroPython's struct module
+# does not document the x pad code
+frame_stream_magic = b"LEDF"
+frame_stream_header = "<4sBB3s1sIIf2s"
+frame_stream_timed = 1
+
+
+class FrameStream():
+    def __init__(self, stream_file_name:str):
+        '''
+        Basic initialization method for FrameStream-class objects, it reads the frame stream's header
+
+        Parameters
+        ----------
+        stream_file_name : str
+            The path to the frame stream file being played back
+        '''
+
+        # Save the file name and an opened file object as object attributes
+        self.stream_file_name = stream_file_name
+        self.stream_file = open(self.stream_file_name, "rb")
+
+        header = self.stream_file.read(struct.calcsize(frame_stream_header))
+        if (header[ : 4] != frame_stream_magic):
+            self.stream_file.close()
+            raise ValueError("{} is not a frame stream file".format(stream_file_name))
+
+        (magic, version, flags, channel_order, padding, self.led_count, self.frame_count, self.frames_per_second, padding) = struct.unpack(frame_stream_header, header)
+        self.channel_order = channel_order.decode()
+        self.timed = (flags & frame_stream_timed) != 0
+
+        # Every frame is read into the same buffers, so playing a frame stream back does not allocate any memory
+        self.milliseconds = bytearray(4)
+        self.frame = bytearray(self.led_count * 3)
+
+        if ((self.frame_count == 0) or (self.led_count == 0)):
+            # An empty frame stream (e.g. from a run stopped before its first frame) has nothing to play back
+            self.stream_file.close()
+            self.stream_file = None
+
+    def fetch(self):
+        '''
+        This method reads the next frame out of the frame stream
+        If the end of the frame stream has been reached, the file is closed and further calls to this method will return nothing but None values
+
+        Returns
+        -------
+        (int, bytearray)
+            The number of milliseconds the frame is to be displayed for (from the frames per second if the frames are not timed) and the frame's color
+            bytes, in the frame stream's channel order, the same bytearray is re-used for every frame
+        '''
+
+        if (self.stream_file != None):
+            milliseconds = int(1000 / self.frames_per_second) if (self.frames_per_second > 0) else 0
+            if (self.timed):
+                if (self.stream_file.readinto(self.milliseconds) == 4):
+                    milliseconds = struct.unpack("<I", self.milliseconds)[0]
+                else:
+                    self.stream_file.close()
+                    self.stream_file = None
+
+            if ((self.stream_file != None) and (self.stream_file.readinto(self.frame) == len(self.frame))):
+                return (milliseconds, self.frame)
+
+            if (self.stream_file != None):
+                # The end of the frame stream has been reached, close the file object and clear its attribute
+                self.stream_file.close()
+                self.stream_file = None
+
+        return None
@@ -73,3 +73,30 @@ class LEDHandler():
             new_led_colors.append([0, 0, 0])
 
         self.set(new_led_colors)
+
+    def set_packed(self, frame, channel_order="GRB"):
+        '''
+        This method sets the LED string's colors from a frame of packed color bytes, e.g. a frame fetched from a framestream.FrameStream object
+        With the WS2812's own GRB channel order, each LED's three bytes are copied into the LED strip's buffer as they are
+
+        Parameters
+        ----------
+        frame : bytearray
+            three color bytes per LED, in channel_order order - for longer frames, the rest of the frame is ignored
+        channel_order : str
+            the order of the color channels in frame, defaults to GRB
+        '''
+
+        # Work out where each color channel is within an LED's three bytes
+        green = channel_order.index("G")
+        red = channel_order.index("R")
+        blue = channel_order.index("B")
+
+        # Load the LED strip's buffer directly, with the same layout WS2812.list_to_hex produces (green, red, blue from the high byte down)
+        buffer = self.led_strip.buf
+        for i in range(min(self.led_count, len(frame) // 3)):
+            offset = 3 * i
+            buffer[i] = (frame[offset + green] << 16) | (frame[offset + red] << 8) | frame[offset + blue]
+
+        # Write the newly-loaded buffer to the LEDs
+        self.led_strip.write()
@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from matplotlib import colormaps
 from os.path import exists
 from pathlib import Path
 
@@ -16,7 +15,6 @@ class Configuration(__BaseConfiguration__):
 	direction = None
 	origin_point = None
 	colormap_name = None
-	colormap = None
 
 	def __init__(self, **kwargs):
 		'''
@@ -91,12 +89,6 @@ class Configuration(__BaseConfiguration__):
 				if ((arguments.map != None) and (arguments.map != "")):
 					self.colormap_name = arguments.map
 
-				# Attempt to load the desired colormap from the matplotlib library
-				try:
-					self.colormap = colormaps[self.colormap_name]
-				except Exception as e:
-					self.errors.append(f"-m (--map) color map argument {self.colormap_name} was not found in matplotlib")
-
 		# All configuration work has been done, check for errors and dipslay any that occurred
 		self.configured = len(self.errors) == 0
 		if (not self.configured):
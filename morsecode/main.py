@@ -6,8 +6,6 @@ Command line call -- led morsecode <<command line parameters>>
 
 import numpy as np
 
-from  matplotlib import pyplot as plt
-
 import led.src.actions as actions
 
 from configuration import Configuration
@@ -39,15 +37,22 @@ def main():
 		# This source will be used to feed no signal into the scrolling window
 		zero_source = ConstantGenerator()
 
-		# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
-		# A pair of pyplot-based obects will be use to generate graphs while model is run
-		plt.ion()
-		figure = plt.figure()
+		# For a headless run, no graph is shown and the model runs without a live preview
+		figure = None
+		line = None
+		if (not configuration.headless):
+			# pyplot is only imported when there is a graph to show, a headless run never loads it
+			from matplotlib import pyplot as plt
+
+			# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
+			# A pair of pyplot-based obects will be use to generate graphs while model is run
+			plt.ion()
+			figure = plt.figure()
 
-		# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
-		axis = figure.add_subplot(1, 1, 1)
-		axis.set_ylim(-0.1, 1.1)
-		line, = axis.plot(window.frame + 2)
+			# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
+			axis = figure.add_subplot(1, 1, 1)
+			axis.set_ylim(-0.1, 1.1)
+			line, = axis.plot(window.frame + 2)
 
 		(time_series, frames) = actions.run_model(window, morse_source, None, figure, line)
 		(time_series, frames) = actions.run_model(window, zero_source, window.length, figure, line, time_series, frames)
@@ -75,7 +80,7 @@ def main():
 		#image.show()
 
 		# Save the data frames from the model's result to a video file, with each frame of data representing a frame of video
-		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2))
+		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2), mode=configuration.video_mode)
 
 
 if (__name__ == "__main__"):
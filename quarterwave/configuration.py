@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from  matplotlib import colormaps
 
 from led.src.baseclasses import Configuration as __BaseConfiguration__
 
@@ -14,7 +13,6 @@ class Configuration(__BaseConfiguration__):
 	amplitude = None
 	phase = None
 	colormap_name = None
-	colormap = None
 
 	def __init__(self, **kwargs):
 		'''
@@ -83,12 +81,6 @@ class Configuration(__BaseConfiguration__):
 				if ((arguments.map != None) and (arguments.map != "")):
 					self.colormap_name = arguments.map
 
-				# Attempt to load the desired colormap from the matplotlib library
-				try:
-					self.colormap = colormaps[self.colormap_name]
-				except Exception as e:
-					self.errors.append(f"color map name {self.colormap_name} was not found in matplotlib")
-
 		# All configuration work has been done, check for errors and dipslay any that occurred
 		self.configured = len(self.errors) == 0
 		if (not self.configured):
@@ -6,8 +6,6 @@ Command line call -- led quarterwave <<command line parameters>>
 
 import numpy as np
 
-from  matplotlib import pyplot as plt
-
 import led.src.actions as actions
 
 from configuration import Configuration
@@ -44,15 +42,22 @@ def main():
 		# Calculate the theoretical maximum amplitude for the current that can be running through the antenna
 		current_amplitude = sum([sine_source.amplitude for sine_source in sine_sources])
 
-		# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
-		# A pair of pyplot-based obects will be use to generate graphs while model is run
-		plt.ion()
-		figure = plt.figure()
+		# For a headless run, no graph is shown and the model runs without a live preview
+		figure = None
+		line_current = None
+		if (not configuration.headless):
+			# pyplot is only imported when there is a graph to show, a headless run never loads it
+			from matplotlib import pyplot as plt
+
+			# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
+			# A pair of pyplot-based obects will be use to generate graphs while model is run
+			plt.ion()
+			figure = plt.figure()
 
-		# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
-		axis_current = figure.add_subplot(1, 1, 1)
-		axis_current.set_ylim(-2.1 * current_amplitude, 2.1 * current_amplitude)
-		line_current, = axis_current.plot(antenna.frame)
+			# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
+			axis_current = figure.add_subplot(1, 1, 1)
+			axis_current.set_ylim(-2.1 * current_amplitude, 2.1 * current_amplitude)
+			line_current, = axis_current.plot(antenna.frame)
 
 		'''
 		# Do the following four times:
@@ -113,10 +118,11 @@ def main():
 
 		# Save the data frames from the model's result to an image file as a "temporal contact sheet"
 		image = actions.save_frames_image(rgb_frames, configuration.image_file)
-		image.show()
+		if (not configuration.headless):
+			image.show()
 
 		# Save the data frames from the model's result to a video file, with each frame of data representing a frame of video
-		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2))
+		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2), mode=configuration.video_mode)
 
 
 if (__name__ == "__main__"):
@@ -1,5 +1,4 @@
 from argparse import ArgumentParser
-from matplotlib import colormaps
 from os.path import exists
 from pathlib import Path
 
@@ -7,18 +6,22 @@ from led.src.baseclasses import Configuration as __BaseConfiguration__
 
 class Configuration(__BaseConfiguration__):
 	'''
-	This class defines a configuration object for modeling a scrolling window displaying a signal read from a JSON-formatted list for a string of programmagle LED lights
+	This class defines a configuration object for modeling a scrolling window displaying a recorded signal for a string of programmagle LED lights
 	It builds upon and extends the superclass configuration object
 	'''
 
 	signal_file = None
 	scaling_factor = None
 	logarithmic = None
+	column = None
+	dtype = None
 	length = None
 	direction = None
 	origin_point = None
 	colormap_name = None
-	colormap = None
+	overview_rows = None
+	tile_rows = None
+	reduction = None
 
 	def __init__(self, **kwargs):
 		'''
@@ -59,13 +62,18 @@ class Configuration(__BaseConfiguration__):
 			if (len(self.errors) == 0):
 				# No errors have been generated so far, now add the additional project-speciic command-line arguments to check for and then parse the incoming argument set
 
-				self.argument_parser.add_argument("-s", "--signal", "--message", type=str, required=True, help="JSON-formatted list file that contains the signal to be replayed")
+				self.argument_parser.add_argument("-s", "--signal", "--message", type=str, required=True, help="JSON-formatted list, newline-delimited JSON, CSV, .npy or raw binary (.bin/.raw/.dat) file that contains the signal to be replayed")
 				self.argument_parser.add_argument("-f", "--factor", "--scalingfactor", "--scaling-factor", type=float, help="Amount by which the signal being replayed will be scaled")
 				self.argument_parser.add_argument("-g", "--log", "--logarithmic", action="store_true", help="Flag indicating that the signal being replayed should be coverted to a common logarithm")
+				self.argument_parser.add_argument("-c", "--column", type=str, help="For a CSV or two-dimensional .npy signal file, the column that contains the signal, either its zero-based position or (CSV only) its name in the header row")
+				self.argument_parser.add_argument("--dtype", type=str, help='For a raw binary signal file, the numpy data type of its values, e.g. "float32" (defaults to "float64")')
 				self.argument_parser.add_argument("-l", "--length", type=int, required=True, help="Scrolling window length in pixels (int)")
 				self.argument_parser.add_argument("-d", "--direction", type=str, help='The direction the window scrolls in, valid values are "left", "right" and "both" (str)')
 				self.argument_parser.add_argument("-o", "--input_origin", "--inputorigin", type=float, help="For windows that scroll in both directions, the point in the window where the incoming value is placed (int)")
 				self.argument_parser.add_argument("-m", "--map", type=str, help="matplotlib Colormap to be applied to the signals generated by this project run (string)")
+				self.argument_parser.add_argument("--overview", "--overview-rows", "--overview_rows", type=int, help="Save the image as a contact sheet overview with at most this many rows, each standing for a run of frames, instead of one row per frame (int)")
+				self.argument_parser.add_argument("--tiles", "--tile-rows", "--tile_rows", type=int, help="Also save every frame at full resolution in tiles of this many rows each, next to the overview image (int)")
+				self.argument_parser.add_argument("--reduction", type=str, choices=["max", "mean", "decimate"], help="How each row of the overview is reduced from its frames (defaults to max)")
 
 				# The parser arguments for this configuration object have been set up, now parse the command line and check for the base set of expected/available
 				# arguments as defined by the superclass
@@ -84,6 +92,14 @@ class Configuration(__BaseConfiguration__):
 						if (not self.signal_file.is_file()):
 							self.errors.append(f"-s (--signal/--message) argument {signal_file} is not a valid file path")
 
+				if ((arguments.column != None) and (arguments.column != "")):
+					# A column made of nothing but digits is a position, anything else is the name of a column in a CSV file's header row
+					self.column = int(arguments.column) if (arguments.column.isdigit()) else arguments.column
+
+				# Accept dtype argument as is, it will be validated by the SignalRepeater that tries to use it
+				if ((arguments.dtype != None) and (arguments.dtype != "")):
+					self.dtype = arguments.dtype
+
 				# Accept scaling_factor argument as is, it was accepted as a floating-point value or is None -- both options are valid
 				self.scaling_factor = arguments.factor
 
@@ -100,11 +116,13 @@ class Configuration(__BaseConfiguration__):
 				if ((arguments.map != None) and (arguments.map != "")):
 					self.colormap_name = arguments.map
 
-				# Attempt to load the desired colormap from the matplotlib library
-				try:
-					self.colormap = colormaps[self.colormap_name]
-				except Exception as e:
-					self.errors.append(f"-m (--map) color map argument {self.colormap_name} was not found in matplotlib")
+				for (argument, value) in [("--overview", arguments.overview), ("--tiles", arguments.tiles)]:
+					if ((value != None) and (value <= 0)):
+						self.errors.append(f"{argument} argument must be a positive integer, not {value}")
+
+				self.overview_rows = arguments.overview
+				self.tile_rows = arguments.tiles
+				self.reduction = arguments.reduction
 
 		# All configuration work has been done, check for errors and dipslay any that occurred
 		self.configured = len(self.errors) == 0
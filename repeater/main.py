@@ -6,8 +6,6 @@ Command line call -- led repeater <<command line parameters>>
 
 import numpy as np
 
-from  matplotlib import pyplot as plt
-
 import led.src.actions as actions
 
 from configuration import Configuration
@@ -33,20 +31,27 @@ def main():
 		window = ScrollingWindow(configuration.length, configuration.direction, configuration.input_origin)
 
 		# Initialize the Generator that will replay a previous signal
-		repeater_source = SignalRepeater(configuration.signal_file, configuration.scaling_factor, configuration.logarithmic)
+		repeater_source = SignalRepeater(configuration.signal_file, configuration.scaling_factor, configuration.logarithmic, configuration.column, configuration.dtype)
 
 		# This source will be used to feed no signal into the scrolling window
 		zero_source = ConstantGenerator()
 
-		# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
-		# A pair of pyplot-based obects will be use to generate graphs while model is run
-		plt.ion()
-		figure = plt.figure()
+		# For a headless run, no graph is shown and the model runs without a live preview
+		figure = None
+		line = None
+		if (not configuration.headless):
+			# pyplot is only imported when there is a graph to show, a headless run never loads it
+			from matplotlib import pyplot as plt
+
+			# Initialize pyplot in interactive mode and create an axis for the current flowing through the quarter-wave antenna
+			# A pair of pyplot-based obects will be use to generate graphs while model is run
+			plt.ion()
+			figure = plt.figure()
 
-		# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
-		axis = figure.add_subplot(1, 1, 1)
-		axis.set_ylim(repeater_source.signal_minimum - 0.1, repeater_source.signal_maximum + 0.1)
-		line, = axis.plot(window.frame + 2)
+			# Create an axis to display the current flowing through the antenna and initialize it with the antenna's initial current
+			axis = figure.add_subplot(1, 1, 1)
+			axis.set_ylim(repeater_source.signal_minimum - 0.1, repeater_source.signal_maximum + 0.1)
+			line, = axis.plot(window.frame + 2)
 
 		(time_series, frames) = actions.run_model(window, repeater_source, None, figure, line)
 		(time_series, frames) = actions.run_model(window, zero_source, window.length, figure, line, time_series, frames)
@@ -65,11 +70,16 @@ def main():
 		actions.save_time_series(time_series, configuration.time_series_file)
 
 		# Save the data frames from the model's result to an image file as a "temporal contact sheet"
-		image = actions.save_frames_image(rgb_frames, configuration.image_file)
-		image.show()
+		# For a long recording, one row per frame makes an image far too tall to show, a downsampled overview (and full-resolution tiles) is saved instead
+		if ((configuration.overview_rows != None) or (configuration.tile_rows != None)):
+			image = actions.save_frames_contact_sheet(rgb_frames, configuration.image_file, frames, configuration.overview_rows, configuration.tile_rows, configuration.reduction)
+		else:
+			image = actions.save_frames_image(rgb_frames, configuration.image_file)
+		if (not configuration.headless):
+			image.show()
 
 		# Save the data frames from the model's result to a video file, with each frame of data representing a frame of video
-		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2))
+		actions.save_frames_video(brg_frames, configuration.video_file, (brg_frames.shape[1], 2), mode=configuration.video_mode)
 		'''
 		'''
 
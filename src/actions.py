@@ -1,17 +1,65 @@
-import cv2
 import json
 import numpy as np
+import weakref
 
-from matplotlib import colors, pyplot as plt
-from matplotlib.axes._subplots import Axes, Subplot
-from matplotlib.figure import Figure
-from matplotlib.lines import Line2D
-from PIL import Image
-from typing import List
+from os.path import splitext
+from time import perf_counter
+from typing import List, TYPE_CHECKING
 
 from led.src.baseclasses import LEDModel as __ParentModel__, SignalAggregator as __ParentAggregator__, SignalGenerator as __ParentGenerator__
+from led.src.framestream import default_channel_order, write_frame_stream
+from led.src.instrumentation import RunStatistics, TimedProxy
+from led.src.preview import PreviewController
+from led.src.recorders import FrameRecorder
+from led.src.sinks import ContactSheetSink, SinkPipeline
+from led.src.storage import TimeSeriesWriter, frames_to_json_list, save_frames_binary
+from led.src.video import save_frame_sequence, save_video_segments, video_modes
+
+# matplotlib, OpenCV (cv2) and pillow (PIL) take far longer to import than the rest of this application, so they are only imported by the functions that
+# use them, a run that only simulates a model and writes binary frames never loads them
+if (TYPE_CHECKING):
+	from matplotlib.figure import Figure
+	from matplotlib.lines import Line2D
+
+# The name of the module that every matplotlib colormap class is defined in, colormap arguments are checked against it without importing matplotlib
+colormap_module = "matplotlib.colors"
+
+# Define a set of defaults used by the next functions
+default_block_size = 4096
+
+def samples_until_end_of_signal(source:any):
+	'''
+	This function works out how many samples a model run with a samples_to_run argument of None would take before its finite signal source(s) end
+	That run keeps going until every finite source reports end_of_signal, which happens on the sample after its last value
+
+	Parameters
+	----------
+	source : any
+		Either an individual object that is a subclass of led.src.baseclasses.SignalGenerator, a list of such objects, or a signal aggregator object
+
+	Returns
+	-------
+	int
+		The number of samples the run would take, or None if at least one finite source cannot tell how many samples it has left
+	'''
 
-def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figure=None, line_frame:Line2D=None, time_series:List[any]=None, frames:np.ndarray=None):
+	if (hasattr(source, "end_of_all_finite_signals")):
+		# source is a signal aggregator, its run keeps going until every one of its finite signals has ended
+		if (getattr(source, "samples_remaining", None) == None):
+			return None
+
+		return 0 if (source.end_of_all_finite_signals) else source.samples_remaining + 1
+
+	sources = source if (type(source) == list) else [source]
+	finite_sources = [single_source for single_source in sources if (hasattr(single_source, "end_of_signal"))]
+
+	if (not all([hasattr(single_source, "samples_remaining") for single_source in finite_sources])):
+		return None
+
+	return max([0] + [single_source.samples_remaining + 1 for single_source in finite_sources if (not single_source.end_of_signal)])
+
+
+def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:"Figure"=None, line_frame:"Line2D"=None, time_series:List[any]=None, frames:np.ndarray=None, sinks:list=None, colorizer:any=None, record:bool=True, preview_rate:float=None, statistics:RunStatistics=None):
 	'''
 	This function runs a set of samples a feeds the output from one or more signal sources into a model and records the results for return to the calling object
 
@@ -26,6 +74,7 @@ def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figu
 	figure : matplotlib.figure.Figure
 		A Figure object used for graphing the response of this model to the inputs during this method call
 		If it and the companion argument line_frame argument are both valid objects, the graph is generated
+		The graph is a live preview (see led.src.preview.PreviewController), it is redrawn at most preview_rate times per second and skips the samples in between
 	line_frame : matplotlib.lines.Line2D
 		A Line2D object used for graphing the response of this model to the inputs during this method call
 		If it and the companion argument figure argument are both valid objects, the graph is generated
@@ -35,13 +84,30 @@ def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figu
 	frames : numpy.ndarray
 		A numpy array of previous model run frames
 		If frames is a valid numpy array, the frames generated by this model run will be appended to it
+	sinks : list[led.src.baseclasses.FrameSink]
+		Optional set of sinks (see led.src.sinks) that receive the results of this run in chunks while the model is running
+		The sinks are not closed by this function so that several runs can be streamed into the same sinks, the caller closes them when it is done
+	colorizer : any
+		A callable that takes a chunk of frames and returns an (RGB frames, BRG frames) tuple, required if any of the sinks uses colors
+		e.g. led.src.actions.RangeColorizer or led.src.colorschemes.ThresholdColormap.colorize_frames
+	record : bool
+		Whether the results of this run are kept and returned, defaults to True
+		With sinks and a record argument of False, an arbitrarily long run executes in bounded memory
+	preview_rate : float
+		The largest number of times per second that the graph is redrawn, defaults to the preview controller's pre-determined value
+	statistics : led.src.instrumentation.RunStatistics
+		Optional object that accumulates the time spent in each stage of this run (pulling from the sources, feeding the model, reading it back out,
+		recording, sinks and the graph), the number of calls and samples, and the peak size of the frame-recording buffer
+		Its callback, if it has one, is called at the end of the run; without a statistics object, the run is not instrumented at all
 
 	Returns
 	-------
 	List[any]
 		The set of value generated by this run of the model; if a time_series list was passed in as an argument, the results from this run are appended to the incoming time_series
+		With a record argument of False, the incoming time_series is returned unchanged
 	numpy.ndarray
 		The numpy array set of full data frames generated by the run of this model; if a frames array was passed in as an argument, the results from this run are appended to the incoming frames
+		With a record argument of False, the incoming frames are returned unchanged
 	'''
 
 	uses_aggregator = False
@@ -99,34 +165,97 @@ def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figu
 		else:
 			samples_to_run = int(samples_to_run)
 
-	if ((figure != None) and (type(figure) != Figure)):
-		raise Exception(f"if present, figure argument must be of type matplotlib.figure.Figure, not {type(figure).__name__}")
+	if (figure != None):
+		# Whoever created figure has already imported matplotlib, so this import costs nothing
+		from matplotlib.figure import Figure
+		if (type(figure) != Figure):
+			raise Exception(f"if present, figure argument must be of type matplotlib.figure.Figure, not {type(figure).__name__}")
 
-	if ((line_frame != None) and (type(line_frame) != Line2D)):
-		raise Exception(f"if present, line_frame argument must be of type matplotlib.lines.Line2D, not {type(line_frame).__name__}")
+	if (line_frame != None):
+		from matplotlib.lines import Line2D
+		if (type(line_frame) != Line2D):
+			raise Exception(f"if present, line_frame argument must be of type matplotlib.lines.Line2D, not {type(line_frame).__name__}")
 
 	if ((time_series != None) and (type(time_series) != list)):
 		raise Exception(f"if present, time_series argument must be a list, not an object of type {type(time_series).__name__}")
 
-	if ((type(frames) != np.ndarray) and (frames != None)):
+	if ((not isinstance(frames, np.ndarray)) and (frames != None)):
 		raise Exception(f"if present, frames argument must be a numpy array, not an object of type {type(frames).__name__}")
 
+	if ((statistics != None) and (type(statistics) != RunStatistics)):
+		raise Exception(f"if present, statistics argument must be of type led.src.instrumentation.RunStatistics, not {type(statistics).__name__}")
+
+	# The sink pipeline validates the sinks and colorizer arguments itself
+	pipeline = SinkPipeline(sinks, colorizer, default_block_size) if (sinks != None) else None
+	record = True if (record == None) else bool(record)
+
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now run the model with the sources
 
 	# Set a Boolean flag so we don't have to run this check every iteration
 	display_graph = (figure != None) and (line_frame != None)
+	preview = PreviewController(figure, line_frame, preview_rate) if (display_graph) else None
 
 	if (time_series == None):
 		# time_series is empty, initialize it to an empty list
 		time_series = []
 
-	if (type(frames) != np.ndarray):
-		# frames is empty, initialize it to an empt numpy array one dimension larger than the model's frame shape
-		# Initialize an empty or invalid incoming frames object into an empty numpy array
-		frames = np.empty((0, *model.frame.shape))
+	# Record the frames into a preallocated, growable buffer instead of appending to a numpy array (which copies the whole history every sample)
+	# If a frames array was passed in, the recorder starts out as a copy of it and this run's frames are added after it
+	recorder = FrameRecorder(model.frame.shape, samples_to_run if (samples_to_run != None) else None, frames if (isinstance(frames, np.ndarray)) else None) if (record) else None
+
+	if (statistics != None):
+		# For an instrumented run, proxies stand in for every object taking part in the run, each one charging the time spent in it to its stage
+		run_start = perf_counter()
+
+		if (uses_aggregator):
+			source = TimedProxy(source, statistics, {"next_block": "source"}, {"next": "source"})
+		else:
+			sources = [TimedProxy(single_source, statistics, {"next_block": "source"}, {"next": "source"}) for single_source in (source if (sums_multiple_signals) else [source])]
+			source = sources if (sums_multiple_signals) else sources[0]
+
+		model = TimedProxy(model, statistics, {"input": "input", "inputs": "input", "input_series": "input", "inputs_series": "input", "newest_from_frames": "read"}, {"frame": "read", "newest": "read"}, ["input", "inputs", "input_series", "inputs_series"])
+		recorder = TimedProxy(recorder, statistics, {"append": "record", "extend": "record"}) if (record) else None
+		pipeline = TimedProxy(pipeline, statistics, {"push": "sinks", "push_frame": "sinks", "flush": "sinks"}) if (pipeline != None) else None
+		preview = TimedProxy(preview, statistics, {"update": "preview", "finish": "preview"}) if (display_graph) else None
+
+	# Models with a vectorized input_series method can take in whole blocks of samples at once instead of one sample at a time, and so can models with a
+	# vectorized inputs_series method fed by an aggregator that can produce whole blocks of sets of values
+	# That is only done when, for a run that goes until the end of the signal, the number of samples left in the signal is known ahead of time
+	# The live graph only ever shows a sample now and then, so it is simply handed the last frame of each block
+	block_samples = None
+	if ((hasattr(model, "inputs_series") and hasattr(source, "next_block")) if (uses_aggregator) else (hasattr(model, "input_series"))):
+		block_samples = samples_to_run if (samples_to_run != None) else samples_until_end_of_signal(source)
 
 	# All the set-up is done, now iterate over the number of samples and run this model
-	if (samples_to_run == None):
+	if (block_samples != None):
+		# Pull the samples from the source(s) a block at a time and run each block through the model in one pass
+		sources = source if (sums_multiple_signals) else [source]
+		for block_start in range(0, block_samples, default_block_size):
+			block_length = min(default_block_size, block_samples - block_start)
+
+			if (uses_aggregator):
+				# An aggregator's block holds one row per sample and one column per signal, it goes straight into the model
+				block_frames = model.inputs_series(source.next_block(block_length))
+			else:
+				# Add the values together from every source, like the sample-by-sample version below, a sample that any source has no value for (NaN, see
+				# next_block) is missing from the sum as a whole and taken in as zero by the model's input_series
+				values = np.zeros(block_length, dtype=float)
+				for single_source in sources:
+					values = values + single_source.next_block(block_length)
+
+				block_frames = model.input_series(values)
+			block_time_series = model.newest_from_frames(block_frames)
+
+			if (record):
+				time_series.extend(block_time_series)
+				recorder.extend(block_frames)
+
+			if (pipeline != None):
+				pipeline.push(block_frames, block_time_series)
+
+			if ((display_graph) and (block_frames.shape[0] > 0)):
+				preview.update(block_frames[-1])
+	elif (samples_to_run == None):
 		while (not (source.end_of_all_finite_signals if (uses_aggregator) else source.end_of_signal if (not sums_multiple_signals) else all([single_source.end_of_signal for single_source in source if (hasattr(single_source, "end_of_signal"))]))):
 			if (uses_aggregator):
 				# This method call uses a signal aggregator, it is handled differently than a stand-alone signal generator or list of generators
@@ -146,13 +275,15 @@ def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figu
 				# Add the computed value to model
 				model.input(value)
 
-			time_series.append(model.newest)
-			frames = np.append(frames, [model.frame], axis=0)
+			if (record):
+				time_series.append(model.newest)
+				recorder.append(model.frame)
+
+			if (pipeline != None):
+				pipeline.push_frame(model.frame, model.newest)
 
 			if (display_graph):
-				line_frame.set_ydata(model.frame)
-				figure.canvas.draw()
-				figure.canvas.flush_events()
+				preview.update(model.frame)
 	else:
 		# This method call should run for a specific number of samples, iterate over that range and and run the samples
 
@@ -177,19 +308,35 @@ def run_model(model:__ParentModel__, source:any, samples_to_run:int, figure:Figu
 				model.input(value)
 
 			# No matter what type of source was used, get the first value from the model's frame for time_series
-			time_series.append(model.newest)
-			frames = np.append(frames, [model.frame], axis=0)
+			if (record):
+				time_series.append(model.newest)
+				recorder.append(model.frame)
+
+			if (pipeline != None):
+				pipeline.push_frame(model.frame, model.newest)
 
 			if (display_graph):
-				# A graph is being displayed, update the graph object with the model's new frame
-				line_frame.set_ydata(model.frame)
-				figure.canvas.draw()
-				figure.canvas.flush_events()
+				# A graph is being displayed, hand the model's new frame to the preview, which redraws the graph when it is due
+				preview.update(model.frame)
+
+	if (display_graph):
+		# Make sure the graph ends up showing the model's final frame
+		preview.finish()
+
+	if (pipeline != None):
+		# Pass any frames still gathered in the pipeline on to the sinks, but leave the sinks open for any following runs
+		pipeline.flush()
+
+	if (statistics != None):
+		if (record):
+			statistics.add_frame_bytes(recorder.nbytes)
+
+		statistics.finish_run(perf_counter() - run_start)
 
-	return (time_series, frames)
+	return (time_series, recorder.frames) if (record) else (time_series, frames)
 
 
-def color_time_series(time_series:List[any], colormap:any, figure:Figure, axis:any):
+def color_time_series(time_series:List[any], colormap:any, figure:"Figure", axis:any):
 	'''
 	This function takes a list of data and graphs it using the specified colormap
 
@@ -216,19 +363,24 @@ def color_time_series(time_series:List[any], colormap:any, figure:Figure, axis:a
 
 	if (colormap == None):
 		raise Exception("colormap must be a color in the matplotlib.colors module")
-	elif (colormap.__class__.__module__ != colors.__name__):
+	elif (colormap.__class__.__module__ != colormap_module):
 		raise Exception(f"colormap must be a color in the matplotlib.colors module, not an object of type {type(colormap).__name__}")
 
 	if (figure == None):
 		raise Exception("figure argument must be a matplotlib.figure.Figure object")
-	elif (type(figure) != Figure):
+
+	from matplotlib import pyplot as plt
+	from matplotlib.axes import Axes
+	from matplotlib.figure import Figure
+
+	if (type(figure) != Figure):
 		raise Exception(f"figure argument must be a matplotlib.figure.Figure object, not an object of type {type(figure).__name__}")
 
 	if (axis == None):
 		raise Exception("axis argument must be a maplotlib axes object")
 	else:
 		axis_type = type(axis)
-		if ((not issubclass(axis_type, Axes)) or (not issubclass(axis_type, Subplot))):
+		if (not issubclass(axis_type, Axes)):
 			raise Exception(f"axis argument must be a matplitlib axes object, not an object of type {axis_type.__name__}")
 
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now run the model with the sources
@@ -251,7 +403,11 @@ def color_time_series(time_series:List[any], colormap:any, figure:Figure, axis:a
 
 def save_time_series(time_series:List[any], filename:str):
 	'''
-	This function takes a list of data and saves it out as a JSON-formatted text file
+	This function takes a list of data and saves it out as a file, the format depends on the file's extension
+	* .ndjson or .jsonl - newline-delimited JSON, one value per line (see led.src.storage.TimeSeriesWriter)
+	* .npy - a typed binary column that can be memory-mapped later (see led.src.storage.load_time_series_column)
+	* anything else - a JSON-formatted text file holding one list
+	To write a time series while a model is still running, hand a led.src.storage.TimeSeriesWriter to run_model as a sink instead
 
 	Parameters
 	----------
@@ -276,13 +432,22 @@ def save_time_series(time_series:List[any], filename:str):
 		raise Exception("filename argument must be a non-empty string, it is currently empty")
 
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now save time_series
-	with open(filename, "w") as file_out:
-		json.dump(time_series, file_out)
+	if (splitext(filename)[1].lower() in [".ndjson", ".jsonl", ".npy"]):
+		writer = TimeSeriesWriter(filename)
+		writer.append(time_series)
+		writer.close()
+	else:
+		with open(filename, "w") as file_out:
+			json.dump(time_series, file_out)
 
 
 def save_frames(frames:np.ndarray, filename:str):
 	'''
-	This function takes a numpy array and saves it out as a JSON-formatted text file
+	This function takes a numpy array and saves it out as a file, the format depends on the file's extension
+	* .npy - a binary NumPy array file that can be loaded later as a memory-mapped array (see led.src.storage.load_frames)
+	* .npz - a compressed binary NumPy archive
+	* .rle - a run-length and delta encoded file that stores each run of identical frames once, for mostly static runs (see led.src.deltaframes)
+	* anything else - a JSON-formatted text file
 	The numpy array is assumed to contain the individual frames of model data from an LED model
 
 	Parameters
@@ -295,35 +460,190 @@ def save_frames(frames:np.ndarray, filename:str):
 
 	# Validate all incoming arguments, raising Exceptions if they are not valid
 
-	# Create a Boolean flag to use for the first conditional because numpy arrays produce an error when compared directly to None
-	probably_none = True
-	try:
-		if (frames != None):
-			# If the code made it to this point without throwing an Exception, it is not a numpy array, but it is also definitely not None, set probably_none accordingly
-			probably_none = False
-	except:
-		# If this Exception was encountered, it is assumed that it occurred because frames is a numpy array, and checking to see if it is None generated this
-		# Exception, thus, it probably is not None
-		probably_none = False
-
-	if (probably_none):
+	# frames is checked by identity, comparing a numpy array with None compares every one of its values, which costs as much as saving a static run
+	if (frames is None):
 		raise Exception("frames argument must be a numpy array")
-	elif (type(frames) != np.ndarray):
-		raise Exception(f"frames argument must be a numpy array, not an object of type {type(time_series).__name__}")
+	elif (not isinstance(frames, np.ndarray)):
+		raise Exception(f"frames argument must be a numpy array, not an object of type {type(frames).__name__}")
 
 	if (filename == None):
 		raise Exception("filename argument must be a non-empty string")
 	elif (type(filename) != str):
-		raise Exception(f"filename argument must be a non-empty string, not an object of type {type(time_series).__name__}")
+		raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
 	elif (filename == ""):
 		raise Exception("filename argument must be a non-empty string, it is currently empty")
 
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now save frames
-	with open(filename, "w") as file_out:
-		json.dump(frames.tolist(), file_out)
+	if (splitext(filename)[1].lower() in [".npy", ".npz", ".rle"]):
+		save_frames_binary(frames, filename)
+	else:
+		with open(filename, "w") as file_out:
+			json.dump(frames_to_json_list(frames), file_out, allow_nan=False)
+
+
+# Lookup tables built by colormap_lut are cached here so that each colormap is only sampled once, keyed by the colormap object itself (by its id, along
+# with a weak reference to it) and table size, never by name, since a copy made with with_extremes, reversed, etc. or a custom colormap can share a name
+# with a colormap whose colors differ
+# A colormap's tables are dropped from the cache as soon as the colormap is no longer used anywhere else
+colormap_luts = {}
+
+def forget_colormap_luts(colormap_id:int):
+	'''
+	This function drops every lookup table cached for a colormap, it is called when the colormap is garbage-collected so its id can be re-used safely
+	'''
+
+	for key in [key for key in colormap_luts.keys() if (key[0] == colormap_id)]:
+		del colormap_luts[key]
+
+def colormap_lut(colormap:any, lut_size:int=None):
+	'''
+	This function samples a colormap into a lookup table of 8-bit RGB values, one row per color in the colormap
+	The table has one extra row at the end holding the colormap's "bad" color, used for values that are not numbers (NaN)
+	Tables are cached, so asking for the same colormap and size again does not sample the colormap again
+
+	Parameters
+	----------
+	colormap : any
+		The colormap to be sampled, it must be of a class in the matplotlib.colors
+	lut_size : int
+		The number of colors to sample from the colormap, defaults to the colormap's own number of colors (colormap.N) which reproduces exactly what
+		calling the colormap with normalized floats would do
 
+	Returns
+	-------
+	numpy.ndarray
+		A numpy.uint8 array of shape (lut_size + 1, 3)
+	'''
+
+	if (lut_size == None):
+		lut_size = colormap.N
+	elif ((type(lut_size) not in [int, float]) or (lut_size < 2)):
+		raise Exception(f"if present, lut_size argument must be an integer of two or greater, {lut_size} is invalid")
+	else:
+		lut_size = int(lut_size)
+
+	# The "bad" color is part of the key so that a colormap whose bad color is changed in place is sampled again
+	key = (id(colormap), lut_size, tuple(colormap.get_bad()))
+	if ((key not in colormap_luts) or (colormap_luts[key][0]() is not colormap)):
+		if (not any([cached_key[0] == id(colormap) for cached_key in colormap_luts.keys()])):
+			weakref.finalize(colormap, forget_colormap_luts, id(colormap))
+
+		# Sample the colormap at lut_size evenly-spaced points (integers index a colormap's colors directly when the sizes match), then add its
+		# "bad" color, drop the alpha value (the A in RGBA) and convert the RGB values from floats between 0 and 1 to integers between 0 and 255
+		samples = np.arange(lut_size) if (lut_size == colormap.N) else np.linspace(0.0, 1.0, lut_size)
+		rgba = np.concatenate((colormap(samples), [colormap.get_bad()]))
+		colormap_luts[key] = (weakref.ref(colormap), (255 * rgba[ : , : 3]).astype(np.uint8))
+
+	return colormap_luts[key][1]
 
-def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
+
+def colorize_frames_in_range(frames:np.ndarray, colormap:any, minimum:float, maximum:float, lut_size:int=None):
+	'''
+	This function does the work of colorize_frames for a known range of values instead of the range of values that the frames happen to contain
+	The values are normalized so that minimum maps to the bottom of the colormap and maximum maps to the top, values outside of that range are clipped
+	to it and values that are not numbers get the colormap's "bad" color
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		A set of frames from the model run that will have the colormap applied to them
+	colormap : any
+		The colormap that will be applied to frames, it must be of a class in the matplotlib.colors
+	minimum : float
+		The value that maps to the bottom of the colormap
+	maximum : float
+		The value that maps to the top of the colormap, if it is equal to minimum every value is mapped to the top of the colormap
+	lut_size : int
+		Optional number of colors in the lookup table, defaults to the colormap's own number of colors
+
+	Returns
+	-------
+	numpy.ndarray
+		The frames argument with the colormap applied, in RGB order
+	numpy.ndarray
+		The frames argument with the colormap applied, in BRG (Blue-Red-Green) order
+	'''
+
+	lut = colormap_lut(colormap, lut_size)
+	lut_size = lut.shape[0] - 1
+
+	frames = np.asarray(frames, dtype=float)
+	is_missing = np.isnan(frames)
+
+	# Attempt to normalize the values in frames to make them all between zero and one, then scale them up to indexes into the lookup table
+	if (minimum != maximum):
+		# The range is not empty, normalize frames over it
+		indexes = (((frames - minimum) / (maximum - minimum)) * lut_size)
+		indexes[is_missing] = 0
+		indexes = np.clip(indexes, 0, lut_size - 1).astype(np.intp)
+	else:
+		# The range only contains one value, map the whole thing to the top of the colormap
+		indexes = np.full(frames.shape, lut_size - 1, dtype=np.intp)
+
+	# Values that are not numbers get the colormap's "bad" color from the extra row at the end of the lookup table
+	indexes[is_missing] = lut_size
+
+	return_rgb = lut.take(indexes, axis=0)
+
+	# The BRG-formatted (Blue-Red-Green) version of the frames comes from the same lookup table with each color's RGB values rotated right
+	return_brg = np.roll(lut, 1, axis=1).take(indexes, axis=0)
+
+	return (return_rgb, return_brg)
+
+
+class RangeColorizer:
+	'''
+	This class defines a colorizer for frames that are colored while a model is still running (see the sinks argument of run_model)
+	The whole run's range of values is not known until the run is over, so it is colored over a fixed range of values instead
+	'''
+
+	def __init__(self, colormap:any, minimum:float, maximum:float, lut_size:int=None):
+		'''
+		Parameters
+		----------
+		colormap : any
+			The colormap that will be applied to the frames, it must be of a class in the matplotlib.colors
+		minimum : float
+			The value that maps to the bottom of the colormap
+		maximum : float
+			The value that maps to the top of the colormap
+		lut_size : int
+			Optional number of colors in the lookup table, defaults to the colormap's own number of colors
+		'''
+
+		if (colormap == None):
+			raise Exception("colormap argument must be a color in the matplotlib.colors module")
+		elif (colormap.__class__.__module__ != colormap_module):
+			raise Exception(f"colormap must be a color in the matplotlib.colors module, not an object of type {type(colormap).__name__}")
+
+		if ((type(minimum) not in [int, float]) or (type(maximum) not in [int, float])):
+			raise Exception("minimum and maximum arguments must both be numbers")
+		elif (minimum > maximum):
+			raise Exception(f"minimum argument ({minimum}) cannot be greater than maximum argument ({maximum})")
+
+		self.colormap = colormap
+		self.minimum = float(minimum)
+		self.maximum = float(maximum)
+		self.lut_size = lut_size
+
+	def __call__(self, frames:np.ndarray):
+		'''
+		Parameters
+		----------
+		frames : numpy.ndarray
+			A chunk of frames from the model run
+
+		Returns
+		-------
+		numpy.ndarray
+			frames with the colormap applied, in RGB order
+		numpy.ndarray
+			frames with the colormap applied, in BRG (Blue-Red-Green) order
+		'''
+		return colorize_frames_in_range(frames, self.colormap, self.minimum, self.maximum, self.lut_size)
+
+
+def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple, lut_size:int=None):
 	'''
 	This function takes in a set of data frames and applies color to its values according to the accompanying colormap
 	Because this application uses two different libraries, one to generate an image and one to generate a video
@@ -332,6 +652,9 @@ def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
 		USING THIS COLORIZED SET OF FRAMES TO CREATE THE VIDEO FILE WILL PRODUCT A COLOR-DISTORTED VIDEO, BUT WHEN THE MOVIE IS USED BY
 		THE LEDEDIT SOFTWARE TO GENERATE THE LET LIGHT PROGRAM, THE GREEN AND RED CHANNELS ARE SWITCHED, SO THE COLORS WILL BE CORRECT IN THE LED STRING
 
+	The normalized values are quantized into indexes into a cached lookup table of 8-bit colors (see colormap_lut) and the whole set of frames is
+	colorized with a single take from that table, so no floating-point RGBA copy of the frames is ever made
+
 	Parameters
 	----------
 	frame : numpy.ndarray
@@ -340,6 +663,8 @@ def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
 		The colormap that will be applied to the time_series argument, it must be of a class in the matplotlib.colors
 	frame_shape : tuple
 		The shape of a single data frame stored in the model
+	lut_size : int
+		Optional number of colors in the lookup table, defaults to the colormap's own number of colors
 
 	Returns
 	-------
@@ -355,7 +680,7 @@ def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
 	return_rgb = None
 	return_brg = None
 
-	if (type(frames) != np.ndarray):
+	if (not isinstance(frames, np.ndarray)):
 		# Confirming that an object is a numpy array is a little different with checking for None
 		if (frames == None):
 			raise Exception("frames argument must be a numpy array")
@@ -364,7 +689,7 @@ def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
 
 	if (colormap == None):
 		raise Exception("colormap argument must be a color in the matplotlib.colors module")
-	elif (colormap.__class__.__module__ != colors.__name__):
+	elif (colormap.__class__.__module__ != colormap_module):
 		raise Exception(f"colormap must be a color in the matplotlib.colors module, not an object of type {type(colormap).__name__}")
 
 	if (frame_shape == None):
@@ -376,28 +701,14 @@ def colorize_frames(frames:np.ndarray, colormap:any, frame_shape:tuple):
 
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now save time_series
 
-	# Attempt to normalize the values in frames to make them all between zero and one
-	minimum = np.min(frames)
-	maximum = np.max(frames)
-	if (minimum != maximum):
-		# frames contains something other than the same value in every position, normalize it
-		frames = (frames - minimum) / (maximum - minimum)
-	else:
-		# frames only contains the same value in every position, flatten the whole thing to an array of ones
-		frames = np.ones(frames.shape)
+	# Frames with missing values (e.g. from gauges) are object arrays holding None, treat those values as NaN
+	frames = np.asarray(frames, dtype=float)
 
-	# Initialize the color-mapped version of the data frames by applying a color map to the first frame, removing its alpha value (the A in RGBA)
-	# and converting the remaining RGB values from floats between 0 and 1 to integers between 0 and 255
-	# Then iterate over the rest of frames, perform the same color mapping and conversion on each one and append the result to mapped_frames
-	return_rgb = np.empty((0, *frame_shape, 4))
-	for i in range(0, frames.shape[0]):
-		return_rgb = np.append(return_rgb, [colormap(frames[i])], axis=0)
+	# Normalize the values in frames over the range of values that they contain
+	minimum = np.nanmin(frames) if (not np.isnan(frames).all()) else 0.0
+	maximum = np.nanmax(frames) if (not np.isnan(frames).all()) else 0.0
 
-	return_rgb = np.array(255 * np.delete(return_rgb, 3, 2)).astype(np.uint8)
-
-	# Convert the RGB-formatted version of the frames to BRG-formatted (Blue-Red-Green) by rotating right the individual pixel's RGB values
-	#return_brg = np.flip(return_rgb, axis=(len(return_rgb.shape) - 1))
-	return_brg = np.roll(return_rgb, 1, axis=(len(return_rgb.shape) - 1))
+	(return_rgb, return_brg) = colorize_frames_in_range(frames, colormap, minimum, maximum, lut_size)
 
 	return (return_rgb, return_brg)
 
@@ -423,7 +734,7 @@ def save_frames_image(frames:np.ndarray, filename:str):
 
 	# Validate all incoming arguments, raising Exceptions if they are not valid
 
-	if (type(frames) != np.ndarray):
+	if (not isinstance(frames, np.ndarray)):
 		# Confirming that an object is a numpy array is a little different with checking for None
 		if (frames == None):
 			raise Exception("frames argument must be a numpy array")
@@ -439,17 +750,74 @@ def save_frames_image(frames:np.ndarray, filename:str):
 
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now create the image from time_series, save it and return it
 
+	from PIL import Image
+
 	return_image = Image.fromarray(frames)
 	return_image.save(filename)
 
 	return return_image
 
 
+def save_frames_contact_sheet(rgb_frames:np.ndarray, filename:str, frames:np.ndarray=None, overview_rows:int=None, tile_rows:int=None, reduction:str=None, block_size:int=default_block_size):
+	'''
+	This function saves a set of colorized frames as a contact sheet in bounded memory, a downsampled overview image and, optionally, full-resolution tiles
+	(see led.src.sinks.ContactSheetSink), instead of the single image with one row per frame that save_frames_image makes
+	The frames are handed over a block at a time, so memory-mapped frames (see led.src.storage.load_frames) are never loaded all at once
+
+	Parameters
+	----------
+	rgb_frames : numpy.ndarray
+		A set of colorized frames from the model run in RGB order, with shape (number of frames, width, 3)
+	filename : str
+		The path/name of the file to which the overview image will be written, tiles are written next to it
+	frames : numpy.ndarray
+		The data frames that were colorized, only needed for the max reduction
+	overview_rows : int
+		The largest number of rows in the overview image, defaults to a pre-determined value
+	tile_rows : int
+		Optional number of rows in each tile, no tiles are saved if not present
+	reduction : str
+		How each row of the overview is reduced from its frames, one of "max", "mean" or "decimate", defaults to "max" when there are data frames and to
+		"decimate" when there are not
+	block_size : int
+		The number of frames handed over at a time
+
+	Returns
+	-------
+	PIL.Image
+		Python image library (pillow, PIL) Image object of the overview
+	'''
+
+	# Validate all incoming arguments, raising Exceptions if they are not valid
+
+	if (not isinstance(rgb_frames, np.ndarray)):
+		# Confirming that an object is a numpy array is a little different with checking for None
+		if (rgb_frames == None):
+			raise Exception("rgb_frames argument must be a numpy array")
+		else:
+			raise Exception(f"rgb_frames argument must be a numpy array, not an object of type {type(rgb_frames).__name__}")
+
+	if ((frames is not None) and (len(frames) != rgb_frames.shape[0])):
+		raise Exception(f"if present, frames argument must hold as many frames as rgb_frames ({rgb_frames.shape[0]}), not {len(frames)}")
+
+	if (reduction == None):
+		reduction = "max" if (frames is not None) else "decimate"
+
+	# The rest of the arguments are checked by the sink
+	sheet = ContactSheetSink(filename, overview_rows, tile_rows, reduction)
+	for start in range(0, rgb_frames.shape[0], block_size):
+		sheet.write(frames[start : start + block_size] if (frames is not None) else None, rgb_frames[start : start + block_size])
+
+	sheet.close()
+
+	return sheet.image
+
+
 # Define a set of defaults used by the next function
 default_codec = "mp4v"
 default_frames_per_second = 30
 
-def save_frames_video(frames:np.ndarray, filename:str, frame_shape:tuple, codec:str=default_codec, frames_per_second:int=default_frames_per_second):
+def save_frames_video(frames:np.ndarray, filename:str, frame_shape:tuple, codec:str=default_codec, frames_per_second:int=default_frames_per_second, workers:int=None, mode:str=None):
 	'''
 	This function dates in a set of data frames and attempts to save create a video from them and save it to a file
 
@@ -467,11 +835,19 @@ def save_frames_video(frames:np.ndarray, filename:str, frame_shape:tuple, codec:
 		The identifier in OpenCV (cv2) of the CODEC that will generate the frames of video and join them to the final video object; defaults to a pre-determined value
 	frames_per_second : int
 		The speed of the video that will be generated with each frame of data corresponding to a frame of video; defaults to a pre-determined value
+	workers : int
+		The number of worker processes that encode segments of a long video concurrently, defaults to the number of cores (see led.src.video)
+		A workers argument of 1 encodes the whole video in this process
+		For an image sequence, the number of threads that save its images concurrently
+	mode : str
+		Optional video output mode, one of the keys of led.src.video.video_modes (e.g. a lossless "ffv1" video or "png-sequence" images), if present it
+		replaces the codec argument
+		For an image sequence, filename is the folder its images are saved in and frame_shape is not used, every frame is saved exactly as it is
 	'''
 
 	# Validate all incoming arguments, raising Exceptions if they are not valid
 
-	if (type(frames) != np.ndarray):
+	if (not isinstance(frames, np.ndarray)):
 		# Confirming that an object is a numpy array is a little different with checking for None
 		if (frames == None):
 			raise Exception("frames argument must be a numpy array")
@@ -516,13 +892,65 @@ def save_frames_video(frames:np.ndarray, filename:str, frame_shape:tuple, codec:
 		if ((frames_per_second < 1) or (frames_per_second > 60)):
 			raise Exception(f"if present, frames_per_second argument must be a positive integer between 1 and 60, not {frames_per_second}")
 
+	if ((workers != None) and ((type(workers) != int) or (workers < 1))):
+		raise Exception(f"if present, workers argument must be a positive integer, {workers} is invalid")
+
+	if (mode != None):
+		if (mode not in video_modes):
+			raise Exception(f"if present, mode argument must be one of {', '.join(video_modes.keys())}, not {mode}")
+		elif ("image_format" in video_modes[mode]):
+			# An image sequence is saved by a pool of threads instead of being encoded
+			save_frame_sequence(frames, filename, video_modes[mode]["image_format"], workers)
+			return
+
+		codec = video_modes[mode]["codec"]
+
 	# If the method call has made it to this point, all incoming arguments are at least syntactically valid, now save time_series
 
-	# For data frames that are only one pixel wide (i.e. three BRG color elements), the data frame must be added the video obect twice
-	add_twice = True if ((len(frames.shape) > 2) and (frames.shape[-3] > 0) and (frames[0].shape[1] == 3)) else False
+	# Long videos are split into segments that are encoded concurrently and then joined, short ones are encoded in this process
+	# Either way, each segment is encoded with the same sink that streams frames into a video while a model is running (it handles frames that are
+	# only one pixel tall)
+	save_video_segments(frames, filename, frame_shape, codec, frames_per_second, workers)
+
+
+def save_frames_stream(rgb_frames:np.ndarray, filename:str, channel_order:str=default_channel_order, frames_per_second:float=default_frames_per_second, frame_milliseconds:any=None):
+	'''
+	This function takes in a set of colorized data frames and saves them as a frame stream, a compact binary file that an LED controller can play back
+	without decoding anything (see led.src.framestream)
+	Unlike a video, the colors are stored exactly as they are, in the channel order the LEDs expect, so they do not need to be rotated to come out right
+
+	Parameters
+	----------
+	rgb_frames : numpy.ndarray
+		The set of colorized data frames, in RGB order (e.g. the first array returned by colorize_frames)
+	filename : str
+		The name of the file to which this frame stream will be saved
+	channel_order : str
+		The order of the color channels in the frame stream, defaults to GRB (the order WS2812 LEDs expect)
+	frames_per_second : float
+		The speed at which the frames are meant to be played; defaults to a pre-determined value
+	frame_milliseconds : any
+		Optional number of milliseconds each frame is displayed for, either one number for every frame or a list of one number per frame, the frames are
+		not timed if not present
+	'''
 
-	out_video = cv2.VideoWriter(filename, cv2.VideoWriter_fourcc(*codec), frames_per_second, frame_shape)
-	for i in range(frames.shape[0]):
-		out_video.write(np.array([frames[i], frames[i]]) if (add_twice) else frames[i])
+	# Validate all incoming arguments, raising Exceptions if they are not valid
+
+	if (not isinstance(rgb_frames, np.ndarray)):
+		# Confirming that an object is a numpy array is a little different with checking for None
+		if (rgb_frames == None):
+			raise Exception("rgb_frames argument must be a numpy array")
+		else:
+			raise Exception(f"rgb_frames argument must be a numpy array, not an object of type {type(rgb_frames).__name__}")
+
+	if (channel_order == None):
+		channel_order = default_channel_order
+
+	if (frames_per_second == None):
+		frames_per_second = default_frames_per_second
+	elif ((type(frames_per_second) not in [int, float]) or (frames_per_second <= 0)):
+		raise Exception(f"if present, frames_per_second argument must be a positive number, {frames_per_second} is invalid")
 
-	out_video.release()
+	# If the method call has made it to this point, the rest of the arguments are checked as the frames are packed, the whole set of frames is packed and
+	# written at once
+	write_frame_stream(rgb_frames, filename, channel_order, float(frames_per_second), frame_milliseconds)
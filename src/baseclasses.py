@@ -1,3 +1,5 @@
+import numpy as np
+
 from argparse import ArgumentParser, Namespace
 
 
@@ -14,6 +16,10 @@ class Configuration:
 	frames_file = None
 	image_file = None
 	video_file = None
+	video_mode = None
+	headless = False
+	colormap_name = None
+	loaded_colormap = None
 
 	argument_parser = ArgumentParser()
 	configured = False
@@ -52,6 +58,11 @@ class Configuration:
 			},
 		]
 
+		# Give every configuration object its own argument parser and error list, so that several projects can be configured in the same process
+		# (e.g. by the jobs of a parameter sweep, see led.src.sweeps)
+		self.argument_parser = ArgumentParser()
+		self.errors = []
+
 		# Look for each required keyword argument within the incoming set of initialization arguments
 		for kwarg in required_kwargs:
 			if (kwarg["name"] not in kwargs):
@@ -67,16 +78,44 @@ class Configuration:
 				setattr(self, kwarg["attribute"], kwargs[kwarg["name"]])
 
 		if (len(self.errors) == 0):
+			# The video output modes are defined alongside the video encoder, which is only imported once it is needed
+			from led.src.video import default_video_mode, video_modes
+
 			# No errors have been generated so far, now build a set of arguments to check for in the command-line parameters submitted with this project run
 			# NOTE: This does not parse any arguments yet, that is left up to the child class to do after they have added their own set of arguments to check
 			self.argument_parser.add_argument("projectfolder", type=str, help="folder in which this project is located, by default, files generated by this script run are saved in this folder by default")
 			self.argument_parser.add_argument("-t", "--time_series", "--time-series", "--timeseries", type=str, help=f"Optional destination file name for generated time-series data (replaces {self.time_series_file})")
 			self.argument_parser.add_argument("-i", "--image", type=str, help=f"Optional destination file name for generated image (replaces {self.image_file})")
 			self.argument_parser.add_argument("-v", "--video", type=str, help=f"Optional destination file name for generated video (replaces {self.video_file})")
+			self.argument_parser.add_argument("--frames", type=str, help=f"Optional destination file name for saved data frames (replaces {self.frames_file})")
+			self.argument_parser.add_argument("--video-mode", "--video_mode", "--videomode", type=str, choices=list(video_modes.keys()), default=default_video_mode, help=f"Optional video output mode, {default_video_mode} is lossy, the others keep every pixel exactly as it was colorized (defaults to {default_video_mode})")
+			self.argument_parser.add_argument("--headless", action="store_true", help="Flag indicating that no live graph or image preview should be shown while this project runs")
 
 		# If there are no error messages, this base confiuration ojbect is configured successfully
 		self.configured = len(self.errors) == 0
 
+	@property
+	def colormap(self):
+		'''
+		The matplotlib colormap named by colormap_name
+		matplotlib is only imported the first time this property is read, so a project run that never colorizes with it never pays for importing matplotlib
+
+		Returns
+		-------
+		matplotlib.colors.Colormap
+			The colormap with the name colormap_name
+		'''
+
+		if (self.loaded_colormap == None):
+			from matplotlib import colormaps
+
+			try:
+				self.loaded_colormap = colormaps[self.colormap_name]
+			except Exception as e:
+				raise Exception(f"-m (--map) color map argument {self.colormap_name} was not found in matplotlib")
+
+		return self.loaded_colormap
+
 	def check_parsed_arguments(self):
 		'''
 		This method handles looking for the base set of command-line parameters permitted or required by this base configuration object
@@ -94,13 +133,16 @@ class Configuration:
 			# If it includes a directory path, copy it across as-is; if it is a bare file name, prepend the projectfolder argument to it
 
 			self.project_folder = arguments.projectfolder
+			self.headless = arguments.headless
 
 			if (arguments.time_series != None):
 				self.time_series_file = arguments.time_series if ((arguments.time_series.find("/") + arguments.time_series.find("\\")) >= 0) else f"{self.project_folder}/{arguments.time_series}"
 			elif ((self.time_series_file.find("/") + self.time_series_file.find("\\")) < 0):
 				self.time_series_file = f"{self.project_folder}/{self.time_series_file}"
 
-			if ((self.frames_file.find("/") + self.frames_file.find("\\")) < 0):
+			if (arguments.frames != None):
+				self.frames_file = arguments.frames if ((arguments.frames.find("/") + arguments.frames.find("\\")) >= 0) else f"{self.project_folder}/{arguments.frames}"
+			elif ((self.frames_file.find("/") + self.frames_file.find("\\")) < 0):
 				self.frames_file = f"{self.project_folder}/{self.frames_file}"
 
 			if (arguments.image != None):
@@ -113,6 +155,22 @@ class Configuration:
 			elif ((self.video_file.find("/") + self.video_file.find("\\")) < 0):
 				self.video_file = f"{self.project_folder}/{self.video_file}"
 
+			# A default video file name is given the extension of the video output mode (an image sequence's name becomes the name of its folder), a video file
+			# name given with -v (--video) is used as it is
+			self.video_mode = arguments.video_mode
+			if (arguments.video == None):
+				from led.src.video import video_mode_filename
+
+				self.video_file = video_mode_filename(self.video_file, self.video_mode)
+
+			# A colormap named with the child class's -m (--map) argument is checked now, so a name that matplotlib does not know is reported before the run
+			# starts, a project's default colormap is only looked up the first time the colormap property is read
+			if ((getattr(arguments, "map", None) != None) and (arguments.map != "")):
+				from matplotlib import colormaps
+
+				if (arguments.map not in colormaps):
+					self.errors.append(f"-m (--map) color map argument {arguments.map} was not found in matplotlib")
+
 		return arguments
 
 
@@ -150,13 +208,38 @@ class LEDModel:
 			return_value = self.values
 		elif ((hasattr(self, "input_origin")) and (type(self.input_origin) == int)):
 			# If the child class has an integer attribute named input_origin, it is assumed that this is where the newest value is injected into the frame
-			return_value = self.frame[input_origin]
+			return_value = self.frame[self.input_origin]
 		else:
 			# Otherwise, just assume that the first value in the frame is the newest
 			return_value = self.frame[0]
 
 		return return_value
 
+	def newest_from_frames(self, frames:np.ndarray):
+		'''
+		This method is the batch version of the newest computed property
+		It takes a block of frames generated by this model and returns the value newest would have returned after each one of them
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			A block of frames generated by this model, with shape (number of frames, *frame shape)
+
+		Returns
+		-------
+		list[any]
+			One value per frame, suitable for extending a model run's time series
+		'''
+
+		return_values = None
+
+		if ((hasattr(self, "input_origin")) and (type(self.input_origin) == int)):
+			return_values = frames[ : , self.input_origin].tolist()
+		else:
+			return_values = frames[ : , 0].tolist()
+
+		return return_values
+
 
 	@property
 	def frame(self):
@@ -230,6 +313,65 @@ class SignalGenerator:
 
 		return self.current_value
 
+	def compute_next_block(self, samples:int):
+		'''
+		This method computes the next samples values of this generator in one pass and returns them as a numpy array
+		This version is the fallback for child classes that do not have a vectorized version of their own, it simply calls compute_next_value once per sample
+		A child class's version must return exactly what that many compute_next_value calls would, leave self.current_value set to the last value and must
+		not change self.counter (next_block takes care of that)
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			A one-dimensional array of floats, any None value that the generator would have emitted is represented as NaN
+		'''
+
+		return_values = np.empty(samples, dtype=float)
+
+		start = self.counter
+		for i in range(samples):
+			self.counter = start + i
+			self.compute_next_value()
+			return_values[i] = np.nan if (self.current_value == None) else self.current_value
+
+		self.counter = start
+
+		return return_values
+
+	def next_block(self, samples:int):
+		'''
+		This method computes the next samples values of this signal generator at once, as if the next property had been read samples times
+
+		Parameters
+		----------
+		samples : int
+			The number of values to generate, must be zero or greater
+
+		Returns
+		-------
+		numpy.ndarray
+			A one-dimensional array of floats, any None value that the generator would have emitted is represented as NaN
+		'''
+
+		if ((samples == None) or (type(samples) not in [int, float]) or (samples < 0)):
+			raise Exception(f"argument samples must be zero or a positive integer, {samples} is invalid")
+
+		samples = int(samples)
+		if (samples == 0):
+			return np.empty(0, dtype=float)
+
+		return_values = self.compute_next_block(samples)
+
+		# Increment counter as if next had been called once per sample
+		self.counter = self.counter + samples
+
+		return return_values
+
 	def input(self, value:any):
 		'''
 		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
@@ -312,6 +454,65 @@ class SignalAggregator:
 
 		return self.current_values
 
+	def compute_next_block(self, samples:int):
+		'''
+		This method computes the next samples sets of values of this aggregator's signals in one pass and returns them as a two-dimensional numpy array
+		This version is the fallback for child classes that do not have a vectorized version of their own, it simply calls compute_next_values once per sample
+		A child class's version must return exactly what that many compute_next_values calls would, leave self.current_values set to the last set of values
+		and must not change self.counter (next_block takes care of that)
+
+		Parameters
+		----------
+		samples : int
+			The number of sets of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			A float array of shape (samples, number of signals), any None value that a signal would have emitted is represented as NaN
+		'''
+
+		return_values = np.empty((samples, len(self.generators)), dtype=float)
+
+		start = self.counter
+		for i in range(samples):
+			self.counter = start + i
+			self.compute_next_values()
+			return_values[i] = [np.nan if (value == None) else value for value in self.current_values]
+
+		self.counter = start
+
+		return return_values
+
+	def next_block(self, samples:int):
+		'''
+		This method computes the next samples sets of values of this aggregator's signals at once, as if the next property had been read samples times
+
+		Parameters
+		----------
+		samples : int
+			The number of sets of values to generate, must be zero or greater
+
+		Returns
+		-------
+		numpy.ndarray
+			A float array of shape (samples, number of signals), any None value that a signal would have emitted is represented as NaN
+		'''
+
+		if ((samples == None) or (type(samples) not in [int, float]) or (samples < 0)):
+			raise Exception(f"argument samples must be zero or a positive integer, {samples} is invalid")
+
+		samples = int(samples)
+		if (samples == 0):
+			return np.empty((0, len(self.generators)), dtype=float)
+
+		return_values = self.compute_next_block(samples)
+
+		# Increment counter as if next had been read once per sample
+		self.counter = self.counter + samples
+
+		return return_values
+
 	def input(self, values:list):
 		'''
 		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
@@ -334,3 +535,42 @@ class SignalAggregator:
 		This computed property looks at each signal generator that has a finite signal and returns true only if all of them are at the ends of their signals
 		'''
 		return all([generator.end_of_signal for generator in self.finite_signals]) if (self.finite_signals != []) else False
+
+
+class FrameSink:
+	'''
+	THIS CLASS IS NOT INTENDED TO BE INSTANTIATED DIRECTLY
+	This class definition is intended to be used as a parent class for the output destinations ("sinks") that a model run can stream its results into
+	A sink receives the results of a model run one chunk of samples at a time while the model is running, so the run never has to hold all of them
+	The intention is that the child class will handle writing the parts of each chunk that it cares about to its destination
+	'''
+
+	# Set to True in a child class that needs the colorized versions of the frames, so they are only computed when some sink actually uses them
+	uses_color = False
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
+		This method is included here as a place-holding interface
+		The child class's version should write whichever parts of this chunk of results it handles to its destination
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			The chunk of data frames from the model, with shape (number of samples, *frame shape)
+		rgb_frames : numpy.ndarray
+			The colorized version of frames in RGB order, or None if no colorizer was given
+		brg_frames : numpy.ndarray
+			The colorized version of frames in BRG order, or None if no colorizer was given
+		time_series : list[any]
+			The chunk of time series values from the model, one per frame
+		'''
+		pass
+
+	def close(self):
+		'''
+		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
+		This method is included here as a place-holding interface
+		The child class's version should finish writing to its destination and release it, it is called once after the last chunk has been written
+		'''
+		pass
@@ -0,0 +1,181 @@
+import json
+import numpy as np
+
+
+# The green / yellow / orange / red alarm-level color scheme used by the gauges project and the MicroPython flowstate application
+# Each band covers the values above the previous band's "to" value up to and including its own "to" value, the last band also covers everything above it
+# Within a band, each color channel ramps up from "color" by as much as "ramp" as the value moves from "from" to "to"
+alarm_level_bands = [
+	{"to": 2.0, "color": [0, 255, 0]},
+	{"from": 2.0, "to": 50.0, "color": [205, 205, 0], "ramp": [50, 50, 0]},
+	{"from": 50.0, "to": 90.0, "color": [205, 120, 0], "ramp": [50, 45, 0]},
+	{"from": 90.0, "to": 100.0, "color": [205, 0, 0], "ramp": [50, 0, 0]},
+]
+
+
+class ThresholdColormap:
+	'''
+	This class defines a piecewise colormap that maps values to colors according to a set of thresholds ("bands") instead of a continuous matplotlib colormap
+	Values that are missing (None or NaN) are mapped to a single missing-value color, black by default
+	'''
+
+	bands = None
+	missing_color = None
+
+	default_missing_color = [0, 0, 0]
+
+	def __init__(self, bands:list, missing_color:list=None):
+		'''
+		Parameters
+		----------
+		bands : list[dict]
+			The ordered set of bands in this colormap, each one a dict with the following items
+			* "to" : float - the largest value in this band, values above the last band's "to" value are clipped to it
+			* "color" : [int, int, int] - the RGB color at the bottom of this band
+			* "from" : float - optional, the value at which this band's ramp starts, defaults to the previous band's "to" value
+			* "ramp" : [int, int, int] - optional, the amount added to each color channel as the value moves from "from" to "to", defaults to no ramp
+		missing_color : list[int]
+			The RGB color given to missing (None or NaN) values, defaults to black
+		'''
+
+		if (bands == None):
+			raise Exception("argument bands must be a non-empty list of dicts")
+		elif (type(bands) != list):
+			raise Exception(f"argument bands must be a non-empty list of dicts, not an object of type {type(bands).__name__}")
+		elif (len(bands) == 0):
+			raise Exception("argument bands must be a non-empty list of dicts, it is an empty list")
+
+		self.bands = []
+		previous_to = None
+		for i, band in enumerate(bands):
+			if (type(band) != dict):
+				raise Exception(f"band #{i + 1} must be a dict, not an object of type {type(band).__name__}")
+			elif (("to" not in band) or (type(band["to"]) not in [int, float])):
+				raise Exception(f'band #{i + 1} must have a numeric "to" value')
+			elif (("color" not in band) or (type(band["color"]) not in [list, tuple]) or (len(band["color"]) != 3)):
+				raise Exception(f'band #{i + 1} must have a "color" value that is a list of three integers between 0 and 255')
+			elif ((previous_to != None) and (band["to"] <= previous_to)):
+				raise Exception(f'the "to" values of the bands must be increasing, band #{i + 1} has a "to" value of {band["to"]} after {previous_to}')
+
+			band_from = band["from"] if ("from" in band) else previous_to
+			ramp = band["ramp"] if ("ramp" in band) else [0, 0, 0]
+			if ((band_from == None) and (any(ramp))):
+				raise Exception(f'band #{i + 1} has a ramp, so it must have a "from" value')
+
+			self.bands.append({
+				"from": float(band_from) if (band_from != None) else None,
+				"to": float(band["to"]),
+				"color": [int(channel) for channel in band["color"]],
+				"ramp": [int(channel) for channel in ramp],
+			})
+			previous_to = band["to"]
+
+		self.missing_color = [int(channel) for channel in missing_color] if (missing_color != None) else self.default_missing_color
+
+	def apply(self, values:any):
+		'''
+		This method maps a whole array of values to RGB colors at once
+
+		Parameters
+		----------
+		values : any
+			A numpy array (or anything that can be converted into one) of values of any shape, None and NaN values are treated as missing
+
+		Returns
+		-------
+		numpy.ndarray
+			A numpy.uint8 array with the shape of values plus a last axis of length three holding each value's RGB color
+		'''
+
+		values = np.asarray(values, dtype=float)
+		is_missing = np.isnan(values)
+
+		# Values above the last band are clipped to the top of it, and each value falls into the first band whose "to" value it does not exceed
+		values = np.minimum(values, self.bands[-1]["to"])
+		conditions = [values <= band["to"] for band in self.bands[ : -1]]
+
+		return_colors = np.empty((*values.shape, 3), dtype=np.uint8)
+		for channel in range(3):
+			choices = []
+			for band in self.bands:
+				if (band["ramp"][channel] == 0):
+					choices.append(np.full(values.shape, band["color"][channel] % 256, dtype=np.int64))
+				else:
+					ramp = np.trunc(((values - band["from"]) / (band["to"] - band["from"])) * band["ramp"][channel])
+					choices.append((band["color"][channel] + np.where(is_missing, 0, ramp).astype(np.int64)) % 256)
+
+			return_colors[..., channel] = np.select(conditions, choices[ : -1], choices[-1])
+
+		return_colors[is_missing] = self.missing_color
+
+		return return_colors
+
+	def colorize_frames(self, frames:np.ndarray, mask:np.ndarray=None):
+		'''
+		This method is the threshold colormap counterpart of led.src.actions.colorize_frames, it colors a whole set of data frames at once and
+		returns both the RGB version (for image files) and the BRG version (for video files that LEDEdit will use)
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			A set of frames from the model run that will have this colormap applied to them
+		mask : numpy.ndarray
+			Optional Boolean array with the shape of a single frame, the pixels where it is True are colored black no matter what their value is
+			(e.g. led.src.ledmodels.Gauges.border_mask)
+
+		Returns
+		-------
+		numpy.ndarray
+			The frames with this colormap applied, in RGB order
+		numpy.ndarray
+			The frames with this colormap applied, in BRG (Blue-Red-Green) order
+		'''
+
+		return_rgb = self.apply(frames)
+		if (mask is not None):
+			return_rgb[..., mask, : ] = 0
+
+		# Convert the RGB-formatted version of the frames to BRG-formatted by rotating right the individual pixel's RGB values
+		return_brg = np.roll(return_rgb, 1, axis=-1)
+
+		return (return_rgb, return_brg)
+
+	def to_table(self):
+		'''
+		This method converts this colormap to a compact table that needs nothing but plain Python to use, such as on a MicroPython device
+		(see map_value_to_rgb in micropython/flowstate.py)
+
+		Returns
+		-------
+		list[list]
+			One row per band, [from, to, red, green, blue, red ramp, green ramp, blue ramp], followed by one final row holding the missing-value color
+		'''
+
+		return_table = [[band["from"], band["to"], *band["color"], *band["ramp"]] for band in self.bands]
+		return_table.append(list(self.missing_color))
+
+		return return_table
+
+	def save_table(self, filename:str):
+		'''
+		This method saves this colormap's compact table (see to_table) as a JSON-formatted text file
+
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the table will be written
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		with open(filename, "w") as file_out:
+			json.dump(self.to_table(), file_out)
+
+
+# A ready-to-use version of the alarm-level color scheme
+alarm_level_colormap = ThresholdColormap(alarm_level_bands)
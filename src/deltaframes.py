@@ -0,0 +1,510 @@
+'''
+This module stores data frames run-length and delta encoded, for model runs that are mostly static (e.g. gauges, or the zero-signal tail that follows a
+signal through a scrolling window), where a dense .npy file holds the same frame over and over again
+* A run of identical frames is stored once, as one entry that stands for every frame from its start up to the start of the next entry
+* An entry's frame is either a keyframe, stored in full, or a sparse delta, the positions and values of the pixels that differ from the latest keyframe
+  A new keyframe is started whenever more than keyframe_fraction of the pixels differ from the latest one
+Since every delta is taken against a keyframe (rather than against the frame before it), any frame is decoded from at most one keyframe and one delta, and
+the entry holding a frame is found through an index of the entry at the start of every block of block_frames frames, so any frame is decoded in constant time
+
+The file is laid out as:
+* a header of header_size bytes, the magic string, the offset of the index and the JSON-formatted description of the frames (data type, frame shape, frame
+  count, block size), padded with spaces
+* the keyframes and deltas, in the order they were written, a delta being its positions (4-byte unsigned ints) followed by its values
+* the index, the entries (see entry_dtype) and the block index, each one saved as a NumPy array
+'''
+
+import json
+import numpy as np
+
+from led.src.baseclasses import FrameSink as __BaseSink__
+from led.src.storage import check_filename
+
+delta_frames_magic = b"LEDRLE01"
+header_size = 256
+
+# One entry per run of identical frames, keyframe and delta are byte offsets in the file, changes is the number of pixels in the delta (zero when the
+# frame is the keyframe itself)
+entry_dtype = np.dtype([("start", "<u8"), ("keyframe", "<u8"), ("delta", "<u8"), ("changes", "<u4")])
+
+# Define a set of defaults used by the next functions
+default_keyframe_fraction = 0.25
+default_block_frames = 256
+default_block_size = 4096
+
+def differing_pixels(frame:np.ndarray, reference:np.ndarray):
+	'''
+	This function finds the pixels of a flattened frame that differ from a reference frame, missing values (NaN) are equal to each other
+
+	Parameters
+	----------
+	frame : numpy.ndarray
+		The flattened frame, or a block of flattened frames
+	reference : numpy.ndarray
+		The flattened reference frame, or a block of them
+
+	Returns
+	-------
+	numpy.ndarray
+		A Boolean array, True where the pixel differs
+	'''
+
+	differing = frame != reference
+	if (frame.dtype.kind in "fc"):
+		differing = differing & ~(np.isnan(frame) & np.isnan(reference))
+
+	return differing
+
+
+class DeltaFramesWriter(__BaseSink__):
+	'''
+	This class defines a writer that appends data frames to a run-length and delta encoded frames file (see this module's description) as they are produced
+	It is also a sink, so it can be handed to led.src.actions.run_model to record the frames of a run while the model is running
+	Repeated frames are found for a whole block of frames at once, so the work done (and the space used) grows with the number of distinct frames rather than
+	with the number of frames
+	The index is written when the writer is closed, the file cannot be read before then
+	'''
+
+	filename = None
+	frame_shape = None
+	dtype = None
+	keyframe_fraction = default_keyframe_fraction
+	block_frames = default_block_frames
+	count = 0
+	file_out = None
+
+	# The latest keyframe and the previous frame (both flattened), the position in the file that the next keyframe or delta is written at and the entries
+	# written so far
+	keyframe = None
+	previous = None
+	position = 0
+	entries = None
+
+	# The position of the index, zero until the file is closed
+	index_position = 0
+
+	def __init__(self, filename:str, frame_shape:tuple=None, dtype:any=None, keyframe_fraction:float=None):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the frames will be written
+		frame_shape : tuple
+			The shape of a single frame, if not present it is taken from the first frames written
+		dtype : any
+			The numpy data type the frames are stored as, if not present it is taken from the first frames written
+			Frames holding None values (e.g. from gauges) are stored as floats with NaN in place of None
+		keyframe_fraction : float
+			The fraction of a frame's pixels that can differ from the latest keyframe before the frame becomes a new keyframe, defaults to a pre-determined value
+		'''
+
+		check_filename(filename)
+
+		if (keyframe_fraction != None):
+			if ((type(keyframe_fraction) not in [int, float]) or (keyframe_fraction < 0) or (keyframe_fraction > 1)):
+				raise Exception(f"if present, keyframe_fraction argument must be a number between 0 and 1, {keyframe_fraction} is invalid")
+
+			self.keyframe_fraction = float(keyframe_fraction)
+
+		self.filename = filename
+		self.frame_shape = frame_shape
+		self.dtype = np.dtype(dtype) if (dtype is not None) else None
+		self.count = 0
+		self.entries = []
+
+	def header(self):
+		'''
+		This method builds the file's header for the frames written so far, always with the same length
+
+		Returns
+		-------
+		bytes
+			The header
+		'''
+
+		description = json.dumps({
+			"descr": np.lib.format.dtype_to_descr(self.dtype),
+			"frame_shape": list(self.frame_shape),
+			"frame_count": self.count,
+			"block_frames": self.block_frames,
+		}).encode("utf-8")
+
+		if (len(delta_frames_magic) + 8 + len(description) > header_size):
+			raise Exception(f"the description of the frames written to {self.filename} does not fit in its header")
+
+		header = delta_frames_magic + int(self.index_position).to_bytes(8, "little") + description
+		return header + (b" " * (header_size - len(header)))
+
+	def start(self):
+		'''
+		This method creates the file and writes its header, once the frame shape and data type are known
+		'''
+
+		self.file_out = open(self.filename, "wb")
+		self.file_out.write(self.header())
+		self.position = header_size
+
+	def append(self, frames:np.ndarray):
+		'''
+		This method appends a block of frames to the file, every frame that is identical to the one before it only extends the run of that frame
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			The block of frames to be written, with shape (number of frames, *frame shape)
+		'''
+
+		frames = np.asarray(frames)
+		if (frames.dtype == object):
+			frames = frames.astype(float)
+
+		if (self.file_out == None):
+			# This is the first block of frames, work out anything that was not given when this object was initialized and start the file
+			if (self.frame_shape == None):
+				self.frame_shape = tuple(frames.shape[1 : ])
+			if (self.dtype is None):
+				self.dtype = frames.dtype
+
+			self.start()
+
+		if (tuple(frames.shape[1 : ]) != tuple(self.frame_shape)):
+			raise Exception(f"frames written to {self.filename} must have the shape {self.frame_shape}, not {frames.shape[1 : ]}")
+
+		if (frames.shape[0] == 0):
+			return
+
+		flat_frames = np.ascontiguousarray(frames, dtype=self.dtype).reshape(frames.shape[0], -1)
+
+		# Find every frame that differs from the one before it all at once, the first one is compared with the last frame of the previous block (the very
+		# first frame always starts a run)
+		changed_frames = np.empty(flat_frames.shape[0], dtype=bool)
+		changed_frames[0] = (self.previous is None) or differing_pixels(flat_frames[0], self.previous).any()
+		changed_frames[1 : ] = differing_pixels(flat_frames[1 : ], flat_frames[ : -1]).any(axis=1)
+		distinct = np.flatnonzero(changed_frames)
+
+		# Each distinct frame becomes a keyframe or a delta against the latest keyframe, written out together once the block is done
+		pieces = []
+		for i in distinct:
+			frame = flat_frames[i]
+			changed = np.flatnonzero(differing_pixels(frame, self.keyframe)) if (self.keyframe is not None) else None
+
+			if ((changed is None) or (changed.shape[0] > self.keyframe_fraction * frame.shape[0])):
+				self.keyframe = frame.copy()
+				self.entries.append((self.count + i, self.position, 0, 0))
+				pieces.append(frame.tobytes())
+				self.position = self.position + frame.nbytes
+			else:
+				values = frame[changed]
+				self.entries.append((self.count + i, self.entries[-1][1], self.position if (changed.shape[0] > 0) else 0, changed.shape[0]))
+				pieces.append(changed.astype("<u4").tobytes())
+				pieces.append(values.tobytes())
+				self.position = self.position + (4 * changed.shape[0]) + values.nbytes
+
+		self.file_out.write(b"".join(pieces))
+		self.previous = flat_frames[-1].copy()
+		self.count = self.count + frames.shape[0]
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, appending the chunk's data frames to the file
+		'''
+
+		if (frames is not None):
+			self.append(frames)
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, writing the index and the final header and closing the file
+		If no frames were written but the frame shape and data type were given, a valid file holding no frames is still written
+		'''
+
+		if ((self.file_out == None) and (self.index_position == 0) and (self.frame_shape != None) and (self.dtype is not None)):
+			self.start()
+
+		if (self.file_out != None):
+			entries = np.array(self.entries, dtype=entry_dtype)
+
+			# The block index holds the entry that each block of block_frames frames starts in
+			block_entries = np.searchsorted(entries["start"], np.arange(0, self.count, self.block_frames, dtype=np.uint64), side="right").astype(np.int64) - 1
+
+			self.index_position = self.position
+			np.save(self.file_out, entries, allow_pickle=False)
+			np.save(self.file_out, block_entries, allow_pickle=False)
+
+			file_out = self.file_out
+			self.file_out = None
+			file_out.seek(0)
+			file_out.write(self.header())
+			file_out.close()
+
+
+class DeltaFrames:
+	'''
+	This class defines a lazy, read-only view of a run-length and delta encoded frames file (see this module's description)
+	It is indexed like the numpy array of frames it stands for, but only the frames that are asked for are decoded, straight out of the memory-mapped file
+	Decoded frames are read-only, a frame that is used for a whole run of frames is the same array every time
+	'''
+
+	filename = None
+	dtype = None
+	frame_shape = None
+	frame_count = 0
+	block_frames = default_block_frames
+
+	data = None
+	entries = None
+	block_entries = None
+
+	# The most recently decoded entry and its frame, so that reading frames in order decodes each entry only once
+	decoded_entry = None
+	decoded_frame = None
+
+	def __init__(self, filename:str):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the frames file
+		'''
+
+		check_filename(filename)
+
+		with open(filename, "rb") as file_in:
+			header = file_in.read(header_size)
+			if ((len(header) < header_size) or (header[ : len(delta_frames_magic)] != delta_frames_magic)):
+				raise Exception(f"{filename} is not a run-length and delta encoded frames file")
+
+			index_position = int.from_bytes(header[len(delta_frames_magic) : len(delta_frames_magic) + 8], "little")
+			if (index_position == 0):
+				raise Exception(f"{filename} has no index, the writer that was writing it was never closed")
+
+			description = json.loads(header[len(delta_frames_magic) + 8 : ].decode("utf-8"))
+
+			file_in.seek(index_position)
+			self.entries = np.load(file_in, allow_pickle=False)
+			self.block_entries = np.load(file_in, allow_pickle=False)
+
+		self.filename = filename
+		self.dtype = np.lib.format.descr_to_dtype(description["descr"])
+		self.frame_shape = tuple(description["frame_shape"])
+		self.frame_count = description["frame_count"]
+		self.block_frames = description["block_frames"]
+		self.frame_size = int(np.prod(self.frame_shape, dtype=int))
+
+		# The keyframes and deltas are memory-mapped, they are only read as they are decoded
+		self.data = np.memmap(filename, dtype=np.uint8, mode="r", shape=(index_position, )) if (index_position > 0) else np.empty(0, dtype=np.uint8)
+
+	@property
+	def shape(self):
+		'''
+		This computed property is the shape of the array of frames this object stands for
+		'''
+		return (self.frame_count, *self.frame_shape)
+
+	@property
+	def distinct_frames(self):
+		'''
+		This computed property is the number of runs of identical frames, i.e. the number of frames that are actually stored
+		'''
+		return self.entries.shape[0]
+
+	def __len__(self):
+		return self.frame_count
+
+	def entry_of(self, frame:int):
+		'''
+		This method finds the entry that holds a frame, only searching the entries that start within the frame's block of block_frames frames
+
+		Parameters
+		----------
+		frame : int
+			The zero-based number of the frame
+
+		Returns
+		-------
+		int
+			The position of the entry in entries
+		'''
+
+		block = frame // self.block_frames
+		first = self.block_entries[block]
+		last = self.block_entries[block + 1] if (block + 1 < self.block_entries.shape[0]) else self.entries.shape[0] - 1
+
+		return int(first + np.searchsorted(self.entries["start"][first : last + 1], frame, side="right") - 1)
+
+	def decode_entry(self, entry:int):
+		'''
+		This method decodes the frame of an entry, from its keyframe and, if it has one, its delta
+
+		Parameters
+		----------
+		entry : int
+			The position of the entry in entries
+
+		Returns
+		-------
+		numpy.ndarray
+			The frame, read-only
+		'''
+
+		if (entry == self.decoded_entry):
+			return self.decoded_frame
+
+		(start, keyframe, delta, changes) = self.entries[entry].tolist()
+		frame = self.data[keyframe : keyframe + (self.frame_size * self.dtype.itemsize)].view(self.dtype)
+		if (changes > 0):
+			frame = frame.copy()
+			positions = self.data[delta : delta + (4 * changes)].view("<u4")
+			frame[positions] = self.data[delta + (4 * changes) : delta + (4 * changes) + (changes * self.dtype.itemsize)].view(self.dtype)
+			frame.flags.writeable = False
+
+		(self.decoded_entry, self.decoded_frame) = (entry, frame.reshape(self.frame_shape))
+
+		return self.decoded_frame
+
+	def runs(self, start:int=0, stop:int=None):
+		'''
+		This generator method decodes the frames from start up to stop one run of identical frames at a time
+
+		Parameters
+		----------
+		start : int
+			The zero-based number of the first frame
+		stop : int
+			The number of the frame after the last one, defaults to the number of frames
+
+		Yields
+		------
+		tuple
+			Each run's (frame, number of frames in the run within start to stop)
+		'''
+
+		stop = self.frame_count if (stop == None) else min(stop, self.frame_count)
+		if (start >= stop):
+			return
+
+		entry = self.entry_of(start)
+		while (start < stop):
+			end = min(int(self.entries["start"][entry + 1]) if (entry + 1 < self.entries.shape[0]) else self.frame_count, stop)
+			yield (self.decode_entry(entry), end - start)
+			(start, entry) = (end, entry + 1)
+
+	def __getitem__(self, key:any):
+		'''
+		A single frame (int) is decoded on its own, a range of frames (slice) is expanded from its runs into a new array
+		'''
+
+		if (isinstance(key, (int, np.integer))):
+			frame = int(key) + (self.frame_count if (key < 0) else 0)
+			if ((frame < 0) or (frame >= self.frame_count)):
+				raise IndexError(f"frame {key} is out of range for {self.frame_count} frames")
+
+			return self.decode_entry(self.entry_of(frame))
+		elif (isinstance(key, slice)):
+			(start, stop, step) = key.indices(self.frame_count)
+			if (step != 1):
+				return np.stack([self[i] for i in range(start, stop, step)]) if (len(range(start, stop, step)) > 0) else np.empty((0, *self.frame_shape), dtype=self.dtype)
+
+			return_frames = np.empty((max(stop - start, 0), *self.frame_shape), dtype=self.dtype)
+			position = 0
+			for (frame, count) in self.runs(start, stop):
+				return_frames[position : position + count] = frame
+				position = position + count
+
+			return return_frames
+		else:
+			raise TypeError(f"frames can only be indexed with an int or a slice, not an object of type {type(key).__name__}")
+
+	def __iter__(self):
+		for (frame, count) in self.runs():
+			for i in range(count):
+				yield frame
+
+	def __array__(self, dtype:any=None, copy:any=None):
+		return self[ : ] if (dtype is None) else self[ : ].astype(dtype)
+
+	def write_to(self, sinks:list, colorizer:any=None, block_size:int=default_block_size):
+		'''
+		This method hands every frame to a set of sinks (e.g. a led.src.sinks.VideoSink), colorizing each run of identical frames only once per block
+		The frames are handed over in blocks of at most block_size frames, a block gathers as many runs as fit in it (splitting a run that does not fit
+		across blocks), and each block's distinct frames are colorized together and only then repeated out to the length of their runs, so the colorizing
+		work grows with the number of distinct frames and the memory used only with block_size, however long a run is
+
+		Parameters
+		----------
+		sinks : list[led.src.baseclasses.FrameSink]
+			The set of sinks that will receive the frames, they are not closed
+		colorizer : any
+			A callable that takes a block of frames and returns an (RGB frames, BRG frames) tuple (see led.src.sinks.SinkPipeline), required if any of
+			the sinks uses colors
+		block_size : int
+			The largest number of frames handed to the sinks at a time
+		'''
+
+		uses_color = any([sink.uses_color for sink in sinks])
+		if ((uses_color) and (not callable(colorizer))):
+			raise Exception("argument colorizer must be a callable that returns RGB and BRG frames when any of the sinks uses colors")
+
+		if ((type(block_size) != int) or (block_size <= 0)):
+			raise Exception(f"block_size argument must be a positive integer, {block_size} is invalid")
+
+		runs = []
+		frames_in_block = 0
+		for (frame, count) in self.runs():
+			while (count > 0):
+				# Take as much of the run as still fits in the block, the rest of it goes into the next block(s)
+				taken = min(count, block_size - frames_in_block)
+				runs.append((frame, taken))
+				(count, frames_in_block) = (count - taken, frames_in_block + taken)
+
+				if (frames_in_block == block_size):
+					self.write_runs(runs, sinks, colorizer if (uses_color) else None)
+					(runs, frames_in_block) = ([], 0)
+
+		if (runs != []):
+			self.write_runs(runs, sinks, colorizer if (uses_color) else None)
+
+	def write_runs(self, runs:list, sinks:list, colorizer:any):
+		'''
+		This method colorizes a block of runs' distinct frames and hands the runs, repeated out to their length, to a set of sinks
+		'''
+
+		distinct = np.stack([frame for (frame, count) in runs])
+		counts = np.array([count for (frame, count) in runs])
+
+		(rgb_frames, brg_frames) = colorizer(distinct) if (colorizer != None) else (None, None)
+		(rgb_frames, brg_frames) = [np.repeat(colorized, counts, axis=0) if (colorized is not None) else None for colorized in [rgb_frames, brg_frames]]
+
+		frames = np.repeat(distinct, counts, axis=0)
+		for sink in sinks:
+			sink.write(frames, rgb_frames, brg_frames, None)
+
+
+def save_frames_delta(frames:np.ndarray, filename:str, keyframe_fraction:float=None, block_size:int=default_block_size):
+	'''
+	This function saves a whole set of data frames to a run-length and delta encoded frames file, a block at a time
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The set of frames that contain the values from an LED model for a series of time-varying data
+	filename : str
+		The path/name of the file to which frames will be written
+	keyframe_fraction : float
+		The fraction of a frame's pixels that can differ from the latest keyframe before the frame becomes a new keyframe, defaults to a pre-determined value
+	block_size : int
+		The number of frames compared and written at a time
+
+	Returns
+	-------
+	int
+		The number of distinct frames stored
+	'''
+
+	writer = DeltaFramesWriter(filename, tuple(frames.shape[1 : ]), keyframe_fraction=keyframe_fraction)
+	for start in range(0, max(frames.shape[0], 1), block_size):
+		writer.append(frames[start : start + block_size])
+
+	writer.close()
+
+	return len(writer.entries)
@@ -0,0 +1,416 @@
+'''
+This module writes and reads frame streams, the compact binary format for sending colorized frames to an LED controller
+A frame stream is a small fixed-size header followed by every frame's colors packed as bytes, three per LED, in the channel order the LEDs expect (GRB for
+WS2812 LEDs), so a controller can copy each frame straight into its LED buffer with no decoding at all
+
+The header is frame_stream_header_size bytes, little-endian:
+* 4 bytes - the magic string b"LEDF"
+* 1 byte - the format version
+* 1 byte - flags, bit 0 is set when every frame is preceded by its own display time
+* 3 bytes - the channel order, as ASCII (e.g. b"GRB")
+* 1 byte - padding
+* 4 bytes - the number of LEDs in each frame (unsigned int)
+* 4 bytes - the number of frames (unsigned int)
+* 4 bytes - the frames per second (float)
+* 2 bytes - padding
+Each frame is then, optionally, the number of milliseconds it is displayed for (4-byte unsigned int) followed by its LED count times three color bytes
+'''
+
+import numpy as np
+
+from struct import Struct
+
+from led.src.baseclasses import FrameSink as __BaseSink__
+from led.src.storage import check_filename
+
+frame_stream_magic = b"LEDF"
+frame_stream_version = 1
+# The padding is written as explicit byte string fields (rather than the x pad code) so that MicroPython's struct module, which only documents the
+# b/B/h/H/i/I/l/L/q/Q/s/P/f/d codes, can read the header too (see the micropython project's framestream module)
+frame_stream_header = Struct("<4sBB3s1sIIf2s")
+frame_stream_header_size = frame_stream_header.size
+
+# Flag bits in the header
+frame_stream_timed = 1
+
+# The positions of the red, green and blue channels of an RGB color in each channel order that a frame stream can be written in
+channel_orders = {
+	"RGB": [0, 1, 2],
+	"RBG": [0, 2, 1],
+	"GRB": [1, 0, 2],
+	"GBR": [1, 2, 0],
+	"BRG": [2, 0, 1],
+	"BGR": [2, 1, 0],
+}
+
+# Define a set of defaults used by the next functions
+default_channel_order = "GRB"
+default_frames_per_second = 30
+
+def pack_frame_stream_header(timed:bool, channel_order:str, led_count:int, frame_count:int, frames_per_second:float):
+	'''
+	This function packs a frame stream header, with zero bytes in its padding fields
+
+	Parameters
+	----------
+	timed : bool
+		Whether each frame is preceded by its display time
+	channel_order : str
+		The order of the color channels in the frame stream
+	led_count : int
+		The number of LEDs in each frame
+	frame_count : int
+		The number of frames
+	frames_per_second : float
+		The speed at which the frames are meant to be played
+
+	Returns
+	-------
+	bytes
+		The packed header
+	'''
+
+	return frame_stream_header.pack(frame_stream_magic, frame_stream_version, frame_stream_timed if (timed) else 0, channel_order.encode("ascii"), b"", led_count, frame_count, frames_per_second, b"")
+
+
+def check_channel_order(channel_order:str):
+	'''
+	This function checks a channel order argument, raising an Exception if it is not valid
+
+	Parameters
+	----------
+	channel_order : str
+		The channel order to check, one of the keys of channel_orders (in any case)
+
+	Returns
+	-------
+	str
+		The channel order in upper case
+	'''
+
+	if (type(channel_order) != str):
+		raise Exception(f"channel_order argument must be a string, not an object of type {type(channel_order).__name__}")
+	elif (channel_order.upper() not in channel_orders):
+		raise Exception(f"channel_order argument must be one of {', '.join(channel_orders.keys())}, not {channel_order}")
+
+	return channel_order.upper()
+
+
+def check_rgb_frames(rgb_frames:np.ndarray):
+	'''
+	This function checks a set of RGB-colorized frames, raising an Exception if they cannot be packed into a frame stream
+
+	Parameters
+	----------
+	rgb_frames : numpy.ndarray
+		The colorized frames to check
+	'''
+
+	if (not isinstance(rgb_frames, np.ndarray)):
+		raise Exception(f"rgb_frames argument must be a numpy array, not an object of type {type(rgb_frames).__name__}")
+	elif ((rgb_frames.ndim < 3) or (rgb_frames.shape[-1] != 3)):
+		raise Exception(f"rgb_frames argument must have the shape (number of frames, *LEDs, 3), not {rgb_frames.shape}")
+
+
+def frame_stream_dtype(led_count:int, timed:bool):
+	'''
+	This function builds the numpy data type of one frame in a frame stream, so that a whole set of frames can be built, written or memory-mapped at once
+
+	Parameters
+	----------
+	led_count : int
+		The number of LEDs in each frame
+	timed : bool
+		Whether each frame is preceded by its display time
+
+	Returns
+	-------
+	numpy.dtype
+		A packed structured data type with a "milliseconds" field (only if timed) and a "colors" field of led_count * 3 bytes
+	'''
+
+	return np.dtype(([("milliseconds", "<u4")] if (timed) else []) + [("colors", np.uint8, (led_count * 3, ))])
+
+
+def pack_frames(rgb_frames:np.ndarray, channel_order:str, frame_milliseconds:any=None):
+	'''
+	This function packs a set of RGB-colorized frames into frame stream records, reordering the color channels of every frame at once
+
+	Parameters
+	----------
+	rgb_frames : numpy.ndarray
+		The colorized frames in RGB order, with shape (number of frames, *LEDs, 3), e.g. from led.src.actions.colorize_frames
+		A frame with more than one dimension of LEDs is flattened in row order
+	channel_order : str
+		The order of the color channels in the packed frames
+	frame_milliseconds : any
+		Optional number of milliseconds each frame is displayed for, either one number for every frame or a sequence of one number per frame, the frames are
+		not timed if not present
+
+	Returns
+	-------
+	numpy.ndarray
+		A one-dimensional array of frame stream records (see frame_stream_dtype)
+	'''
+
+	rgb_frames = np.asarray(rgb_frames)
+	led_count = int(np.prod(rgb_frames.shape[1 : -1], dtype=int))
+	timed = frame_milliseconds is not None
+
+	return_records = np.empty(rgb_frames.shape[0], dtype=frame_stream_dtype(led_count, timed))
+	return_records["colors"] = rgb_frames[..., channel_orders[channel_order]].astype(np.uint8, copy=False).reshape(rgb_frames.shape[0], led_count * 3)
+	if (timed):
+		return_records["milliseconds"] = frame_milliseconds
+
+	return return_records
+
+
+def check_frame_milliseconds(frame_milliseconds:any, frame_count:int):
+	'''
+	This function checks a frame_milliseconds argument, raising an Exception if it is not valid
+
+	Parameters
+	----------
+	frame_milliseconds : any
+		One number of milliseconds for every frame or a sequence of one number per frame
+	frame_count : int
+		The number of frames being timed
+
+	Returns
+	-------
+	any
+		frame_milliseconds as an int or a numpy array of unsigned ints
+	'''
+
+	if (type(frame_milliseconds) in [int, float]):
+		frame_milliseconds = np.asarray(frame_milliseconds)
+	else:
+		try:
+			frame_milliseconds = np.asarray(frame_milliseconds, dtype=float)
+		except (TypeError, ValueError):
+			raise Exception("if present, frame_milliseconds argument must be a number or a sequence of numbers, one per frame")
+
+		if (frame_milliseconds.shape != (frame_count, )):
+			raise Exception(f"if present, frame_milliseconds argument must hold one number per frame, {frame_milliseconds.shape[0] if (frame_milliseconds.ndim == 1) else 'its shape'} does not match {frame_count} frames")
+
+	if ((np.isnan(frame_milliseconds).any()) or (frame_milliseconds < 0).any() or (frame_milliseconds > np.iinfo(np.uint32).max).any()):
+		raise Exception("if present, frame_milliseconds argument must only hold numbers of milliseconds between 0 and 4294967295")
+
+	return np.rint(frame_milliseconds).astype(np.uint32)
+
+
+def write_frame_stream(rgb_frames:np.ndarray, filename:str, channel_order:str=default_channel_order, frames_per_second:float=default_frames_per_second, frame_milliseconds:any=None):
+	'''
+	This function writes a whole set of RGB-colorized frames to a frame stream file, all of the frames are packed at once and written in one call
+
+	Parameters
+	----------
+	rgb_frames : numpy.ndarray
+		The colorized frames in RGB order, with shape (number of frames, *LEDs, 3)
+	filename : str
+		The path/name of the file to which the frame stream will be written
+	channel_order : str
+		The order of the color channels in the frame stream, defaults to GRB (the order WS2812 LEDs expect)
+	frames_per_second : float
+		The speed at which the frames are meant to be played, recorded in the header
+	frame_milliseconds : any
+		Optional number of milliseconds each frame is displayed for, either one number for every frame or a sequence of one number per frame
+	'''
+
+	check_filename(filename)
+	check_rgb_frames(rgb_frames)
+	channel_order = check_channel_order(channel_order)
+	if (frame_milliseconds is not None):
+		frame_milliseconds = check_frame_milliseconds(frame_milliseconds, rgb_frames.shape[0])
+
+	records = pack_frames(rgb_frames, channel_order, frame_milliseconds)
+	led_count = records.dtype["colors"].shape[0] // 3
+
+	with open(filename, "wb") as file_out:
+		file_out.write(pack_frame_stream_header(frame_milliseconds is not None, channel_order, led_count, records.shape[0], frames_per_second))
+		file_out.write(records.data)
+
+
+def load_frame_stream(filename:str, memory_map:bool=True):
+	'''
+	This function loads a frame stream file
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the frame stream file
+	memory_map : bool
+		Whether the frames are memory-mapped instead of read into memory, defaults to True
+
+	Returns
+	-------
+	dict
+		The header's values, with the keys "channel_order", "led_count", "frame_count", "frames_per_second" and "timed"
+	numpy.ndarray
+		The frame records (see frame_stream_dtype), the colors of frame i are in ["colors"][i] and, for a timed stream, its display time in
+		["milliseconds"][i]
+	'''
+
+	check_filename(filename)
+
+	with open(filename, "rb") as file_in:
+		header_bytes = file_in.read(frame_stream_header_size)
+
+	if ((len(header_bytes) < frame_stream_header_size) or (header_bytes[ : len(frame_stream_magic)] != frame_stream_magic)):
+		raise Exception(f"{filename} is not a frame stream file")
+
+	(magic, version, flags, channel_order, padding, led_count, frame_count, frames_per_second, padding) = frame_stream_header.unpack(header_bytes)
+	if (version > frame_stream_version):
+		raise Exception(f"{filename} is a version {version} frame stream, only versions up to {frame_stream_version} can be read")
+
+	header = {
+		"channel_order": channel_order.decode("ascii"),
+		"led_count": led_count,
+		"frame_count": frame_count,
+		"frames_per_second": frames_per_second,
+		"timed": (flags & frame_stream_timed) != 0,
+	}
+
+	dtype = frame_stream_dtype(led_count, header["timed"])
+	if (frame_count == 0):
+		records = np.empty(0, dtype=dtype)
+	elif (memory_map):
+		records = np.memmap(filename, dtype=dtype, mode="r", offset=frame_stream_header_size, shape=(frame_count, ))
+	else:
+		records = np.fromfile(filename, dtype=dtype, count=frame_count, offset=frame_stream_header_size)
+
+	return (header, records)
+
+
+class FrameStreamWriter(__BaseSink__):
+	'''
+	This class defines a writer that appends colorized frames to a frame stream file as they are produced, so it can be handed to
+	led.src.actions.run_model (or a live run) as a sink
+	The frame count in the header is kept up to date every time frames are written, so the file is a complete frame stream at any time
+	The file is created as soon as the number of LEDs is known (when this object is initialized if led_count is given), and a writer closed before any
+	frames were written still leaves a valid frame stream holding no frames
+	'''
+
+	uses_color = True
+
+	filename = None
+	channel_order = default_channel_order
+	frames_per_second = default_frames_per_second
+	frame_milliseconds = None
+	led_count = None
+	count = 0
+	file_out = None
+	closed = False
+
+	def __init__(self, filename:str, channel_order:str=None, frames_per_second:float=None, frame_milliseconds:int=None, led_count:int=None):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the frame stream will be written
+		channel_order : str
+			The order of the color channels in the frame stream, defaults to GRB (the order WS2812 LEDs expect)
+		frames_per_second : float
+			The speed at which the frames are meant to be played, recorded in the header; defaults to a pre-determined value
+		frame_milliseconds : int
+			Optional number of milliseconds every frame is displayed for, the frames are not timed if not present
+		led_count : int
+			Optional number of LEDs in each frame, if not present it is taken from the first frames written
+		'''
+
+		check_filename(filename)
+
+		self.filename = filename
+		if (channel_order != None):
+			self.channel_order = check_channel_order(channel_order)
+		if (frames_per_second != None):
+			self.frames_per_second = float(frames_per_second)
+		if (frame_milliseconds != None):
+			if (type(frame_milliseconds) not in [int, float]):
+				raise Exception(f"if present, frame_milliseconds argument must be a number, not an object of type {type(frame_milliseconds).__name__}")
+
+			self.frame_milliseconds = check_frame_milliseconds(frame_milliseconds, None)
+		if (led_count != None):
+			if ((type(led_count) != int) or (led_count <= 0)):
+				raise Exception(f"if present, led_count argument must be a positive integer, {led_count} is invalid")
+
+			self.led_count = led_count
+
+		self.count = 0
+
+		if (self.led_count != None):
+			self.start()
+
+	def header(self):
+		'''
+		This method builds the frame stream header for the frames written so far
+
+		Returns
+		-------
+		bytes
+			The packed header
+		'''
+
+		return pack_frame_stream_header(self.frame_milliseconds is not None, self.channel_order, self.led_count, self.count, self.frames_per_second)
+
+	def start(self):
+		'''
+		This method creates the file and writes its header, once the number of LEDs is known
+		'''
+
+		self.file_out = open(self.filename, "wb")
+		self.file_out.write(self.header())
+		self.file_out.flush()
+
+	def append(self, rgb_frames:np.ndarray):
+		'''
+		This method appends a block of RGB-colorized frames to the end of the file
+
+		Parameters
+		----------
+		rgb_frames : numpy.ndarray
+			The block of frames to be written, with shape (number of frames, *LEDs, 3)
+		'''
+
+		check_rgb_frames(rgb_frames)
+		records = pack_frames(rgb_frames, self.channel_order, self.frame_milliseconds)
+		led_count = records.dtype["colors"].shape[0] // 3
+
+		if (self.file_out == None):
+			self.led_count = led_count
+			self.start()
+		elif (led_count != self.led_count):
+			raise Exception(f"frames written to {self.filename} must have {self.led_count} LEDs, not {led_count}")
+
+		self.file_out.write(records.data)
+		self.count = self.count + records.shape[0]
+
+		# Re-write the header with the new frame count and go back to the end of the file
+		self.file_out.seek(0)
+		self.file_out.write(self.header())
+		self.file_out.seek(0, 2)
+		self.file_out.flush()
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, appending the chunk's RGB frames to the file
+		'''
+
+		if ((rgb_frames is not None) and (rgb_frames.shape[0] > 0)):
+			self.append(rgb_frames)
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, closing the file
+		If no frames were ever written, the file is still created, holding no frames (of no LEDs if the number of LEDs was not known)
+		'''
+
+		if ((self.file_out == None) and (not self.closed)):
+			self.led_count = self.led_count if (self.led_count != None) else 0
+			self.start()
+
+		if (self.file_out != None):
+			self.file_out.close()
+			self.file_out = None
+
+		self.closed = True
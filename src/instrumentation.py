@@ -0,0 +1,237 @@
+import json
+
+from time import perf_counter
+
+
+class RunStatistics:
+	'''
+	This class accumulates timings and counters for one or more model runs (see led.src.actions.run_model), so that a slow run can be traced to the
+	stage that dominates it
+	The stages are
+	* "source" - pulling values out of the signal generator(s) or aggregator
+	* "input" - feeding values into the model
+	* "read" - reading the model's frame and newest value back out
+	* "record" - recording the frames that are returned at the end of the run
+	* "sinks" - passing frames on to the sinks
+	* "preview" - updating the live graph
+	The same object can be handed to several runs, its numbers then cover all of them
+	'''
+
+	stages = ["source", "input", "read", "record", "sinks", "preview"]
+
+	seconds = None
+	calls = None
+	samples = 0
+	runs = 0
+	total_seconds = 0.0
+	peak_frame_bytes = 0
+	callback = None
+
+	def __init__(self, callback:any=None):
+		'''
+		Parameters
+		----------
+		callback : any
+			Optional callable that is called with this object at the end of every run it was handed to
+		'''
+
+		if ((callback != None) and (not callable(callback))):
+			raise Exception(f"if present, callback argument must be callable, an object of type {type(callback).__name__} is not")
+
+		self.seconds = {stage: 0.0 for stage in self.stages}
+		self.calls = {stage: 0 for stage in self.stages}
+		self.samples = 0
+		self.runs = 0
+		self.total_seconds = 0.0
+		self.peak_frame_bytes = 0
+		self.callback = callback
+
+	@property
+	def samples_per_second(self):
+		'''
+		This computed property is the number of samples run per second of wall time over every run so far, or None before any time has passed
+		'''
+		return (self.samples / self.total_seconds) if (self.total_seconds > 0) else None
+
+	def add_time(self, stage:str, seconds:float):
+		'''
+		This method adds one timed call to a stage
+
+		Parameters
+		----------
+		stage : str
+			The stage, one of the elements of stages
+		seconds : float
+			The wall time the call took
+		'''
+
+		self.seconds[stage] = self.seconds[stage] + seconds
+		self.calls[stage] = self.calls[stage] + 1
+
+	def add_frame_bytes(self, frame_bytes:int):
+		'''
+		This method notes the current size of a frame buffer, keeping the largest size seen
+
+		Parameters
+		----------
+		frame_bytes : int
+			The number of bytes in the buffer
+		'''
+
+		if (frame_bytes > self.peak_frame_bytes):
+			self.peak_frame_bytes = frame_bytes
+
+	def finish_run(self, seconds:float):
+		'''
+		This method closes the books on a run and calls the callback, if there is one
+
+		Parameters
+		----------
+		seconds : float
+			The wall time the whole run took
+		'''
+
+		self.runs = self.runs + 1
+		self.total_seconds = self.total_seconds + seconds
+
+		if (self.callback != None):
+			self.callback(self)
+
+	def to_dict(self):
+		'''
+		This method returns every number held by this object in a JSON-serializable dict
+
+		Returns
+		-------
+		dict
+			The runs, samples, total_seconds, samples_per_second and peak_frame_bytes, along with a "stages" dict holding the seconds and calls of each stage
+		'''
+
+		return {
+			"runs": self.runs,
+			"samples": self.samples,
+			"total_seconds": self.total_seconds,
+			"samples_per_second": self.samples_per_second,
+			"peak_frame_bytes": self.peak_frame_bytes,
+			"stages": {stage: {"seconds": self.seconds[stage], "calls": self.calls[stage]} for stage in self.stages},
+		}
+
+	def __str__(self):
+		'''
+		This method returns a short human-readable table of this object's numbers
+		'''
+
+		samples_per_second = f"{self.samples_per_second:.1f}" if (self.samples_per_second != None) else "-"
+		lines = [f"{self.runs} run{'s' if (self.runs != 1) else ''}, {self.samples} samples in {self.total_seconds:.4f} s ({samples_per_second} samples/s), peak frame buffer {self.peak_frame_bytes} bytes"]
+		for stage in self.stages:
+			share = (100.0 * self.seconds[stage] / self.total_seconds) if (self.total_seconds > 0) else 0.0
+			lines.append(f"  {stage:<8} {self.seconds[stage]:>10.4f} s {share:>6.1f}% {self.calls[stage]:>10} calls")
+
+		return "\n".join(lines)
+
+	def save(self, filename:str):
+		'''
+		This method saves this object's numbers (see to_dict) as a JSON-formatted text file
+
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the numbers will be written
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		with open(filename, "w") as file_out:
+			json.dump(self.to_dict(), file_out, indent=4)
+
+
+class TimedProxy:
+	'''
+	This class stands in for an object taking part in a model run (a signal source, the model, the frame recorder, ...) and times the use of a chosen
+	set of its attributes, charging the time to a RunStatistics stage
+	Every other attribute is passed straight through to the object, so run_model uses the proxy exactly as it would the object itself
+	Proxies are only created for an instrumented run, so a run without a RunStatistics object pays nothing for any of this
+	'''
+
+	def __init__(self, target:any, statistics:RunStatistics, timed_methods:dict=None, timed_properties:dict=None, sample_methods:list=None):
+		'''
+		Parameters
+		----------
+		target : any
+			The object that this proxy stands in for
+		statistics : led.src.instrumentation.RunStatistics
+			The object to which the timings are charged
+		timed_methods : dict
+			The methods of target that are timed when they are called, mapped to the stage that they are charged to
+		timed_properties : dict
+			The attributes (typically computed properties) of target that are timed when they are read, mapped to the stage that they are charged to
+		sample_methods : list[str]
+			The timed methods whose calls feed samples into a model, the number of samples in each call (one, or the length of the returned frames) is
+			added to the statistics' sample count
+		'''
+
+		# Attributes are set through object.__setattr__ so that they are the proxy's own, everything else is looked up on the target by __getattr__
+		object.__setattr__(self, "target", target)
+		object.__setattr__(self, "statistics", statistics)
+		object.__setattr__(self, "timed_methods", timed_methods if (timed_methods != None) else {})
+		object.__setattr__(self, "timed_properties", timed_properties if (timed_properties != None) else {})
+		object.__setattr__(self, "sample_methods", sample_methods if (sample_methods != None) else [])
+
+	def __getattr__(self, name:str):
+		'''
+		This method is only called for attributes that the proxy itself does not have, i.e. those of the target
+		'''
+
+		if (name in self.timed_properties):
+			start = perf_counter()
+			value = getattr(self.target, name)
+			self.statistics.add_time(self.timed_properties[name], perf_counter() - start)
+
+			return value
+		elif (name in self.timed_methods):
+			return self.timed_method(name, getattr(self.target, name))
+		else:
+			return getattr(self.target, name)
+
+	def __setattr__(self, name:str, value:any):
+		setattr(self.target, name, value)
+
+	def __len__(self):
+		return len(self.target)
+
+	def timed_method(self, name:str, method:any):
+		'''
+		This method wraps one of the target's methods so that its calls are timed
+
+		Parameters
+		----------
+		name : str
+			The name of the method
+		method : any
+			The target's bound method
+
+		Returns
+		-------
+		any
+			A callable that calls method and charges its time to the method's stage
+		'''
+
+		stage = self.timed_methods[name]
+		counts_samples = name in self.sample_methods
+
+		def timed(*arguments, **kwargs):
+			start = perf_counter()
+			value = method(*arguments, **kwargs)
+			self.statistics.add_time(stage, perf_counter() - start)
+
+			if (counts_samples):
+				self.statistics.samples = self.statistics.samples + (len(value) if (hasattr(value, "__len__")) else 1)
+
+			return value
+
+		return timed
@@ -1,5 +1,7 @@
 import numpy as np
 
+from numpy.lib.stride_tricks import sliding_window_view
+
 from led.src.baseclasses import LEDModel as __BaseModel__
 
 
@@ -73,6 +75,50 @@ class QuarterWave(__BaseModel__):
 		new_backward[ : -1] = self.current_backward[1 : ]
 		self.current_backward = new_backward
 
+	def input_series(self, values:any):
+		'''
+		This method is the batch version of the input method, it takes in a whole series of current values and returns every frame (i.e. total current)
+		the antenna would have after each one, as if input had been called once per value
+		The current moving forward is a window over the input series and the current moving backward is the same series delayed by the length of the
+		antenna and reversed, so together they are one window of twice the antenna's length sliding over the input series (padded at the front with the
+		currents already on the antenna)
+
+		Parameters
+		----------
+		values : any
+			A one-dimensional list or numpy array of the incoming current values, None values are treated as zero (as they are by input)
+			NaN values are treated as zero too, since that is how a signal generator's next_block represents a None, whereas input keeps a NaN value as it is
+
+		Returns
+		-------
+		numpy.ndarray
+			An array of shape (len(values), self.length) holding the total current after each value
+		'''
+
+		values = np.asarray(values, dtype=float)
+		if (len(values.shape) != 1):
+			raise Exception(f"argument values must be a one-dimensional series of numbers, not an array of shape {values.shape}")
+
+		values = np.where(np.isnan(values), 0.0, values)
+
+		# The currents already on the antenna are the 2 * length most recent input values, oldest value first
+		# current_backward holds the oldest of them in order and current_forward holds the newest of them in reverse order
+		history = np.concatenate((self.current_backward, self.current_forward[ : : -1]))
+
+		# Each row of windows holds the 2 * length newest values after one more value has been input, oldest value first
+		windows = sliding_window_view(np.concatenate((history, values)), 2 * self.length)[1 : ]
+		forward = windows[ : , : self.length - 1 : -1]
+		backward = windows[ : , : self.length]
+
+		return_frames = forward - backward
+
+		if (return_frames.shape[0] > 0):
+			# Leave the antenna holding the currents after the last value so that input and input_series calls can follow this one
+			self.current_forward = np.array(forward[-1])
+			self.current_backward = np.array(backward[-1])
+
+		return return_frames
+
 
 class ScrollingWindow(__BaseModel__):
 	'''
@@ -192,6 +238,63 @@ class ScrollingWindow(__BaseModel__):
 		# The frame has been shifted, now save the new version to the object
 		self.frame = new_frame
 
+	def input_series(self, values:any):
+		'''
+		This method is the batch version of the input method, it takes in a whole series of values and returns every frame the window would show after
+		each one, as if input had been called once per value
+		Every frame of a scrolling window is just a window over the input series (padded at the front with whatever the window currently shows), so
+		all the frames are taken at once as sliding windows over that padded series
+		For "left" and "right" windows, the returned frames are a read-only view into the padded series, no frame is copied
+		For "both" windows, each frame is two mirrored windows around self.input_origin and they are gathered into a new array with a single index operation
+
+		Parameters
+		----------
+		values : any
+			A one-dimensional list or numpy array of the incoming values, None values are treated as zero (as they are by input)
+			NaN values are treated as zero too, since that is how a signal generator's next_block represents a None, whereas input keeps a NaN value as it is
+
+		Returns
+		-------
+		numpy.ndarray
+			An array of shape (len(values), self.length) holding the frame after each value
+		'''
+
+		values = np.asarray(values, dtype=float)
+		if (len(values.shape) != 1):
+			raise Exception(f"argument values must be a one-dimensional series of numbers, not an array of shape {values.shape}")
+
+		values = np.where(np.isnan(values), 0.0, values)
+
+		# Arrange whatever the window currently shows as the history that comes before values, oldest value first
+		# For a window that scrolls in both directions, both halves hold the same history, so the longer of them is used
+		if (self.direction == "left"):
+			history = self.frame
+		elif (self.direction == "right"):
+			history = self.frame[ : : -1]
+		else:
+			left_history = self.frame[ : self.input_origin + 1]
+			right_history = self.frame[self.input_origin : ][ : : -1]
+			history = left_history if (left_history.shape[0] >= right_history.shape[0]) else right_history
+
+		window_length = history.shape[0]
+
+		# Each row of windows holds the window_length newest values after one more value has been input, oldest value first
+		windows = sliding_window_view(np.concatenate((history, values)), window_length)[1 : ]
+
+		if (self.direction == "left"):
+			return_frames = windows
+		elif (self.direction == "right"):
+			return_frames = windows[ : , : : -1]
+		else:
+			# The newest value sits at input_origin and each step away from it in either direction is one value older
+			return_frames = windows[ : , window_length - 1 - np.abs(np.arange(self.length) - self.input_origin)]
+
+		if (return_frames.shape[0] > 0):
+			# Leave the window showing the last frame so that input and input_series calls can follow this one
+			self.frame = np.array(return_frames[-1])
+
+		return return_frames
+
 
 class Gauges(__BaseModel__):
 	'''
@@ -202,6 +305,13 @@ class Gauges(__BaseModel__):
 
 	values = None
 
+	# The layout of the gauges along the string never changes, so it is computed once when the model is initialized
+	# pixel_map holds the index of the gauge shown by each pixel, border and padding pixels point one past the last gauge (where a zero is placed)
+	# border_mask is True for every pixel that is a border or padding pixel instead of part of a gauge
+	pixel_map = None
+	border_mask = None
+	locations = None
+
 	def __init__(self, length:int, gauges:int):
 		'''
 		Parameters
@@ -231,6 +341,22 @@ class Gauges(__BaseModel__):
 		self.length = length
 		self.values = [0.0] * gauges
 
+		# Get the number of pixels per gauge, remembering to subtract a pixel from each end for a little bit of spacing between the gauges
+		pixels_per_gauge = (self.length // gauges) - 2
+
+		# Lay out each gauge as one border pixel, pixels_per_gauge pixels showing the gauge's value and one more border pixel
+		# Any pixels left over at the end of the string are padding and, like the borders, always show zero
+		self.pixel_map = np.full(self.length, gauges, dtype=np.intp)
+		self.locations = []
+
+		current_position = 0
+		for i in range(gauges):
+			self.pixel_map[current_position + 1 : current_position + 1 + pixels_per_gauge] = i
+			self.locations.append([current_position + 1, current_position + pixels_per_gauge])
+			current_position = current_position + 1 + pixels_per_gauge + 1
+
+		self.border_mask = self.pixel_map == gauges
+
 	def inputs(self, values:list=None):
 		'''
 		This method takes in the lastest set of values from its input and places them into their desired locations in self.gauges
@@ -245,61 +371,84 @@ class Gauges(__BaseModel__):
 		gauge_count = len(self.values)
 		if (values != None):
 			if (type(values) != list):
-				raise Exception(f"argument values must be a list of numbers, not an object of type {type(value)}")
+				raise Exception(f"argument values must be a list of numbers, not an object of type {type(values)}")
 			else:
-				# values is a list, copy all eligibie (i.e. not beyond the length of self.gauges) elements of values into self.gauges
-
+				# values is a list, copy all eligibie (i.e. not beyond the length of self.gauges) elements of values into a new set of gauge values
+				# If necessary (i.e. values is shorter than self.gauges), the remaining gauges are set to zero
+				# A new list is built every time so that each value returned by newest stays unchanged by later inputs
 				value_count = len(values)
-				for i in range(min(value_count, gauge_count)):
-					self.values[i] = float(values[i]) if (values[i] != None) else None
-
-				# If necessary (i.e. values is shorter than self.gauges), go through and set the remaining elements in self.gauges to zero
-				for i in range(value_count, gauge_count):
-					self.values[i] = 0.0
+				self.values = [(float(values[i]) if (values[i] != None) else None) if (i < value_count) else 0.0 for i in range(gauge_count)]
 
 		else:
 			self.values = [0.0] * gauge_count
 
-	def compute_frame(self):
+	def inputs_series(self, values:any):
 		'''
-		This method computes the frame current values for each LED in this window
+		This method is the batch version of the inputs method, it takes in a whole series of gauge value sets and returns every frame the gauges would
+		show after each one, as if inputs had been called once per set
+		All of the frames are gathered from the value sets with a single index operation through self.pixel_map
+
+		Parameters
+		----------
+		values : any
+			A two-dimensional array (or list of lists) of shape (number of samples, number of values), None and NaN mark a gauge with no data
+			Sets with fewer values than there are gauges leave the remaining gauges at zero, extra values are ignored
+
+		Returns
+		-------
+		numpy.ndarray
+			A float array of shape (number of samples, self.length) holding the frame after each set of values, gauges with no data are NaN
 		'''
 
-		# Initialize return_value to an empty list that will be built over the course of this method call
-		return_value = []
+		values = np.asarray(values, dtype=float)
+		if (len(values.shape) != 2):
+			raise Exception(f"argument values must be a two-dimensional array of numbers, not an array of shape {values.shape}")
 
-		# Get the number of pixels per gauge, remembering to subtract a pixel from each end for a little bit of spacing between the gauges
+		# Fit the value sets to the number of gauges and add one more column of zeros for the border and padding pixels to point to
 		gauge_count = len(self.values)
-		pixels_per_gauge = (self.length // gauge_count) - 2
+		padded_values = np.zeros((values.shape[0], gauge_count + 1), dtype=float)
+		padded_values[ : , : min(values.shape[1], gauge_count)] = values[ : , : gauge_count]
 
-		for i in range(gauge_count):
-			return_value.append(0.0)
-			return_value.extend([self.values[i]] * pixels_per_gauge)
-			return_value.append(0.0)
+		return_frames = padded_values[ : , self.pixel_map]
 
-		# If necessary, add zeros to the end of return_value to make sure it is as long as self.length
-		elements_to_add = self.length - len(return_value)
-		if (elements_to_add > 0):
-			return_value.extend([0.0] * elements_to_add)
+		if (return_frames.shape[0] > 0):
+			# Leave the gauges showing the last set of values so that inputs and inputs_series calls can follow this one
+			self.values = [None if (np.isnan(value)) else value for value in padded_values[-1, : gauge_count].tolist()]
 
-		return np.array(return_value)
+		return return_frames
 
-	@property
-	def gauge_locations(self):
+	def compute_frame(self):
 		'''
-		This computed property returns a list of the starting and ending pixels for each gauge in this model
+		This method computes the frame current values for each LED in this window
 		'''
 
-		return_value = []
+		# Add a zero after the gauge values for the border and padding pixels and pick each pixel's value through the precomputed pixel map
+		return np.array(self.values + [0.0])[self.pixel_map]
 
-		# Get the number of pixels per gauge, remembering to subtract a pixel from each end for a little bit of spacing between the gauges
-		gauge_count = len(self.values)
-		pixels_per_gauge = (self.length // gauge_count) - 2
+	def newest_from_frames(self, frames:np.ndarray):
+		'''
+		This method overrides the same method from the superclass
+		For gauges, newest is the set of gauge values, so the value shown by the first pixel of every gauge is read back out of each frame
 
-		# Iterate over the gauges to set each one's start and end pixes in return_value
-		current_position = 0
-		for i in range(gauge_count):
-			return_value.append([current_position + 1, current_position + pixels_per_gauge])
-			current_position = current_position + 1 + pixels_per_gauge + 1
+		Parameters
+		----------
+		frames : numpy.ndarray
+			A block of frames generated by this model, with shape (number of frames, self.length)
 
-		return return_value
+		Returns
+		-------
+		list[list[float]]
+			One list of gauge values per frame, gauges with no data are None
+		'''
+
+		gauge_values = frames[ : , [location[0] for location in self.locations]].astype(object)
+		gauge_values[np.isnan(gauge_values.astype(float))] = None
+
+		return gauge_values.tolist()
+
+	@property
+	def gauge_locations(self):
+		'''
+		This computed property returns a list of the starting and ending pixels for each gauge in this model
+		'''
+		return self.locations
@@ -0,0 +1,692 @@
+'''
+This module drives LED models from live inputs instead of recorded or generated signals
+Every live source (a tailed text file, a local TCP or UNIX socket, or a named pipe) is read concurrently by asyncio without blocking the others, and each one
+only keeps the latest value it has received; a model is then fed the latest set of values on a fixed tick, whether or not every source has sent a new one
+Every source sends lines of text, each line holding one value or a comma-separated set of values that the source picks one column out of
+'''
+
+import asyncio
+import json
+import os
+
+from pathlib import Path
+from time import perf_counter
+
+from led.src.baseclasses import LEDModel as __ParentModel__, SignalAggregator as __BaseAggregator__
+from led.src.preview import PreviewController
+from led.src.recorders import FrameRecorder
+from led.src.sinks import SinkPipeline
+
+# Define a set of defaults used by the next classes and functions
+default_tick_seconds = 0.05
+default_poll_seconds = 0.05
+default_reconnect_seconds = 1.0
+
+def parse_live_value(line:str, column:int=0):
+	'''
+	This function reads the value out of one line of text received from a live source
+
+	Parameters
+	----------
+	line : str
+		The line of text, either a single number or a comma-separated set of values
+	column : int
+		The zero-based position of the value in a comma-separated line
+
+	Returns
+	-------
+	float
+		The value, or None if the line does not hold a number in that column (e.g. a header row)
+	'''
+
+	fields = line.strip().split(",")
+	if (column >= len(fields)):
+		return None
+
+	try:
+		value = float(fields[column])
+	except ValueError:
+		return None
+
+	# NaN is not equal to itself, it is treated as a missing value
+	return value if (value == value) else None
+
+
+class LiveSource:
+	'''
+	THIS CLASS IS NOT INTENDED TO BE INSTANTIATED DIRECTLY
+	This class definition is intended to be used as a parent class for live sources, each of which feeds one gauge (or other signal) of a live aggregator
+	A live source only keeps the latest value it has received, a value that is replaced by a newer one before it was taken is counted as dropped
+	The intention is that the child class will handle connecting to its input and passing every line it reads to receive_line
+	'''
+
+	column = 0
+	reconnect_seconds = default_reconnect_seconds
+
+	latest_value = None
+	received_at = None
+	pending = False
+
+	received = 0
+	dropped = 0
+	rejected = 0
+	connections = 0
+
+	def __init__(self, column:int=None, reconnect_seconds:float=None):
+		'''
+		Parameters
+		----------
+		column : int
+			The zero-based position of this source's value in a comma-separated line, defaults to the first value
+		reconnect_seconds : float
+			How long this source waits before trying again when its input is not there or goes away, defaults to a pre-determined value
+		'''
+
+		if (column != None):
+			if ((type(column) != int) or (column < 0)):
+				raise Exception(f"if present, argument column must be zero or a positive integer, {column} is invalid")
+
+			self.column = column
+
+		if (reconnect_seconds != None):
+			if ((type(reconnect_seconds) not in [int, float]) or (reconnect_seconds <= 0)):
+				raise Exception(f"if present, argument reconnect_seconds must be a positive number, {reconnect_seconds} is invalid")
+
+			self.reconnect_seconds = float(reconnect_seconds)
+
+	def receive_line(self, line:str):
+		'''
+		This method takes in one line read from this source's input, keeping its value as the latest one
+
+		Parameters
+		----------
+		line : str
+			The line of text
+		'''
+
+		value = parse_live_value(line, self.column)
+		if (value == None):
+			if (line.strip() != ""):
+				self.rejected = self.rejected + 1
+
+			return
+
+		if (self.pending):
+			# The previous value was never taken, it is replaced without ever having been shown
+			self.dropped = self.dropped + 1
+
+		self.latest_value = value
+		self.received_at = perf_counter()
+		self.pending = True
+		self.received = self.received + 1
+
+	def take(self):
+		'''
+		This method takes this source's latest value
+
+		Returns
+		-------
+		float
+			The latest value, which is the same value as last time if nothing new has been received, or None if nothing has been received yet
+		float
+			The number of seconds the value waited to be taken, or None if it was already taken before
+		'''
+
+		waited = (perf_counter() - self.received_at) if (self.pending) else None
+		self.pending = False
+
+		return (self.latest_value, waited)
+
+	async def read_stream(self, reader:asyncio.StreamReader):
+		'''
+		This method reads lines from an asyncio stream until the stream ends
+
+		Parameters
+		----------
+		reader : asyncio.StreamReader
+			The stream
+		'''
+
+		while (True):
+			line = await reader.readline()
+			if (line == b""):
+				return
+
+			self.receive_line(line.decode("utf-8", errors="replace"))
+
+	async def run(self):
+		'''
+		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
+		The child class's version should read its input forever, reconnecting whenever the input goes away, until the task running it is cancelled
+		'''
+		pass
+
+	def to_dict(self):
+		'''
+		This method returns this source's counters in a JSON-serializable dict
+		'''
+
+		return {"source": str(self), "received": self.received, "dropped": self.dropped, "rejected": self.rejected, "connections": self.connections}
+
+
+class TailedFileSource(LiveSource):
+	'''
+	This class defines a live source that follows a growing text (e.g. CSV) file, reading each line as it is appended, like "tail -f"
+	A file that is truncated or replaced (e.g. by log rotation) is read again from its beginning
+	'''
+
+	filename = None
+	poll_seconds = default_poll_seconds
+	from_start = False
+
+	def __init__(self, filename:str, column:int=None, poll_seconds:float=None, from_start:bool=False):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file, it does not have to exist yet
+		column : int
+			The zero-based position of this source's value in a comma-separated line, defaults to the first value
+		poll_seconds : float
+			How often the file is checked for new lines, defaults to a pre-determined value
+		from_start : bool
+			Whether the lines already in the file are read, by default only lines appended after this source starts are
+		'''
+
+		super(TailedFileSource, self).__init__(column)
+
+		if ((filename == None) or (type(filename) != str) or (filename == "")):
+			raise Exception("argument filename must be a non-empty string")
+
+		if (poll_seconds != None):
+			if ((type(poll_seconds) not in [int, float]) or (poll_seconds <= 0)):
+				raise Exception(f"if present, argument poll_seconds must be a positive number, {poll_seconds} is invalid")
+
+			self.poll_seconds = float(poll_seconds)
+
+		self.filename = filename
+		self.from_start = bool(from_start)
+
+	def __str__(self):
+		return f"file {self.filename}"
+
+	async def run(self):
+		'''
+		This method overrides the same method from the superclass, checking the file for new lines every poll_seconds
+		'''
+
+		(position, identity, buffer) = (None, None, b"")
+		while (True):
+			try:
+				status = os.stat(self.filename)
+			except OSError:
+				# The file is not there (yet, or any more), every line in it is new once it is
+				(position, identity, buffer) = (0, None, b"")
+				await asyncio.sleep(self.poll_seconds)
+				continue
+
+			if ((position == None) or ((status.st_dev, status.st_ino) != identity) or (status.st_size < position)):
+				# This is a new file or it was truncated, it is read from its beginning unless this is the first look at a file that was already there
+				position = 0 if ((position != None) or (self.from_start)) else status.st_size
+				identity = (status.st_dev, status.st_ino)
+				buffer = b""
+				self.connections = self.connections + 1
+
+			if (status.st_size > position):
+				with open(self.filename, "rb") as file_in:
+					file_in.seek(position)
+					data = file_in.read(status.st_size - position)
+
+				position = position + len(data)
+
+				# Only complete lines are read, the part of a line that has not been finished yet is kept until the rest of it is appended
+				lines = (buffer + data).split(b"\n")
+				buffer = lines.pop()
+				for line in lines:
+					self.receive_line(line.decode("utf-8", errors="replace"))
+
+			await asyncio.sleep(self.poll_seconds)
+
+
+class SocketSource(LiveSource):
+	'''
+	THIS CLASS IS NOT INTENDED TO BE INSTANTIATED DIRECTLY
+	This class definition is intended to be used as a parent class for live sources that connect to a local server and read the lines it sends
+	The intention is that the child class will handle opening its particular kind of connection
+	'''
+
+	async def open_connection(self):
+		'''
+		THIS METHOD IS NOT INTENDED TO BE USED AS IS -- IT IS INTENDED TO BE OVERWRITTEN BY THE CHILD CLASS
+		The child class's version should return the (asyncio.StreamReader, asyncio.StreamWriter) pair of a new connection
+		'''
+		pass
+
+	async def run(self):
+		'''
+		This method overrides the same method from the superclass, connecting to the server and reading from it, connecting again whenever the
+		connection fails or is closed
+		'''
+
+		while (True):
+			try:
+				(reader, writer) = await self.open_connection()
+			except OSError:
+				await asyncio.sleep(self.reconnect_seconds)
+				continue
+
+			self.connections = self.connections + 1
+			try:
+				await self.read_stream(reader)
+			except OSError:
+				pass
+			finally:
+				writer.close()
+
+			await asyncio.sleep(self.reconnect_seconds)
+
+
+class TCPSource(SocketSource):
+	'''
+	This class defines a live source that reads lines from a TCP server, usually one on this computer
+	'''
+
+	host = None
+	port = None
+
+	def __init__(self, host:str, port:int, column:int=None, reconnect_seconds:float=None):
+		'''
+		Parameters
+		----------
+		host : str
+			The host name or address of the server, e.g. "127.0.0.1"
+		port : int
+			The server's port
+		column : int
+			The zero-based position of this source's value in a comma-separated line, defaults to the first value
+		reconnect_seconds : float
+			How long this source waits before connecting again, defaults to a pre-determined value
+		'''
+
+		super(TCPSource, self).__init__(column, reconnect_seconds)
+
+		if ((host == None) or (type(host) != str) or (host == "")):
+			raise Exception("argument host must be a non-empty string")
+		elif ((type(port) != int) or (port <= 0) or (port > 65535)):
+			raise Exception(f"argument port must be an integer from 1 to 65535, {port} is invalid")
+
+		self.host = host
+		self.port = port
+
+	def __str__(self):
+		return f"tcp {self.host}:{self.port}"
+
+	async def open_connection(self):
+		return await asyncio.open_connection(self.host, self.port)
+
+
+class UnixSocketSource(SocketSource):
+	'''
+	This class defines a live source that reads lines from a UNIX domain socket server, it is not available on Windows
+	'''
+
+	path = None
+
+	def __init__(self, path:str, column:int=None, reconnect_seconds:float=None):
+		'''
+		Parameters
+		----------
+		path : str
+			The path of the server's socket file
+		column : int
+			The zero-based position of this source's value in a comma-separated line, defaults to the first value
+		reconnect_seconds : float
+			How long this source waits before connecting again, defaults to a pre-determined value
+		'''
+
+		super(UnixSocketSource, self).__init__(column, reconnect_seconds)
+
+		if (not hasattr(asyncio, "open_unix_connection")):
+			raise Exception("UNIX domain sockets are not available on this operating system")
+		elif ((path == None) or (type(path) != str) or (path == "")):
+			raise Exception("argument path must be a non-empty string")
+
+		self.path = path
+
+	def __str__(self):
+		return f"unix {self.path}"
+
+	async def open_connection(self):
+		return await asyncio.open_unix_connection(self.path)
+
+
+class NamedPipeSource(LiveSource):
+	'''
+	This class defines a live source that reads lines from a named pipe (FIFO), it is not available on Windows
+	The pipe is opened again every time the program writing to it closes it
+	'''
+
+	path = None
+
+	def __init__(self, path:str, column:int=None, reconnect_seconds:float=None):
+		'''
+		Parameters
+		----------
+		path : str
+			The path of the named pipe, it does not have to exist yet
+		column : int
+			The zero-based position of this source's value in a comma-separated line, defaults to the first value
+		reconnect_seconds : float
+			How long this source waits before opening the pipe again, defaults to a pre-determined value
+		'''
+
+		super(NamedPipeSource, self).__init__(column, reconnect_seconds)
+
+		if (not hasattr(os, "mkfifo")):
+			raise Exception("named pipes are not available on this operating system")
+		elif ((path == None) or (type(path) != str) or (path == "")):
+			raise Exception("argument path must be a non-empty string")
+
+		self.path = path
+
+	def __str__(self):
+		return f"pipe {self.path}"
+
+	async def run(self):
+		'''
+		This method overrides the same method from the superclass, opening the pipe without blocking and reading from it until the writer closes it
+		'''
+
+		loop = asyncio.get_running_loop()
+		while (True):
+			try:
+				# Opening a pipe for reading would normally block until something opens it for writing, a non-blocking open returns at once
+				pipe = os.fdopen(os.open(self.path, os.O_RDONLY | os.O_NONBLOCK), "rb", buffering=0)
+			except OSError:
+				await asyncio.sleep(self.reconnect_seconds)
+				continue
+
+			reader = asyncio.StreamReader()
+			(transport, protocol) = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+			try:
+				# With no writer attached the pipe reads as ended at once, so only a pipe that delivers a line before it ends counts as a connection
+				line = await reader.readline()
+				if (line != b""):
+					self.connections = self.connections + 1
+					self.receive_line(line.decode("utf-8", errors="replace"))
+					await self.read_stream(reader)
+			finally:
+				transport.close()
+
+			await asyncio.sleep(self.reconnect_seconds)
+
+
+# Every kind of live source that can be named in a live signal set file, with the class that handles it
+live_source_classes = {
+	"file": TailedFileSource,
+	"tcp": TCPSource,
+	"unix": UnixSocketSource,
+	"pipe": NamedPipeSource,
+}
+
+class LiveAggregator(__BaseAggregator__):
+	'''
+	This class represents an aggregator of live sources, one per gauge (or other signal), whose next set of values is the latest value of every source
+	Live signals never end, so a model fed by this aggregator runs for a set number of ticks, a set time or until it is stopped (see run_live_model)
+	It keeps count of the values its sources dropped and of how long values waited to be shown
+	'''
+
+	tick_seconds = default_tick_seconds
+	sources = None
+
+	missed_ticks = 0
+	latency_total = 0.0
+	latency_count = 0
+	latency_maximum = 0.0
+
+	def __init__(self, signal_file:Path, project_folder:str="", tick_seconds:float=None):
+		'''
+		Parameters
+		----------
+		signal_file : subclass of pathlib.Path
+			The JSON-formatted file listing the live sources, each one an object with a "source" attribute naming its kind ("file", "tcp", "unix" or
+			"pipe") and an "arguments" list for the class that handles it, e.g. {"source": "tcp", "arguments": ["127.0.0.1", 9000, 2]}
+		project_folder : str
+			The folder in which the project using this aggregator is located, used as the presumed location for file, socket and pipe paths that do not
+			include any path information
+		tick_seconds : float
+			The time between sets of values, defaults to a pre-determined value
+		'''
+
+		self.errors = []
+
+		if (signal_file == None):
+			raise Exception("argument signal_file cannot be None")
+		elif (not issubclass(signal_file.__class__, Path)):
+			raise Exception(f"argument signal_file must be a parsed pathlib.Path child object, not an object of type {type(signal_file).__name__}")
+		elif (not signal_file.is_file()):
+			raise Exception(f"argument signal_file {signal_file} is not a path to a file")
+
+		if (tick_seconds != None):
+			if ((type(tick_seconds) not in [int, float]) or (tick_seconds <= 0)):
+				raise Exception(f"if present, argument tick_seconds must be a positive number, {tick_seconds} is invalid")
+
+			self.tick_seconds = float(tick_seconds)
+
+		# Copy the signal file name to the object parameters and attempt to read its contents into self.signal_set
+		self.signal_file = signal_file
+		with open(self.signal_file) as file_in:
+			self.signal_set = json.load(file_in)
+
+		if (type(self.signal_set) != list):
+			raise Exception(f"signal_file argument {self.signal_file} must contain a JSON-formatted list, not a JSON formatted {type(self.signal_set).__name__}")
+		elif (len(self.signal_set) == 0):
+			raise Exception(f"signal_file argument {self.signal_file} must contain at least one source")
+
+		self.project_folder = str(project_folder) if (project_folder != None) else ""
+
+		exceptions = []
+		self.sources = []
+		for (i, signal) in enumerate(self.signal_set):
+			if (type(signal) != dict):
+				exceptions.append(f"source #{i + 1} in {self.signal_file} must be a dictionary, not an object of type {type(signal).__name__}")
+			elif (signal.get("source") not in live_source_classes):
+				exceptions.append(f'source #{i + 1} in {self.signal_file} must have a "source" attribute that is one of {", ".join(live_source_classes.keys())}')
+			elif ((type(signal.get("arguments")) != list) or (len(signal["arguments"]) == 0)):
+				exceptions.append(f'source #{i + 1} in {self.signal_file} must have a non-empty "arguments" list attribute for its {signal["source"]} source')
+			else:
+				arguments = list(signal["arguments"])
+				if ((signal["source"] != "tcp") and (type(arguments[0]) == str) and (not (("/" in arguments[0]) or ("\\" in arguments[0])))):
+					# File, socket and pipe paths without any path information are presumed to be in the project folder
+					arguments[0] = f"{self.project_folder}/{arguments[0]}" if (self.project_folder != "") else arguments[0]
+
+				try:
+					self.sources.append(live_source_classes[signal["source"]](*arguments))
+				except Exception as e:
+					exceptions.append(f"source #{i + 1} in {self.signal_file} could not be set up: {e}")
+
+		if (exceptions != []):
+			raise Exception("\n{}".format("\n".join(exceptions)))
+
+		# The rest of the application counts an aggregator's signals by its generators, a live aggregator's sources stand in for them
+		self.generators = self.sources
+
+		# Live signals never end
+		self.finite_signals = []
+		self.current_values = [None] * len(self.sources)
+
+	def compute_next_values(self):
+		'''
+		This method overrides the same method from the superclass, taking the latest value of every source
+		'''
+
+		self.current_values = []
+		for source in self.sources:
+			(value, waited) = source.take()
+			self.current_values.append(value)
+
+			if (waited != None):
+				self.latency_total = self.latency_total + waited
+				self.latency_count = self.latency_count + 1
+				self.latency_maximum = max(self.latency_maximum, waited)
+
+	@property
+	def dropped(self):
+		'''
+		This computed property is the number of values that every source dropped because a newer value arrived before they were shown
+		'''
+		return sum([source.dropped for source in self.sources])
+
+	@property
+	def mean_latency(self):
+		'''
+		This computed property is the average number of seconds between a value arriving and it being shown, or None before any value has been shown
+		'''
+		return (self.latency_total / self.latency_count) if (self.latency_count > 0) else None
+
+	def to_dict(self):
+		'''
+		This method returns this aggregator's counters in a JSON-serializable dict
+
+		Returns
+		-------
+		dict
+			The ticks run, ticks missed, values shown, values dropped, the mean and maximum latency in seconds and a "sources" list with each source's
+			own counters
+		'''
+
+		return {
+			"ticks": self.counter,
+			"missed_ticks": self.missed_ticks,
+			"shown": self.latency_count,
+			"dropped": self.dropped,
+			"mean_latency_seconds": self.mean_latency,
+			"maximum_latency_seconds": self.latency_maximum,
+			"sources": [source.to_dict() for source in self.sources],
+		}
+
+	def __str__(self):
+		'''
+		This method returns a short human-readable summary of this aggregator's counters
+		'''
+
+		mean_latency = f"{1000.0 * self.mean_latency:.1f}" if (self.mean_latency != None) else "-"
+		lines = [f"{self.counter} ticks ({self.missed_ticks} missed), {self.latency_count} values shown, {self.dropped} dropped, latency {mean_latency} ms mean / {1000.0 * self.latency_maximum:.1f} ms maximum"]
+		for source in self.sources:
+			lines.append(f"  {str(source):<40} {source.received:>8} received {source.dropped:>8} dropped {source.rejected:>6} rejected {source.connections:>4} connections")
+
+		return "\n".join(lines)
+
+
+async def run_live_model(model:__ParentModel__, aggregator:LiveAggregator, ticks:int=None, duration:float=None, figure:any=None, line_frame:any=None, sinks:list=None, colorizer:any=None, record:bool=True, preview_rate:float=None):
+	'''
+	This coroutine runs a model that takes sets of values (e.g. led.src.ledmodels.Gauges) from a live aggregator, feeding it the latest set of values once
+	every tick while the aggregator's sources are read in the background
+	A tick that cannot be run on time because the one before it took too long is skipped (and counted in the aggregator's missed_ticks) instead of being
+	run late, so the model never falls behind its inputs
+	The run ends after ticks ticks or duration seconds, whichever comes first, or when the task running it is cancelled; with neither, it only ends when
+	it is cancelled (e.g. by Ctrl+C under asyncio.run), and the sinks are still handed every frame that was run
+
+	Parameters
+	----------
+	model : subclass of led.src.baseclasses.LEDModel
+		The model object which is being run, it must have an inputs method
+	aggregator : led.src.liveaggregators.LiveAggregator
+		The live aggregator feeding the model
+	ticks : int
+		The number of ticks to run, not counting skipped ones, optional
+	duration : float
+		The number of seconds to run, optional
+	figure : matplotlib.figure.Figure
+		A Figure object used for a live graph of the model, see led.src.actions.run_model
+	line_frame : matplotlib.lines.Line2D
+		A Line2D object used for a live graph of the model, see led.src.actions.run_model
+	sinks : list[led.src.baseclasses.FrameSink]
+		Optional set of sinks that are handed the model's results about once a second while it runs, the caller closes them
+	colorizer : any
+		A callable that colorizes a chunk of frames for the sinks that use colors, see led.src.sinks.SinkPipeline
+	record : bool
+		Whether the frames and time series are kept and returned, a run that goes on indefinitely should hand them to sinks instead
+	preview_rate : float
+		The largest number of times per second that the live graph is redrawn
+
+	Returns
+	-------
+	list[any]
+		The time series of the run, empty if record is False
+	numpy.ndarray
+		The frames of the run, None if record is False
+	'''
+
+	if ((model == None) or (not issubclass(type(model), __ParentModel__)) or (not hasattr(model, "inputs"))):
+		raise Exception("model argument must be a subclass of led.src.baseclasses.LEDModel that has an inputs method")
+	elif (type(aggregator) != LiveAggregator):
+		raise Exception(f"aggregator argument must be of type led.src.liveaggregators.LiveAggregator, not {type(aggregator).__name__}")
+
+	if ((ticks != None) and ((type(ticks) != int) or (ticks < 0))):
+		raise Exception(f"if present, ticks argument must be zero or a positive integer, {ticks} is invalid")
+	elif ((duration != None) and ((type(duration) not in [int, float]) or (duration < 0))):
+		raise Exception(f"if present, duration argument must be zero or a positive number, {duration} is invalid")
+
+	# A live run is slow compared to the sinks, so they are handed a chunk of about a second's worth of frames at a time
+	pipeline = SinkPipeline(sinks, colorizer, max(int(1.0 / aggregator.tick_seconds), 1)) if (sinks != None) else None
+	preview = PreviewController(figure, line_frame, preview_rate) if ((figure != None) and (line_frame != None)) else None
+
+	time_series = []
+	recorder = FrameRecorder(model.frame.shape) if (record) else None
+
+	loop = asyncio.get_running_loop()
+	tasks = [asyncio.create_task(source.run()) for source in aggregator.sources]
+	try:
+		start = loop.time()
+		(tick, ticks_run) = (0, 0)
+		# The last tick that fits in the duration, the floor division can come out one short (e.g. 0.5 // 0.1 is 4.0), so the one after it is checked
+		end_tick = None
+		if (duration != None):
+			end_tick = int(duration // aggregator.tick_seconds)
+			if ((end_tick + 1) * aggregator.tick_seconds <= duration):
+				end_tick = end_tick + 1
+
+		while (((ticks == None) or (ticks_run < ticks)) and ((end_tick == None) or (tick < end_tick))):
+			# Wait for the next tick, skipping any ticks that are already over
+			tick = tick + 1
+			ticks_run = ticks_run + 1
+			delay = start + (tick * aggregator.tick_seconds) - loop.time()
+			if (delay <= -aggregator.tick_seconds):
+				missed = int(-delay // aggregator.tick_seconds)
+				if (end_tick != None):
+					# Skipping ticks never takes the run past its duration, the last tick is run (late) instead
+					missed = min(missed, end_tick - tick)
+
+				aggregator.missed_ticks = aggregator.missed_ticks + missed
+				tick = tick + missed
+				delay = delay + (missed * aggregator.tick_seconds)
+
+			# Even a tick that is running late gives the sources a chance to read
+			await asyncio.sleep(max(delay, 0.0))
+
+			model.inputs(aggregator.next)
+
+			if (record):
+				time_series.append(model.newest)
+				recorder.append(model.frame)
+
+			if (pipeline != None):
+				pipeline.push_frame(model.frame, model.newest)
+
+			if (preview != None):
+				preview.update(model.frame)
+	finally:
+		for task in tasks:
+			task.cancel()
+
+		await asyncio.gather(*tasks, return_exceptions=True)
+
+		if (preview != None):
+			preview.finish()
+
+		if (pipeline != None):
+			# Pass any frames still gathered in the pipeline on to the sinks, but leave the sinks open for the caller to close
+			pipeline.flush()
+
+	return (time_series, recorder.frames) if (record) else (time_series, None)
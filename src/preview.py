@@ -0,0 +1,93 @@
+from time import perf_counter
+
+
+class PreviewController:
+	'''
+	This class controls the live graph of a model's frames while the model is running
+	Instead of redrawing the whole figure after every sample, it redraws at most refresh_rate times per second and skips the samples in between
+	When the figure's canvas supports it, only the frame's line is redrawn over a saved copy of the rest of the figure (matplotlib "blitting"), so the cost
+	of the graph no longer sets the speed of a model run
+	'''
+
+	default_refresh_rate = 20.0
+
+	figure = None
+	line_frame = None
+	refresh_interval = None
+
+	background = None
+	last_draw = None
+	pending_frame = None
+
+	def __init__(self, figure:any, line_frame:any, refresh_rate:float=None):
+		'''
+		Parameters
+		----------
+		figure : matplotlib.figure.Figure
+			The Figure object that holds the graph
+		line_frame : matplotlib.lines.Line2D
+			The Line2D object whose y-values are set to each frame that is drawn
+		refresh_rate : float
+			The largest number of times per second that the graph is redrawn, defaults to a pre-determined value
+		'''
+
+		if (refresh_rate == None):
+			refresh_rate = self.default_refresh_rate
+		elif ((type(refresh_rate) not in [int, float]) or (refresh_rate <= 0)):
+			raise Exception(f"if present, refresh_rate argument must be a positive number, {refresh_rate} is invalid")
+
+		self.figure = figure
+		self.line_frame = line_frame
+		self.refresh_interval = 1.0 / float(refresh_rate)
+		self.last_draw = None
+		self.pending_frame = None
+
+		if (getattr(self.figure.canvas, "supports_blit", False)):
+			# Draw everything but the line once and save it as the background that each redraw of the line is blitted over
+			self.line_frame.set_animated(True)
+			self.figure.canvas.draw()
+			self.background = self.figure.canvas.copy_from_bbox(self.line_frame.axes.bbox)
+
+	def update(self, frame:any):
+		'''
+		This method hands the controller the model's newest frame, it is only drawn if enough time has passed since the last time the graph was drawn
+
+		Parameters
+		----------
+		frame : any
+			The model's newest frame
+		'''
+
+		self.pending_frame = frame
+
+		now = perf_counter()
+		if ((self.last_draw == None) or ((now - self.last_draw) >= self.refresh_interval)):
+			self.draw()
+			self.last_draw = now
+
+	def draw(self):
+		'''
+		This method draws the most recent frame handed to this controller, if it has not been drawn yet
+		'''
+
+		if (self.pending_frame is None):
+			return
+
+		self.line_frame.set_ydata(self.pending_frame)
+		self.pending_frame = None
+
+		if (self.background != None):
+			# Put back the saved background and draw only the line on top of it
+			self.figure.canvas.restore_region(self.background)
+			self.line_frame.axes.draw_artist(self.line_frame)
+			self.figure.canvas.blit(self.line_frame.axes.bbox)
+		else:
+			self.figure.canvas.draw_idle()
+
+		self.figure.canvas.flush_events()
+
+	def finish(self):
+		'''
+		This method draws the last frame handed to this controller, so the graph always ends up showing the model's final state
+		'''
+		self.draw()
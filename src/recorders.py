@@ -0,0 +1,137 @@
+import numpy as np
+
+
+class FrameRecorder:
+	'''
+	This class defines a growable buffer that records the frames generated by an LED model over the course of a model run
+	Instead of copying the whole history every time a frame is added (which is what numpy.append does), the buffer is preallocated and its capacity is
+	doubled whenever it fills up, so recording a run of n frames only costs O(n) copying in total
+	'''
+
+	default_capacity = 1024
+
+	buffer = None
+	count = 0
+
+	def __init__(self, frame_shape:tuple, capacity:int=None, frames:np.ndarray=None, dtype:any=float):
+		'''
+		Parameters
+		----------
+		frame_shape : tuple
+			The shape of a single frame that will be recorded by this object
+		capacity : int
+			The number of frames to preallocate space for, defaults to a pre-determined value if not present
+		frames : numpy.ndarray
+			Optional set of previously-recorded frames (e.g. from an earlier model run) that this recorder continues from
+		dtype : any
+			The initial numpy data type of the recorded frames, it is promoted automatically if a frame of a wider type (e.g. object) is recorded
+		'''
+
+		if (frame_shape == None):
+			raise Exception("argument frame_shape must be a tuple of non-negative integers")
+		elif (type(frame_shape) != tuple):
+			raise Exception(f"argument frame_shape must be a tuple of non-negative integers, not an object of type {type(frame_shape).__name__}")
+
+		if (capacity == None):
+			capacity = self.default_capacity
+		elif (type(capacity) not in [int, float]):
+			raise Exception(f"if present, argument capacity must be a positive integer, not an object of type {type(capacity).__name__}")
+		else:
+			capacity = max(int(capacity), 1)
+
+		if ((frames is not None) and (not isinstance(frames, np.ndarray))):
+			raise Exception(f"if present, argument frames must be a numpy array, not an object of type {type(frames).__name__}")
+
+		self.frame_shape = frame_shape
+		self.count = 0
+
+		if (frames is not None):
+			# Continue from the incoming frames, leaving room for at least as many more frames as the requested capacity
+			self.buffer = np.empty((frames.shape[0] + capacity, *frame_shape), dtype=np.result_type(frames.dtype, dtype))
+			self.buffer[ : frames.shape[0]] = frames
+			self.count = frames.shape[0]
+		else:
+			self.buffer = np.empty((capacity, *frame_shape), dtype=dtype)
+
+	def __len__(self):
+		'''
+		The number of frames recorded so far
+		'''
+		return self.count
+
+	@property
+	def capacity(self):
+		'''
+		This computed property is the number of frames that can be recorded before the buffer has to grow again
+		'''
+		return self.buffer.shape[0]
+
+	@property
+	def nbytes(self):
+		'''
+		This computed property is the number of bytes currently allocated to this recorder's buffer
+		'''
+		return self.buffer.nbytes
+
+	def reserve(self, frames_to_add:int, dtype:any=None):
+		'''
+		This method makes sure that there is room in the buffer for frames_to_add more frames, growing the buffer by at least doubling its capacity if there is not
+		If dtype is wider than the buffer's current type, the buffer is promoted to it
+
+		Parameters
+		----------
+		frames_to_add : int
+			The number of frames that are about to be recorded
+		dtype : any
+			The numpy data type of the frames that are about to be recorded
+		'''
+
+		new_dtype = self.buffer.dtype if (dtype == None) else np.result_type(self.buffer.dtype, dtype)
+		required = self.count + frames_to_add
+
+		if ((required > self.capacity) or (new_dtype != self.buffer.dtype)):
+			new_capacity = self.capacity
+			while (new_capacity < required):
+				new_capacity = 2 * new_capacity
+
+			new_buffer = np.empty((new_capacity, *self.frame_shape), dtype=new_dtype)
+			new_buffer[ : self.count] = self.buffer[ : self.count]
+			self.buffer = new_buffer
+
+	def append(self, frame:np.ndarray):
+		'''
+		This method records a single frame
+
+		Parameters
+		----------
+		frame : numpy.ndarray
+			The frame to be recorded, it must have the same shape as this recorder's frame_shape
+		'''
+
+		frame = np.asarray(frame)
+		self.reserve(1, frame.dtype)
+		self.buffer[self.count] = frame
+		self.count = self.count + 1
+
+	def extend(self, frames:np.ndarray):
+		'''
+		This method records a whole block of frames at once
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			The set of frames to be recorded, its shape must be (number of frames, *frame_shape)
+		'''
+
+		frames = np.asarray(frames)
+		self.reserve(frames.shape[0], frames.dtype)
+		self.buffer[self.count : self.count + frames.shape[0]] = frames
+		self.count = self.count + frames.shape[0]
+
+	@property
+	def frames(self):
+		'''
+		This computed property returns the frames recorded so far as one contiguous numpy array
+		The array is a view into this recorder's buffer, no copy of the frames is made
+		'''
+		return self.buffer[ : self.count]
@@ -1,5 +1,6 @@
 import inspect
 import json
+import numpy as np
 
 from os.path import exists
 from pathlib import Path
@@ -12,8 +13,13 @@ from led.src.baseclasses import SignalAggregator as __BaseAggregator__, SignalGe
 class SimpleAggregator(__BaseAggregator__):
 	'''
 	This class represents a simple agregator that takes multiple signals, handling their incrementing and outputting their values as an organized list
+	It can also output a whole block of sets of values at once (see next_block), asking each signal for its block and stacking them side by side
 	'''
 
+	# The value of counter at which every finite signal has reached the end of its signal, worked out once from the signals' known lengths so the signals
+	# do not have to be polled on every sample, None if at least one finite signal cannot tell how many values it has left
+	end_counter = None
+
 	def __init__(self, signal_file:Path, project_folder:str=""):
 		'''
 		Parameters
@@ -70,7 +76,7 @@ class SimpleAggregator(__BaseAggregator__):
 					signal_exceptions.append(f'signal #{i + 1} in {self.signal_file} must must have an "arguments" list attribute that specifies the initialization arguments for its associated signal generator')
 				elif (type(signal["arguments"]) != list):
 					signal_exceptions.append(f'arguments attribute in signal #{i + 1} in {self.signal_file} must be a list that specifies the initialization arguments for its associated signal generator')
-				elif (signal["generator"] in ["MorseCodeGenerator", "SignalRepeater"]):
+				elif (signal["generator"] in ["CSVSignalGenerator", "MorseCodeGenerator", "SignalRepeater"]):
 					# Signal generators of these classes require that their first argument be an object of subclass pathlib.Path, check to make sure
 
 					if (signal["arguments"] == []):
@@ -110,3 +116,54 @@ class SimpleAggregator(__BaseAggregator__):
 					self.finite_signals.append(generator)
 
 				self.current_values.append(generator.current)
+
+			# Every finite signal reports end_of_signal on the sample after its last value, so all of them have ended once the longest one has
+			if (all([hasattr(generator, "samples_remaining") for generator in self.finite_signals])):
+				self.end_counter = self.counter + max([0] + [generator.samples_remaining + 1 for generator in self.finite_signals if (not generator.end_of_signal)])
+
+	@property
+	def end_of_all_finite_signals(self):
+		'''
+		This computed property overrides the same property from the superclass, returning True only once every signal generator that has a finite signal
+		is at the end of its signal
+		It is worked out from the signals' known lengths when they have them, and by asking each signal otherwise
+		'''
+
+		if (self.finite_signals == []):
+			return False
+		elif (self.end_counter != None):
+			return self.counter >= self.end_counter
+		else:
+			return all([generator.end_of_signal for generator in self.finite_signals])
+
+	@property
+	def samples_remaining(self):
+		'''
+		This computed property is the number of sets of values left before the longest finite signal reaches the end of its signal, or None if that is
+		not known
+		'''
+		return max(self.end_counter - self.counter - 1, 0) if (self.end_counter != None) else None
+
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, asking each signal generator for a whole block of values at once and stacking the blocks
+		side by side, one column per signal
+
+		Parameters
+		----------
+		samples : int
+			The number of sets of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			A float array of shape (samples, number of signals), missing values (e.g. after the end of a finite signal) are NaN
+		'''
+
+		return_values = np.empty((samples, len(self.generators)), dtype=float)
+		for (i, generator) in enumerate(self.generators):
+			return_values[ : , i] = generator.next_block(samples)
+
+		self.current_values = [generator.current for generator in self.generators]
+
+		return return_values
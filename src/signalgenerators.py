@@ -1,10 +1,13 @@
-import json
+import numpy as np
+
+from hashlib import sha256
 from math import log, pi, sin
+from os import getpid, replace, stat
 from pathlib import Path
-
-import json
+from time import monotonic, sleep
 
 from led.src.baseclasses import SignalGenerator as __BaseGenerator__
+from led.src.storage import BinaryFramesWriter, csv_chunk_bytes, iterate_signal_blocks, parse_csv_column, split_csv_header
 
 
 # Define a dit/dot as a single one with a trailing zero for spacing
@@ -62,19 +65,135 @@ morse_map = {
 
 
 
-def convert_to_morse(signal:str):
+def compile_morse_table():
 	'''
+	This function compiles morse_map into a flat table holding every character's complete run of bits in a bitstream, its dits and dahs followed by
+	three zeros of spacing
+
+	Returns
+	-------
+	numpy.ndarray
+		The numpy.uint8 table of bits, every character's run of bits one after the other
+	numpy.ndarray
+		The position in the table where each character's run of bits starts, indexed by character code (0 to 127)
+	numpy.ndarray
+		The number of bits in each character's run of bits, indexed by character code, zero for characters that cannot be mapped to Morse code
+	'''
+
+	table = []
+	starts = np.zeros(128, dtype=np.int64)
+	lengths = np.zeros(128, dtype=np.int64)
+
+	for (character, didahs) in morse_map.items():
+		character_bits = [bit for didah in didahs for bit in didah] + [0, 0, 0]
+		starts[ord(character)] = len(table)
+		lengths[ord(character)] = len(character_bits)
+		table.extend(character_bits)
+
+	return (np.array(table, dtype=np.uint8), starts, lengths)
+
+
+(morse_table, morse_table_starts, morse_table_lengths) = compile_morse_table()
+
+# Compiled bitstreams are cached on disk, keyed by a hash of the message and of the table they were compiled with
+morse_cache_folder = Path.home() / ".cache" / "led" / "morse"
+morse_table_signature = sha256(morse_table.tobytes() + morse_table_starts.tobytes() + morse_table_lengths.tobytes()).digest()
+
+# Recorded signals held in text files are converted into binary .npy files that are cached on disk, keyed by a hash of the signal file's path, size and
+# modification time, and read a block of signal_block_values values at a time
+signal_cache_folder = Path.home() / ".cache" / "led" / "signals"
+signal_block_values = 1048576
+
+# Recorded signals held in files with these extensions are raw binary values that are memory-mapped as they are
+binary_signal_extensions = [".bin", ".raw", ".dat"]
+
+def morse_character_codes(signal:str):
+	'''
+	This function converts a string to an array of character codes, with every character that cannot be mapped to Morse code given a code of -1
+
+	Parameters
+	----------
+	signal : str
+		The string of text to be converted
+
+	Returns
+	-------
+	numpy.ndarray
+		The character codes, one per character in signal
+	'''
+
+	codes = np.frombuffer(signal.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+	codes[codes >= morse_table_lengths.shape[0]] = -1
+	codes[morse_table_lengths[codes] == 0] = -1
+
+	return codes
+
+
+def compile_morse(signal:str, chunk_characters:int=65536):
+	'''
+	This function compiles a string of text straight into the bitstream a Morse code generator emits, without building any Python lists
+	Characters that cannot be mapped to Morse code (those that are not in morse_map) are skipped
+
 	Parameters
 	----------
 	signal : str
 		The string of text to be converted to Morse code
+	chunk_characters : int
+		The number of characters compiled at a time, which bounds the size of the temporary arrays used along the way
 
 	Returns
 	-------
-	List[List[int]]
-		A list of Morse code characters encoded as lists of zeros and ones
+	numpy.ndarray
+		The numpy.uint8 bitstream, each character's dits and dahs followed by three zeros of spacing
 	'''
-	return [morse_map[i] for i in signal if (i in morse_map)] if (type(signal) == str) else []
+
+	codes = morse_character_codes(signal)
+	codes = codes[codes >= 0]
+
+	lengths = morse_table_lengths[codes]
+	output_starts = np.cumsum(lengths) - lengths
+
+	return_bits = np.empty(int(lengths.sum()), dtype=np.uint8)
+	for chunk_start in range(0, codes.shape[0], chunk_characters):
+		chunk = slice(chunk_start, chunk_start + chunk_characters)
+		chunk_lengths = lengths[chunk]
+		chunk_output_start = output_starts[chunk_start]
+		chunk_bits = int(chunk_lengths.sum())
+
+		# Each output bit is taken from the table at the start of its character's run of bits, plus how far the bit is into that run
+		table_positions = np.arange(chunk_bits) + np.repeat(morse_table_starts[codes[chunk]] - (output_starts[chunk] - chunk_output_start), chunk_lengths)
+		return_bits[chunk_output_start : chunk_output_start + chunk_bits] = morse_table[table_positions]
+
+	return return_bits
+
+
+def sequence_block(sequence:any, start:int, samples:int):
+	'''
+	This function takes a block of values out of a finite sequence the way a finite generator would emit them one at a time
+	Positions at or beyond the end of the sequence are returned as NaN, the block equivalent of the None a finite generator emits after its signal ends
+
+	Parameters
+	----------
+	sequence : any
+		The finite sequence (list or numpy array) the values are taken from
+	start : int
+		The position in sequence of the first value in the block
+	samples : int
+		The number of values in the block
+
+	Returns
+	-------
+	numpy.ndarray
+		A one-dimensional array of floats of length samples
+	'''
+
+	return_values = np.full(samples, np.nan, dtype=float)
+
+	available = max(min(len(sequence) - start, samples), 0)
+	if (available > 0):
+		return_values[ : available] = np.asarray(sequence[start : start + available], dtype=float)
+
+	return return_values
 
 
 class SineWaveGenerator(__BaseGenerator__):
@@ -138,6 +257,26 @@ class SineWaveGenerator(__BaseGenerator__):
 
 		self.current_value = self.amplitude * sin((2.0 * pi * self.counter / self.wavelength) + self.phase)
 
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, computing a whole block of sine wave values in one vectorized pass
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			The next samples values from this sine wave generator
+		'''
+
+		return_values = self.amplitude * np.sin((2.0 * pi * np.arange(self.counter, self.counter + samples, dtype=float) / self.wavelength) + self.phase)
+		self.current_value = float(return_values[-1])
+
+		return return_values
+
 
 class ConstantGenerator(__BaseGenerator__):
 	'''
@@ -157,27 +296,46 @@ class ConstantGenerator(__BaseGenerator__):
 
 		self.current_value = float(value) if ((value != None) and (type(value) in [int, float])) else self.default_value
 
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, a block of a constant is just the constant repeated
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			The constant value repeated samples times
+		'''
+
+		return np.full(samples, self.current_value, dtype=float)
+
 
 class MorseCodeGenerator(__BaseGenerator__):
 	'''
 	This class defines a Morse code source that generates dits/dots and dahs/dashes from signal message in a text file
+	The message is compiled into a compact numpy.uint8 bitstream, which is cached on disk so that the same message loads instantly the next time
 	'''
 
 	signal_file = None
 
 	signal = None
-	morse = []
-	bitstream = []
+	bitstream = None
 
 	stream_length = 0
 	end_of_signal = False
 
-	def __init__(self, signal_file:any):
+	def __init__(self, signal_file:any, use_cache:bool=True):
 		'''
 		Parameters
 		----------
 		signal_file : any pathlib.Path child class
 			The parsed path to the input signal text file that will be converted to Morse code
+		use_cache : bool
+			Whether the compiled bitstream is looked for in, and saved to, the cache in morse_cache_folder, defaults to True
 		'''
 
 		if (signal_file == None):
@@ -195,19 +353,33 @@ class MorseCodeGenerator(__BaseGenerator__):
 		with open(self.signal_file) as file_in:
 			self.signal = str(file_in.read()).replace("\n", " ").strip().lower()
 
-		self.morse = convert_to_morse(self.signal)
-		delta = abs(len(self.signal) - len(self.morse))
-		if (delta > 0):
-			raise Exception(f"argument signal_file {signal_file} contains {delta} character{'s' if (delta != 1) else ''} that could not be mapped to Morse code")
-
-		# If this method call has made it here without crashing, the signal file has been read in, converted to Morse code and no mapped characters were encountered
-
-		# When building the bitstream, append some zeros to each character for spacing
-		self.bitstream = []
-		for morse_character in self.morse:
-			character_bits = [bit for didah in morse_character for bit in didah]
-			character_bits.extend([0, 0, 0])
-			self.bitstream.extend(character_bits)
+		cache_file = None
+		if (use_cache):
+			cache_file = morse_cache_folder / f"{sha256(morse_table_signature + self.signal.encode('utf-8')).hexdigest()}.npy"
+			if (cache_file.is_file()):
+				# This message has been compiled before, map the cached bitstream instead of compiling it again
+				self.bitstream = np.load(cache_file, mmap_mode="r")
+
+		if (self.bitstream is None):
+			codes = morse_character_codes(self.signal)
+			delta = int(np.count_nonzero(codes < 0))
+			if (delta > 0):
+				raise Exception(f"argument signal_file {signal_file} contains {delta} character{'s' if (delta != 1) else ''} that could not be mapped to Morse code")
+
+			# If this method call has made it here without crashing, the signal file has been read in and no unmapped characters were encountered
+			self.bitstream = compile_morse(self.signal)
+
+			if ((cache_file != None) and (self.bitstream.shape[0] > 0)):
+				try:
+					# Write the cache file under a temporary name first so that a half-written file is never mistaken for a cached bitstream, even when
+					# several processes compile the same message at once
+					cache_file.parent.mkdir(parents=True, exist_ok=True)
+					temporary_file = cache_file.with_name(f"{cache_file.stem}.{getpid()}.tmp.npy")
+					np.save(temporary_file, self.bitstream)
+					replace(temporary_file, cache_file)
+				except OSError as e:
+					# The cache is only an optimization, a cache folder that cannot be written to is not an error
+					pass
 
 		# Since the length of the stream is used a lot, compute and retain it
 		self.stream_length = len(self.bitstream)
@@ -228,37 +400,88 @@ class MorseCodeGenerator(__BaseGenerator__):
 			self.end_of_signal = True
 
 		if ((not self.end_of_signal) and (self.counter < self.stream_length)):
-			self.current_value = self.bitstream[self.counter]
+			self.current_value = int(self.bitstream[self.counter])
 		else:
 			self.current_value = None
 
+	@property
+	def samples_remaining(self):
+		'''
+		This computed property is the number of bits left in the bitstream before this generator reaches the end of its signal
+		'''
+		return 0 if (self.end_of_signal) else max(self.stream_length - self.counter, 0)
+
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, slicing a whole block of bits out of the bitstream at once
+		If the end of the bitstream is reached partway through the block, the rest of the block is NaN and end_of_signal is set, exactly as it would be
+		after the same number of next calls
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			The next samples bits from this Morse code generator
+		'''
+
+		return_values = sequence_block(self.bitstream, self.counter, samples) if (not self.end_of_signal) else np.full(samples, np.nan, dtype=float)
+
+		if (self.counter + samples > self.stream_length):
+			self.end_of_signal = True
+
+		self.current_value = None if (np.isnan(return_values[-1])) else int(return_values[-1])
+
+		return return_values
+
 
 class SignalRepeater(__BaseGenerator__):
 	'''
-	This class defines a "generator" that repeats a signal from a JSON-formatted list file
-	The repeated signal can optionally be scaled up or down in magnitude
+	This class defines a "generator" that repeats a recorded signal
+	The signal is never loaded into memory all at once, so multi-gigabyte recordings can be replayed
+	* .npy files and raw binary files (.bin, .raw or .dat) are memory-mapped as they are
+	* JSON-formatted list, newline-delimited JSON (.ndjson or .jsonl) and CSV (.csv) files are read a block at a time and converted, once, into a .npy
+	  file in signal_cache_folder that is then memory-mapped, the converted file is used again for as long as the signal file does not change
+	The repeated signal can optionally be scaled up or down in magnitude and/or converted to a logarithm, both are applied to each value or block of
+	values as it is emitted
 	'''
 
 	signal_file = None
 	scaling_factor = 1.0
 	logarithmic = False
+	column = None
+	dtype = None
 
+	# signal holds the recorded values as they are in the file (before they are scaled or converted to a logarithm), as a memory-mapped array
 	signal = None
 	signal_length = 0
 	signal_minimum = 0
 	signal_maximum = 0
+	logarithm_offset = None
 	end_of_signal = False
 
-	def __init__(self, signal_file:any, scaling_factor:float=None, logarithmic:bool=None):
+	def __init__(self, signal_file:any, scaling_factor:float=None, logarithmic:bool=None, column:any=None, dtype:str=None, use_cache:bool=True):
 		'''
 		Parameters
 		----------
 		signal_file : any pathlib.Path child class
-			The parsed path to the input signal JSON-formatted list that will be repeated by this "generator"
+			The parsed path to the input signal file that will be repeated by this "generator", see this class's description for the formats it can be in
 		scaling_factor : float
 			The amount by which the repeated signal will be scaled, will default to one if not present
 		logarithmic : bool
 			Optional flag indicating whether this signal should be converted to a common logarithm of its current value, will default to False if not present
+		column : any
+			For a CSV file, the column holding the signal, either its zero-based position (int) or its name in the header row (str), will default to the
+			first column if not present
+			For a two-dimensional .npy file, the zero-based position of the column holding the signal, will default to the first column if not present
+		dtype : str
+			For a raw binary file, the numpy data type of its values (e.g. "float32" or "<i2"), will default to "float64" if not present
+		use_cache : bool
+			Whether a text signal file's converted .npy file is looked for in, and saved to, signal_cache_folder, defaults to True
+			Without the cache, the converted values are held in memory, as floats
 		'''
 
 		if (signal_file == None):
@@ -284,46 +507,187 @@ class SignalRepeater(__BaseGenerator__):
 			except:
 				raise Exception(f"If present, logarithmic must be able to resolve to a True or False, {logarithmic} does not")
 
-		# If this method call has made it here without crashing, things are good so far, now attempt to read in the signal file
+		if ((column != None) and (type(column) not in [int, str])):
+			raise Exception(f"if present, argument column must be an int or a str, not an object of type {type(column).__name__}")
+
+		if (dtype != None):
+			try:
+				self.dtype = np.dtype(dtype)
+			except TypeError:
+				raise Exception(f"if present, argument dtype must be a numpy data type, {dtype} is not")
+
+		# If this method call has made it here without crashing, things are good so far, now attempt to map or read in the signal file
 
 		# Copy the initialization arguments to the object's parameters
 		self.signal_file = signal_file
+		self.column = column
 		if (scaling_factor != None):
 			self.scaling_factor = scaling_factor
 
-		# Attempt to read in the JSON-formatted object from signal_file and raise an Exception if it doesn't contain a list
-		with open(self.signal_file) as file_in:
-			self.signal = json.load(file_in)
-
-		if (type(self.signal) != list):
-			raise Exception(f"signal_file argument {self.signal_file} must contain a JSON-formatted list, not a JSON formatted {type(self.signal).__name__}")
+		extension = self.signal_file.suffix.lower()
+		if (extension == ".npy"):
+			self.signal = np.load(self.signal_file, mmap_mode="r")
+			if (self.signal.ndim == 2):
+				if ((column != None) and (type(column) != int)):
+					raise Exception(f"argument column must be an int to select a column of {self.signal_file}, not an object of type {type(column).__name__}")
+
+				self.signal = self.signal[ : , column if (column != None) else 0]
+			elif (self.signal.ndim != 1):
+				raise Exception(f"signal_file argument {self.signal_file} must hold a one or two-dimensional array, not a {self.signal.ndim}-dimensional one")
+		elif (extension in binary_signal_extensions):
+			dtype = self.dtype if (self.dtype != None) else np.dtype(float)
+			if (self.signal_file.stat().st_size % dtype.itemsize != 0):
+				raise Exception(f"signal_file argument {self.signal_file} must hold a whole number of {dtype.name} values, its size is not a multiple of {dtype.itemsize} bytes")
+
+			# An empty file cannot be memory-mapped
+			self.signal = np.memmap(self.signal_file, dtype=dtype, mode="r") if (self.signal_file.stat().st_size > 0) else np.empty(0, dtype=dtype)
+		else:
+			self.signal = self.load_text_signal(use_cache)
 
 		# If this method call has made it here without crashing, signal_file is syntactically valid, finish up initialization efforts
 
-		if (self.scaling_factor != 1.0):
-			# The incoming signal is being scaled and/or converted to a logarithm
-			self.signal = [self.scaling_factor * i for i in self.signal]
-
 		# Since the length of the signal is used in other calculations, compute and retain it
 		self.signal_length = len(self.signal)
 
 		if (self.signal_length > 0):
-			# Signal minimum and maximum are useful for setting y-range parameters when graphing a signal, compute them
-			self.signal_minimum = min(self.signal)
-			self.signal_maximum = max(self.signal)
+			# Signal minimum and maximum are useful for setting y-range parameters when graphing a signal, compute them a block at a time from the
+			# recorded values and then scale them, a negative scaling factor swaps them
+			(minimum, maximum) = self.recorded_extremes()
+			(self.signal_minimum, self.signal_maximum) = sorted([self.scaling_factor * minimum, self.scaling_factor * maximum])
 
 			if (self.logarithmic):
 				# This series is supposed to be presented logarithmically, logarithms do not like numbers less than or equal to zero
 				# So if necessary, this series will be shifted up so that its minimum value is 1 (because the common log of one is zero)
-
 				if (self.signal_minimum <= 0):
-					self.signal = [log(i + 1 - self.signal_minimum) for i in self.signal]
-				else:
-					self.signal = [log(i, 10) for i in self.signal]
+					self.logarithm_offset = 1 - self.signal_minimum
+
+				# Re-compute the minimum and maximum as they will be emitted, the logarithm keeps them in the same order
+				(self.signal_minimum, self.signal_maximum) = [log(extreme + self.logarithm_offset) if (self.logarithm_offset != None) else log(extreme, 10) for extreme in [self.signal_minimum, self.signal_maximum]]
+
+	def load_text_signal(self, use_cache:bool):
+		'''
+		This method reads a signal out of a text (JSON-formatted or CSV) file a block at a time, converting it into a .npy file in signal_cache_folder
+		A file converted by an earlier run is used again as long as the signal file has the same size and modification time
+
+		Parameters
+		----------
+		use_cache : bool
+			Whether the converted file is looked for in, and saved to, signal_cache_folder
+
+		Returns
+		-------
+		numpy.ndarray
+			The recorded values, memory-mapped from the converted file or, without the cache, held in memory
+		'''
+
+		return_signal = None
+
+		cache_file = None
+		if (use_cache):
+			status = self.signal_file.stat()
+			signature = f"{self.signal_file.resolve()}|{status.st_size}|{status.st_mtime_ns}|{self.column!r}"
+			cache_file = signal_cache_folder / f"{sha256(signature.encode('utf-8')).hexdigest()}.npy"
+			if (cache_file.is_file()):
+				# This signal file has been converted before, map the converted file instead of reading it again
+				return_signal = np.load(cache_file, mmap_mode="r")
+			else:
+				temporary_file = cache_file.with_name(f"{cache_file.stem}.{getpid()}.tmp.npy")
+				try:
+					# Write the converted file under a temporary name first so that a half-written file is never mistaken for a converted signal, even when
+					# several processes convert the same signal file at once
+					cache_file.parent.mkdir(parents=True, exist_ok=True)
+					writer = BinaryFramesWriter(str(temporary_file), (), float)
+					for block in iterate_signal_blocks(str(self.signal_file), self.column, signal_block_values):
+						writer.append(block)
+					writer.close()
+
+					if (writer.count > 0):
+						replace(temporary_file, cache_file)
+						return_signal = np.load(cache_file, mmap_mode="r")
+					else:
+						return_signal = np.empty(0, dtype=float)
+				except OSError as e:
+					# The cache is only an optimization, a cache folder that cannot be written to is not an error
+					pass
+				finally:
+					if (temporary_file.exists()):
+						temporary_file.unlink()
+
+		if (return_signal is None):
+			return_signal = np.concatenate([np.empty(0, dtype=float)] + list(iterate_signal_blocks(str(self.signal_file), self.column, signal_block_values)))
+
+		return return_signal
+
+	def recorded_extremes(self):
+		'''
+		This method finds the smallest and largest recorded values in the signal, a block at a time, skipping missing (NaN) values
+
+		Returns
+		-------
+		tuple
+			The (minimum, maximum) recorded values, both zero if the signal has no values that are not missing
+		'''
+
+		minimum = None
+		maximum = None
+		for start in range(0, self.signal_length, signal_block_values):
+			block = np.asarray(self.signal[start : start + signal_block_values], dtype=float)
+			if (np.isnan(block).all()):
+				continue
+
+			(block_minimum, block_maximum) = (float(np.nanmin(block)), float(np.nanmax(block)))
+			minimum = block_minimum if ((minimum == None) or (block_minimum < minimum)) else minimum
+			maximum = block_maximum if ((maximum == None) or (block_maximum > maximum)) else maximum
+
+		return (minimum, maximum) if (minimum != None) else (0.0, 0.0)
+
+	def transform_value(self, value:float):
+		'''
+		This method scales a single recorded value and, for a logarithmic signal, converts it to a logarithm
+
+		Parameters
+		----------
+		value : float
+			The recorded value
+
+		Returns
+		-------
+		float
+			The value as it is emitted by this "generator", None for a missing (NaN) value
+		'''
 
-				# Re-compute the minimum and maximum now that the signal has been logarithmed
-				self.signal_minimum = min(self.signal)
-				self.signal_maximum = max(self.signal)
+		value = self.scaling_factor * float(value)
+		if (value != value):
+			# Only NaN is not equal to itself
+			return None
+
+		if (self.logarithmic):
+			value = log(value + self.logarithm_offset) if (self.logarithm_offset != None) else log(value, 10)
+
+		return value
+
+	def transform_block(self, values:np.ndarray):
+		'''
+		This method scales a block of recorded values and, for a logarithmic signal, converts them to logarithms, all at once
+
+		Parameters
+		----------
+		values : numpy.ndarray
+			The recorded values, as floats
+
+		Returns
+		-------
+		numpy.ndarray
+			The values as they are emitted by this "generator", missing values stay NaN
+		'''
+
+		if (self.scaling_factor != 1.0):
+			values = self.scaling_factor * values
+
+		if (self.logarithmic):
+			values = np.log(values + self.logarithm_offset) if (self.logarithm_offset != None) else np.log10(values)
+
+		return values
 
 	def compute_next_value(self):
 		'''
@@ -341,7 +705,298 @@ class SignalRepeater(__BaseGenerator__):
 			self.end_of_signal = True
 
 		if ((not self.end_of_signal) and (self.counter < self.signal_length)):
-			self.current_value = self.signal[self.counter]
+			self.current_value = self.transform_value(self.signal[self.counter])
 		else:
 			self.current_value = None
 
+	@property
+	def samples_remaining(self):
+		'''
+		This computed property is the number of values left in the signal before this "generator" reaches the end of its signal
+		'''
+		return 0 if (self.end_of_signal) else max(self.signal_length - self.counter, 0)
+
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, slicing a whole block of values out of the signal at once
+		If the end of the signal is reached partway through the block, the rest of the block is NaN and end_of_signal is set, exactly as it would be
+		after the same number of next calls
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			The next samples values from the signal being repeated
+		'''
+
+		return_values = self.transform_block(sequence_block(self.signal, self.counter, samples)) if (not self.end_of_signal) else np.full(samples, np.nan, dtype=float)
+
+		if (self.counter + samples > self.signal_length):
+			self.end_of_signal = True
+
+		self.current_value = None if (np.isnan(return_values[-1])) else float(return_values[-1])
+
+		return return_values
+
+
+class CSVSignalGenerator(__BaseGenerator__):
+	'''
+	This class defines a "generator" that emits one column of a CSV file (e.g. an export of alarm percentages) directly, with no conversion to JSON first
+	The file is read a large chunk of whole lines at a time and each chunk's column is parsed in one vectorized pass, so only one chunk's worth of values
+	is ever held in memory
+	The emitted values can be clipped to a minimum and/or a maximum (e.g. a maximum of 100 for a percentage)
+	In follow mode, the file is tailed as it grows: once every line written so far has been emitted, this "generator" waits for more lines to be
+	appended and picks up from where it left off, without reading the file again
+	'''
+
+	signal_file = None
+	column = None
+	minimum = None
+	maximum = None
+	follow = False
+	poll_seconds = 0.1
+	idle_seconds = None
+
+	# file_in is the open CSV file and file_identity the inode it was opened at, remainder is the start of a line that has not been completely read yet,
+	# index is the zero-based position of the column once the first line has been read
+	file_in = None
+	file_identity = None
+	remainder = b""
+	index = None
+
+	# values holds the parsed (and clipped) values of the chunk being emitted, position is the index of the next one to emit
+	values = None
+	position = 0
+	end_of_signal = False
+
+	def __init__(self, signal_file:any, column:any=None, minimum:float=None, maximum:float=None, follow:bool=None, poll_seconds:float=None, idle_seconds:float=None):
+		'''
+		Parameters
+		----------
+		signal_file : any pathlib.Path child class
+			The parsed path to the CSV file whose column will be emitted by this "generator"
+		column : any
+			The column holding the signal, either its zero-based position (int) or its name in the header row (str), will default to the first column if not
+			present
+			If the first row does not hold a number in the column, it is taken to be a header row
+		minimum : float
+			Optional smallest value to emit, smaller values are raised to it
+		maximum : float
+			Optional largest value to emit, larger values are lowered to it
+		follow : bool
+			Optional flag indicating whether the file should be tailed as it grows instead of ending at its last line, will default to False if not present
+		poll_seconds : float
+			In follow mode, the number of seconds to wait before looking for new lines again, will default to 0.1 if not present
+		idle_seconds : float
+			In follow mode, the number of seconds without any new lines after which the signal ends, the file is followed forever if not present
+		'''
+
+		if (signal_file == None):
+			raise Exception("argument signal_file cannot be None")
+		elif (not issubclass(signal_file.__class__, Path)):
+			raise Exception(f"argument signal_file must be a parsed pathlib.Path child object, not an object of type {type(signal_file).__name__}")
+		elif (not signal_file.is_file()):
+			raise Exception(f"argument signal_file {signal_file} is not a path to a file")
+
+		if ((column != None) and (type(column) not in [int, str])):
+			raise Exception(f"if present, argument column must be an int or a str, not an object of type {type(column).__name__}")
+		elif ((type(column) == int) and (column < 0)):
+			raise Exception(f"if present, argument column must be zero or a positive integer, {column} is invalid")
+
+		for (name, value) in [("minimum", minimum), ("maximum", maximum), ("poll_seconds", poll_seconds), ("idle_seconds", idle_seconds)]:
+			if ((value != None) and (type(value) not in [int, float])):
+				raise Exception(f"if present, argument {name} must be a number, not an object of type {type(value).__name__}")
+
+		if ((minimum != None) and (maximum != None) and (minimum > maximum)):
+			raise Exception(f"argument minimum ({minimum}) cannot be greater than argument maximum ({maximum})")
+
+		if ((poll_seconds != None) and (poll_seconds <= 0)):
+			raise Exception(f"if present, argument poll_seconds must be a positive number, {poll_seconds} is invalid")
+
+		if ((idle_seconds != None) and (idle_seconds < 0)):
+			raise Exception(f"if present, argument idle_seconds cannot be negative, {idle_seconds} is invalid")
+
+		if (follow != None):
+			# If follow is not None, don't worry about the type, try and see if it can be resolved to a Boolean, raising an error if it cannot
+			try:
+				self.follow = bool(follow)
+			except:
+				raise Exception(f"If present, follow must be able to resolve to a True or False, {follow} does not")
+
+		# If this method call has made it here without crashing, things are good so far, copy the initialization arguments to the object's parameters
+		self.signal_file = signal_file
+		self.column = column if (column != None) else 0
+		self.minimum = float(minimum) if (minimum != None) else None
+		self.maximum = float(maximum) if (maximum != None) else None
+		if (poll_seconds != None):
+			self.poll_seconds = float(poll_seconds)
+
+		if (idle_seconds != None):
+			self.idle_seconds = float(idle_seconds)
+
+		self.values = np.empty(0, dtype=float)
+		self.open_signal_file()
+
+	def open_signal_file(self):
+		'''
+		This method opens (or re-opens) the CSV file to be read from its start, forgetting any partly read line and the header row
+		'''
+
+		if (self.file_in != None):
+			self.file_in.close()
+
+		self.file_in = open(self.signal_file, "rb")
+		self.file_identity = stat(self.file_in.fileno()).st_ino
+		self.remainder = b""
+		self.index = None
+
+	def replaced_or_truncated(self):
+		'''
+		This method checks whether, while being followed, the CSV file has been replaced by a new file (e.g. rotated) or truncated
+
+		Returns
+		-------
+		bool
+			True if the file now at signal_file is a different file or is shorter than what has been read of it
+		'''
+
+		try:
+			status = self.signal_file.stat()
+		except OSError:
+			# The file is missing for a moment, e.g. while it is being rotated, treat it as not having changed yet
+			return False
+
+		return (status.st_ino != self.file_identity) or (status.st_size < self.file_in.tell())
+
+	def read_chunk(self, final:bool):
+		'''
+		This method reads the next chunk of whole lines from the CSV file, parsing and clipping its column into values
+
+		Parameters
+		----------
+		final : bool
+			Whether a line at the end of the file that has no newline yet should be taken to be complete
+
+		Returns
+		-------
+		bool
+			True if at least one new value was read
+		'''
+
+		# Keep reading until a chunk holds at least one value or the end of the file is reached, a chunk can hold nothing but a header row or blank lines
+		end_of_file = False
+		while (not end_of_file):
+			data = self.file_in.read(csv_chunk_bytes)
+			end_of_file = len(data) < csv_chunk_bytes
+
+			# Only whole lines are parsed, the part of a line at the end of the chunk is kept until the rest of it has been read
+			data = self.remainder + data
+			self.remainder = b""
+			if (not (end_of_file and final)):
+				cut = data.rfind(b"\n") + 1
+				(data, self.remainder) = (data[ : cut], data[cut : ])
+
+			if ((self.index == None) and (data.strip() != b"")):
+				(self.index, data) = split_csv_header(data, self.column, str(self.signal_file))
+
+			if (self.index != None):
+				values = parse_csv_column(data, self.index, str(self.signal_file))
+				if (values.shape[0] > 0):
+					if ((self.minimum != None) or (self.maximum != None)):
+						values = np.clip(values, self.minimum, self.maximum)
+
+					(self.values, self.position) = (values, 0)
+					return True
+
+		return False
+
+	def buffer_values(self):
+		'''
+		This method makes sure that values holds at least one value that has not been emitted yet, reading more of the CSV file if needed
+		In follow mode, this waits (by sleeping poll_seconds at a time) until more lines are appended to the file, or until idle_seconds have passed
+		without any
+
+		Returns
+		-------
+		bool
+			True if there is a value to emit, False at the end of the signal
+		'''
+
+		idle_since = None
+		while (self.position >= self.values.shape[0]):
+			if (self.read_chunk(not self.follow)):
+				continue
+			elif (not self.follow):
+				return False
+			elif (self.replaced_or_truncated()):
+				# Start again from the beginning of the new (or truncated) file
+				self.open_signal_file()
+				continue
+
+			idle_since = monotonic() if (idle_since == None) else idle_since
+			if ((self.idle_seconds != None) and (monotonic() - idle_since >= self.idle_seconds)):
+				# Nothing has been appended for long enough, a last line without a newline is taken to be complete before the signal ends
+				return self.read_chunk(True)
+
+			sleep(self.poll_seconds)
+
+		return True
+
+	def compute_next_value(self):
+		'''
+		This method overrides the same method from the superclass and actually does some work
+		Specifically, it selects the next value to be emitted from the CSV file's column
+
+		Returns
+		-------
+		float
+			The next value from the CSV file's column, None for an empty field
+		'''
+
+		if ((not self.end_of_signal) and (not self.buffer_values())):
+			self.end_of_signal = True
+			self.file_in.close()
+
+		if (not self.end_of_signal):
+			value = self.values[self.position]
+			self.position = self.position + 1
+			self.current_value = None if (np.isnan(value)) else float(value)
+		else:
+			self.current_value = None
+
+	def compute_next_block(self, samples:int):
+		'''
+		This method overrides the same method from the superclass, copying whole runs of parsed values into the block at once
+		If the end of the signal is reached partway through the block, the rest of the block is NaN and end_of_signal is set, exactly as it would be
+		after the same number of next calls
+
+		Parameters
+		----------
+		samples : int
+			The number of values to compute
+
+		Returns
+		-------
+		numpy.ndarray
+			The next samples values from the CSV file's column
+		'''
+
+		return_values = np.full(samples, np.nan, dtype=float)
+
+		filled = 0
+		while ((filled < samples) and (not self.end_of_signal)):
+			if (not self.buffer_values()):
+				self.end_of_signal = True
+				self.file_in.close()
+			else:
+				taken = min(samples - filled, self.values.shape[0] - self.position)
+				return_values[filled : filled + taken] = self.values[self.position : self.position + taken]
+				(filled, self.position) = (filled + taken, self.position + taken)
+
+		self.current_value = None if (np.isnan(return_values[-1])) else float(return_values[-1])
+
+		return return_values
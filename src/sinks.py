@@ -0,0 +1,726 @@
+import json
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, makedirs
+from os.path import splitext
+
+from led.src.baseclasses import FrameSink as __BaseSink__
+from led.src.recorders import FrameRecorder
+from led.src.storage import frames_to_json_list
+
+
+class SinkPipeline:
+	'''
+	This class hands the results of a model run to a set of sinks in chunks while the model is running
+	Frames can be pushed either as whole blocks or one at a time (they are then gathered into a chunk before being passed on), and each chunk is only
+	colorized once no matter how many sinks use its colors
+	'''
+
+	default_chunk_size = 4096
+
+	sinks = None
+	colorizer = None
+	uses_color = False
+
+	chunk_frames = None
+	chunk_time_series = None
+
+	def __init__(self, sinks:list, colorizer:any=None, chunk_size:int=None):
+		'''
+		Parameters
+		----------
+		sinks : list[led.src.baseclasses.FrameSink]
+			The set of sinks that will receive the results
+		colorizer : any
+			A callable that takes a chunk of frames and returns an (RGB frames, BRG frames) tuple, e.g. led.src.actions.RangeColorizer or
+			led.src.colorschemes.ThresholdColormap.colorize_frames, it is required if any of the sinks uses colors
+		chunk_size : int
+			The number of frames pushed one at a time that are gathered before they are passed on to the sinks, defaults to a pre-determined value
+		'''
+
+		if (sinks == None):
+			raise Exception("argument sinks must be a list of led.src.baseclasses.FrameSink objects")
+		elif (type(sinks) != list):
+			raise Exception(f"argument sinks must be a list of led.src.baseclasses.FrameSink objects, not an object of type {type(sinks).__name__}")
+
+		for sink in sinks:
+			if (not issubclass(type(sink), __BaseSink__)):
+				raise Exception(f"all elements in argument sinks must be subclasses of led.src.baseclasses.FrameSink, {type(sink).__name__} is not")
+
+		self.sinks = sinks
+		self.uses_color = any([sink.uses_color for sink in self.sinks])
+
+		if ((self.uses_color) and (not callable(colorizer))):
+			raise Exception("argument colorizer must be a callable that returns RGB and BRG frames when any of the sinks uses colors")
+
+		self.colorizer = colorizer
+		self.chunk_size = self.default_chunk_size if (chunk_size == None) else max(int(chunk_size), 1)
+		self.chunk_time_series = []
+
+	def push(self, frames:np.ndarray, time_series:list):
+		'''
+		This method passes a whole block of results on to every sink, after passing on any frames that were pushed one at a time before it
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			The block of data frames from the model
+		time_series : list[any]
+			The block of time series values from the model, one per frame
+		'''
+
+		self.flush()
+
+		(rgb_frames, brg_frames) = self.colorizer(frames) if (self.uses_color) else (None, None)
+		for sink in self.sinks:
+			sink.write(frames, rgb_frames, brg_frames, time_series)
+
+	def push_frame(self, frame:np.ndarray, value:any):
+		'''
+		This method adds a single frame and its time series value to the current chunk, passing the chunk on to the sinks when it fills up
+
+		Parameters
+		----------
+		frame : numpy.ndarray
+			A single data frame from the model
+		value : any
+			The time series value that goes with frame
+		'''
+
+		if (self.chunk_frames == None):
+			self.chunk_frames = FrameRecorder(np.shape(frame), self.chunk_size)
+
+		self.chunk_frames.append(frame)
+		self.chunk_time_series.append(value)
+
+		if (len(self.chunk_frames) >= self.chunk_size):
+			self.flush()
+
+	def flush(self):
+		'''
+		This method passes any frames that were pushed one at a time and not passed on yet to the sinks
+		'''
+
+		if ((self.chunk_frames != None) and (len(self.chunk_frames) > 0)):
+			(frames, time_series) = (self.chunk_frames.frames, self.chunk_time_series)
+			self.chunk_frames = None
+			self.chunk_time_series = []
+			self.push(frames, time_series)
+
+	def close(self):
+		'''
+		This method passes on any remaining frames and then closes every sink
+		'''
+
+		self.flush()
+		for sink in self.sinks:
+			sink.close()
+
+
+class JSONListSink(__BaseSink__):
+	'''
+	THIS CLASS IS NOT INTENDED TO BE INSTANTIATED DIRECTLY
+	This class definition is intended to be used as a parent class for sinks that write one JSON-formatted list a chunk at a time
+	The file is a complete JSON list once the sink is closed, exactly what json.dump would have written for the whole list at once
+	'''
+
+	filename = None
+	file_out = None
+	items_written = 0
+
+	def __init__(self, filename:str):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the list will be written
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		self.filename = filename
+		self.file_out = open(self.filename, "w")
+		self.file_out.write("[")
+		self.items_written = 0
+
+	def write_items(self, items:list):
+		'''
+		This method adds a chunk of items to the end of the list being written
+
+		Parameters
+		----------
+		items : list[any]
+			The items to be added, each one must be JSON-serializable (NaN is not, it must be replaced with None first)
+		'''
+
+		if (len(items) > 0):
+			# Serialize the chunk as a list and strip its brackets so that it can be spliced onto the items already written
+			self.file_out.write(("" if (self.items_written == 0) else ", ") + json.dumps(items, allow_nan=False)[1 : -1])
+			self.items_written = self.items_written + len(items)
+
+	def close(self):
+		'''
+		This method closes the list and the file
+		'''
+
+		if (self.file_out != None):
+			self.file_out.write("]")
+			self.file_out.close()
+			self.file_out = None
+
+
+class TimeSeriesSink(JSONListSink):
+	'''
+	This class defines a sink that writes the time series of a model run to a JSON-formatted list file, like led.src.actions.save_time_series
+	'''
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, adding the chunk's time series values to the file
+		'''
+
+		if (time_series != None):
+			self.write_items(list(time_series))
+
+
+class FramesSink(JSONListSink):
+	'''
+	This class defines a sink that writes the data frames of a model run to a JSON-formatted list file, like led.src.actions.save_frames
+	'''
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, adding the chunk's data frames to the file
+		'''
+
+		if (frames is not None):
+			self.write_items(frames_to_json_list(frames))
+
+
+class ImageSink(__BaseSink__):
+	'''
+	This class defines a sink that saves the colorized frames of a model run as a "temporal" contact sheet image with one row per frame, like
+	led.src.actions.save_frames_image
+	The image file can only be written once every row is known, so the colorized rows (three bytes per pixel) are gathered until the sink is closed
+	'''
+
+	uses_color = True
+
+	filename = None
+	rows = None
+	image = None
+
+	def __init__(self, filename:str):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the image will be written
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		self.filename = filename
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, gathering the chunk's RGB frames as rows of the image
+		'''
+
+		if (rgb_frames is not None):
+			if (self.rows == None):
+				self.rows = FrameRecorder(rgb_frames.shape[1 : ], dtype=np.uint8)
+
+			self.rows.extend(rgb_frames)
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, saving the image and keeping the PIL.Image object in self.image
+		'''
+
+		if (self.rows != None):
+			from PIL import Image
+
+			self.image = Image.fromarray(self.rows.frames)
+			self.image.save(self.filename)
+			self.rows = None
+
+
+class ContactSheetSink(__BaseSink__):
+	'''
+	This class defines a sink that saves the colorized frames of a model run as a contact sheet in bounded memory, however long the run is, unlike ImageSink
+	(which holds every row until it is closed)
+	* An overview image, saved as filename, that holds at most overview_rows rows, each one standing for an equal run of consecutive frames
+	* Optionally, tiles that hold every frame at full resolution, tile_rows rows each, saved as "<filename without extension>_<tile number><extension>" as
+	  soon as each one fills up
+	Since the length of the run is not known in advance, the overview starts with one frame per row, and every time its rows fill up, neighbouring rows are
+	merged in pairs and each row stands for twice as many frames from then on
+	Each row of the overview is reduced from its frames in one of these ways:
+	* max - each pixel keeps the color of the frame with the largest value at that pixel (e.g. the worst alarm level), using the data frames
+	* mean - each pixel is the average color of the frames
+	* decimate - the row is the first of the frames
+	'''
+
+	uses_color = True
+
+	reductions = ["max", "mean", "decimate"]
+	default_overview_rows = 2048
+	default_reduction = "max"
+
+	filename = None
+	overview_rows = None
+	tile_rows = None
+	reduction = None
+	image = None
+	count = 0
+
+	# The overview's completed rows (rows_filled of them, each standing for frames_per_row frames) and the row that is being filled (current_count frames
+	# so far), values are only kept for the max reduction and counts for the mean reduction
+	frames_per_row = 1
+	rows_filled = 0
+	row_colors = None
+	row_values = None
+	row_counts = None
+	current_colors = None
+	current_values = None
+	current_count = 0
+
+	# The tile that is being filled (tile_filled rows of it) and the number of tiles saved so far
+	tile = None
+	tile_filled = 0
+	tiles_saved = 0
+
+	def __init__(self, filename:str, overview_rows:int=None, tile_rows:int=None, reduction:str=None):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the overview image will be written
+		overview_rows : int
+			The largest number of rows in the overview image, defaults to a pre-determined value
+		tile_rows : int
+			Optional number of rows in each tile, no tiles are saved if not present
+		reduction : str
+			How each row of the overview is reduced from its frames, one of "max", "mean" or "decimate", defaults to "max"
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		for (name, value) in [("overview_rows", overview_rows), ("tile_rows", tile_rows)]:
+			if ((value != None) and ((type(value) != int) or (value < 1))):
+				raise Exception(f"if present, {name} argument must be a positive integer, {value} is invalid")
+
+		reduction = self.default_reduction if (reduction == None) else reduction
+		if (reduction not in self.reductions):
+			raise Exception(f"if present, reduction argument must be one of {', '.join(self.reductions)}, not {reduction}")
+
+		self.filename = filename
+		# Rows are merged in pairs, so there is always an even number of them
+		self.overview_rows = max(2, (self.default_overview_rows if (overview_rows == None) else overview_rows) // 2 * 2)
+		self.tile_rows = tile_rows
+		self.reduction = reduction
+
+	def reduce_rows(self, rgb_frames:np.ndarray, values:np.ndarray, rows:int):
+		'''
+		This method reduces a block of frames into rows of the overview, an equal number of consecutive frames into each row
+
+		Parameters
+		----------
+		rgb_frames : numpy.ndarray
+			The block of RGB frames, with shape (number of frames, width, 3), the number of frames must be a multiple of rows
+		values : numpy.ndarray
+			For the max reduction, the block's data frames as floats with -inf in place of missing values, otherwise None
+		rows : int
+			The number of rows
+
+		Returns
+		-------
+		numpy.ndarray
+			The rows' colors (sums of the colors for the mean reduction)
+		numpy.ndarray
+			For the max reduction, the rows' largest values, otherwise None
+		'''
+
+		frames_per_row = rgb_frames.shape[0] // rows
+		rgb_frames = rgb_frames.reshape(rows, frames_per_row, *rgb_frames.shape[1 : ])
+
+		if (self.reduction == "mean"):
+			return (rgb_frames.sum(axis=1, dtype=float), None)
+		elif (self.reduction == "decimate"):
+			return (rgb_frames[ : , 0], None)
+
+		values = values.reshape(rows, frames_per_row, values.shape[1])
+		largest = values.argmax(axis=1)[ : , np.newaxis]
+		return (np.take_along_axis(rgb_frames, largest[..., np.newaxis], axis=1)[ : , 0], np.take_along_axis(values, largest, axis=1)[ : , 0])
+
+	def combine_rows(self, colors_a:np.ndarray, values_a:np.ndarray, colors_b:np.ndarray, values_b:np.ndarray):
+		'''
+		This method combines two sets of rows of the overview, with the frames of the first ones coming before the frames of the second ones
+
+		Returns
+		-------
+		numpy.ndarray
+			The combined rows' colors
+		numpy.ndarray
+			For the max reduction, the combined rows' largest values, otherwise None
+		'''
+
+		if (self.reduction == "mean"):
+			return (colors_a + colors_b, None)
+		elif (self.reduction == "decimate"):
+			return (colors_a, None)
+
+		larger = values_b > values_a
+		return (np.where(larger[..., np.newaxis], colors_b, colors_a), np.where(larger, values_b, values_a))
+
+	def add_rows(self, colors:np.ndarray, values:np.ndarray, counts:np.ndarray):
+		'''
+		This method adds completed rows to the overview, merging its rows in pairs whenever they fill up
+		There must be room for the rows, there always is for up to half of overview_rows
+		'''
+
+		if (self.row_colors is None):
+			self.row_colors = np.empty((self.overview_rows, *colors.shape[1 : ]), dtype=colors.dtype)
+			self.row_values = np.empty((self.overview_rows, *values.shape[1 : ]), dtype=float) if (values is not None) else None
+			self.row_counts = np.zeros(self.overview_rows, dtype=np.int64)
+
+		end = self.rows_filled + colors.shape[0]
+		self.row_colors[self.rows_filled : end] = colors
+		if (values is not None):
+			self.row_values[self.rows_filled : end] = values
+		self.row_counts[self.rows_filled : end] = counts
+		self.rows_filled = end
+
+		if (self.rows_filled == self.overview_rows):
+			# The overview is full, merge its rows in pairs so that each one stands for twice as many frames
+			half = self.overview_rows // 2
+			(colors, values) = self.combine_rows(self.row_colors[0 : : 2], self.row_values[0 : : 2] if (self.row_values is not None) else None, self.row_colors[1 : : 2], self.row_values[1 : : 2] if (self.row_values is not None) else None)
+			self.row_colors[ : half] = colors
+			if (values is not None):
+				self.row_values[ : half] = values
+			self.row_counts[ : half] = self.row_counts[0 : : 2] + self.row_counts[1 : : 2]
+			self.rows_filled = half
+			self.frames_per_row = 2 * self.frames_per_row
+
+	def add_tile_rows(self, rgb_frames:np.ndarray):
+		'''
+		This method adds full-resolution rows to the tiles, saving each tile as soon as it fills up
+		'''
+
+		position = 0
+		while (position < rgb_frames.shape[0]):
+			if (self.tile is None):
+				self.tile = np.empty((self.tile_rows, *rgb_frames.shape[1 : ]), dtype=np.uint8)
+
+			taken = min(self.tile_rows - self.tile_filled, rgb_frames.shape[0] - position)
+			self.tile[self.tile_filled : self.tile_filled + taken] = rgb_frames[position : position + taken]
+			(self.tile_filled, position) = (self.tile_filled + taken, position + taken)
+
+			if (self.tile_filled == self.tile_rows):
+				self.save_tile()
+
+	def save_tile(self):
+		'''
+		This method saves the tile that is being filled, as many rows of it as have been filled
+		'''
+
+		from PIL import Image
+
+		(root, extension) = splitext(self.filename)
+		Image.fromarray(self.tile[ : self.tile_filled]).save(f"{root}_{self.tiles_saved:04d}{extension}")
+		self.tiles_saved = self.tiles_saved + 1
+		self.tile_filled = 0
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, adding the chunk's RGB frames to the overview (and tiles)
+		'''
+
+		if ((rgb_frames is None) or (rgb_frames.shape[0] == 0)):
+			return
+
+		rgb_frames = np.asarray(rgb_frames, dtype=np.uint8)
+		if (rgb_frames.ndim != 3):
+			raise Exception(f"a contact sheet has one row per frame, so the colorized frames must have the shape (number of frames, width, 3), not {rgb_frames.shape}")
+
+		values = None
+		if (self.reduction == "max"):
+			if (frames is None):
+				raise Exception("the max reduction needs the data frames as well as the colorized frames")
+
+			# Frames with missing values (e.g. from gauges) are object arrays holding None, missing values never count as the largest
+			values = np.asarray(frames, dtype=float).reshape(rgb_frames.shape[0], -1)
+			values = np.where(np.isnan(values), -np.inf, values)
+
+		if (self.tile_rows != None):
+			self.add_tile_rows(rgb_frames)
+
+		position = 0
+		while (position < rgb_frames.shape[0]):
+			remaining = rgb_frames.shape[0] - position
+			if ((self.current_count > 0) or (remaining < self.frames_per_row)):
+				# Add frames to the row that is being filled
+				taken = min(self.frames_per_row - self.current_count, remaining)
+				(colors, row_values) = self.reduce_rows(rgb_frames[position : position + taken], values[position : position + taken] if (values is not None) else None, 1)
+				if (self.current_count > 0):
+					(colors, row_values) = self.combine_rows(self.current_colors, self.current_values, colors, row_values)
+
+				(self.current_colors, self.current_values, self.current_count) = (colors, row_values, self.current_count + taken)
+				if (self.current_count == self.frames_per_row):
+					self.add_rows(self.current_colors, self.current_values, self.current_count)
+					(self.current_colors, self.current_values, self.current_count) = (None, None, 0)
+			else:
+				# Reduce as many whole rows at once as there is room for before the overview's rows are merged
+				taken = min(remaining // self.frames_per_row, self.overview_rows - self.rows_filled) * self.frames_per_row
+				(colors, row_values) = self.reduce_rows(rgb_frames[position : position + taken], values[position : position + taken] if (values is not None) else None, taken // self.frames_per_row)
+				self.add_rows(colors, row_values, self.frames_per_row)
+
+			position = position + taken
+
+		self.count = self.count + rgb_frames.shape[0]
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, saving the overview image (and the last, partly filled tile) and keeping the overview's
+		PIL.Image object in self.image
+		'''
+
+		if (self.tile_filled > 0):
+			self.save_tile()
+
+		if ((self.row_colors is not None) or (self.current_count > 0)):
+			from PIL import Image
+
+			colors = self.row_colors[ : self.rows_filled] if (self.row_colors is not None) else self.current_colors[ : 0]
+			counts = self.row_counts[ : self.rows_filled] if (self.row_colors is not None) else np.zeros(0, dtype=np.int64)
+			if (self.current_count > 0):
+				# The last row stands for fewer frames than the others
+				colors = np.concatenate([colors, self.current_colors])
+				counts = np.concatenate([counts, [self.current_count]])
+
+			if (self.reduction == "mean"):
+				colors = np.rint(colors / counts[ : , np.newaxis, np.newaxis])
+
+			self.image = Image.fromarray(colors.astype(np.uint8))
+			self.image.save(self.filename)
+
+			(self.row_colors, self.row_values, self.row_counts) = (None, None, None)
+			(self.current_colors, self.current_values, self.current_count) = (None, None, 0)
+
+
+class VideoSink(__BaseSink__):
+	'''
+	This class defines a sink that encodes the BRG-colorized frames of a model run into a video file as they arrive, one frame of video per frame of data
+	Through trial and error, it has been determined that OpenCV (cv2) cannot create a video that is only one pixel tall, thus frames that are only one
+	pixel tall are added to the video twice
+	'''
+
+	uses_color = True
+
+	default_codec = "mp4v"
+	default_frames_per_second = 30
+
+	filename = None
+	frame_shape = None
+	codec = None
+	frames_per_second = None
+	out_video = None
+
+	def __init__(self, filename:str, frame_shape:tuple=None, codec:str=None, frames_per_second:int=None):
+		'''
+		Parameters
+		----------
+		filename : str
+			The name of the file to which this video will be saved
+		frame_shape : tuple
+			The (width, height) of a single frame of video, if not present it is worked out from the first chunk of frames
+		codec : str
+			The identifier in OpenCV (cv2) of the CODEC that will generate the frames of video; defaults to a pre-determined value
+		frames_per_second : int
+			The speed of the video that will be generated; defaults to a pre-determined value
+		'''
+
+		if (filename == None):
+			raise Exception("filename argument must be a non-empty string")
+		elif (type(filename) != str):
+			raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+		elif (filename == ""):
+			raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+		self.filename = filename
+		self.frame_shape = frame_shape
+		self.codec = codec if (codec != None) else self.default_codec
+		self.frames_per_second = frames_per_second if (frames_per_second != None) else self.default_frames_per_second
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, encoding the chunk's BRG frames into the video
+		'''
+
+		if ((brg_frames is None) or (brg_frames.shape[0] == 0)):
+			return
+
+		# For data frames that are only one pixel wide (i.e. three BRG color elements), the data frame must be added the video obect twice
+		add_twice = True if ((len(brg_frames.shape) > 2) and (brg_frames.shape[-3] > 0) and (brg_frames[0].shape[1] == 3)) else False
+
+		if (self.out_video == None):
+			# OpenCV is slow to import, so it is only imported once there is a video to write
+			import cv2
+
+			if (self.frame_shape == None):
+				self.frame_shape = (brg_frames.shape[1], 2) if (add_twice) else (brg_frames.shape[2], brg_frames.shape[1])
+
+			self.out_video = cv2.VideoWriter(self.filename, cv2.VideoWriter_fourcc(*self.codec), self.frames_per_second, self.frame_shape)
+
+		if (add_twice):
+			# Duplicate the row of every frame in the chunk at once with a broadcast view, which repeats the row without copying it
+			brg_frames = np.broadcast_to(brg_frames[ : , np.newaxis], (brg_frames.shape[0], 2, *brg_frames.shape[1 : ]))
+
+		for i in range(brg_frames.shape[0]):
+			self.out_video.write(brg_frames[i])
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, finishing and releasing the video file
+		'''
+
+		if (self.out_video != None):
+			self.out_video.release()
+			self.out_video = None
+
+
+class FrameSequenceSink(__BaseSink__):
+	'''
+	This class defines a sink that saves the BRG-colorized frames of a model run as an image sequence, one file per frame, in a folder
+	Unlike a video, every pixel is saved exactly as it was colorized (and frames that are only one pixel tall stay one pixel tall), the pixels are stored in
+	the same BRG order as the video's so that the image sequence can be used in its place
+	* png - PNG images, written by OpenCV (cv2) so that their colors match the video's
+	* raw - the frame's bytes as they are, (height, width, 3) of them with no header
+	Each chunk of frames is split into smaller chunks that are handed to a pool of threads (saving an image spends most of its time outside of the GIL), at
+	most two per thread are waiting at any time so the frames being saved never pile up in memory
+	'''
+
+	uses_color = True
+
+	image_formats = ["png", "raw"]
+	default_chunk_frames = 256
+
+	folder = None
+	image_format = None
+	workers = None
+	chunk_frames = None
+	count = 0
+	executor = None
+	pending = None
+
+	def __init__(self, folder:str, image_format:str=None, workers:int=None, chunk_frames:int=None):
+		'''
+		Parameters
+		----------
+		folder : str
+			The folder the images are saved in, it is created if it does not exist
+		image_format : str
+			The format of each image, either "png" or "raw", defaults to "png"
+		workers : int
+			The number of threads that save images concurrently, defaults to the number of cores
+		chunk_frames : int
+			The number of frames handed to a thread at a time, defaults to a pre-determined value
+		'''
+
+		if (folder == None):
+			raise Exception("folder argument must be a non-empty string")
+		elif (type(folder) != str):
+			raise Exception(f"folder argument must be a non-empty string, not an object of type {type(folder).__name__}")
+		elif (folder == ""):
+			raise Exception("folder argument must be a non-empty string, it is currently empty")
+
+		image_format = "png" if (image_format == None) else image_format
+		if (image_format not in self.image_formats):
+			raise Exception(f"if present, image_format argument must be one of {', '.join(self.image_formats)}, not {image_format}")
+
+		if ((workers != None) and ((type(workers) != int) or (workers < 1))):
+			raise Exception(f"if present, workers argument must be a positive integer, {workers} is invalid")
+
+		self.folder = folder
+		self.image_format = image_format
+		self.workers = workers if (workers != None) else (cpu_count() or 1)
+		self.chunk_frames = self.default_chunk_frames if (chunk_frames == None) else max(int(chunk_frames), 1)
+		self.count = 0
+		self.pending = []
+
+	def save_images(self, brg_frames:np.ndarray, start:int):
+		'''
+		This method saves a chunk of frames, one file per frame, it is the method that the threads run
+
+		Parameters
+		----------
+		brg_frames : numpy.ndarray
+			The chunk of frames, with shape (number of frames, height, width, 3)
+		start : int
+			The number of the chunk's first frame in the sequence
+		'''
+
+		if (self.image_format == "png"):
+			import cv2
+
+			for i in range(brg_frames.shape[0]):
+				if (not cv2.imwrite(f"{self.folder}/frame_{start + i:06d}.png", brg_frames[i])):
+					raise Exception(f"frame {start + i} could not be saved in {self.folder}")
+		else:
+			for i in range(brg_frames.shape[0]):
+				brg_frames[i].tofile(f"{self.folder}/frame_{start + i:06d}.raw")
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, handing the chunk's BRG frames to the threads
+		'''
+
+		if ((brg_frames is None) or (brg_frames.shape[0] == 0)):
+			return
+
+		if (self.executor == None):
+			makedirs(self.folder, exist_ok=True)
+			self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+		# A frame of a single row of LEDs is saved as an image that is one pixel tall
+		brg_frames = np.ascontiguousarray(brg_frames, dtype=np.uint8)
+		if (brg_frames.ndim == 3):
+			brg_frames = brg_frames[ : , np.newaxis]
+
+		for start in range(0, brg_frames.shape[0], self.chunk_frames):
+			while (len(self.pending) >= 2 * self.workers):
+				# Wait for the oldest chunk to be saved, raising any Exception that saving it raised
+				self.pending.pop(0).result()
+
+			self.pending.append(self.executor.submit(self.save_images, brg_frames[start : start + self.chunk_frames], self.count))
+			self.count = self.count + brg_frames[start : start + self.chunk_frames].shape[0]
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, waiting for every image to be saved and shutting the threads down
+		'''
+
+		if (self.executor != None):
+			try:
+				while (self.pending != []):
+					self.pending.pop(0).result()
+			finally:
+				self.executor.shutdown(wait=True, cancel_futures=True)
+				self.executor = None
+				self.pending = []
@@ -0,0 +1,109 @@
+'''
+This module measures how long it takes to import parts of this application, so that the time a run spends starting up can be tracked
+Each measurement is made in a fresh Python interpreter (nothing is imported yet), with Python's own -X importtime report used to break the time down
+Command line call -- python -m led.src.startup [<<module name>> ...]
+'''
+
+import json
+import sys
+
+from os import environ, pathsep
+from subprocess import run
+from time import perf_counter
+
+# Define a set of defaults used by the next functions
+default_modules = ["led.src.actions", "led.src.storage", "led.src.sinks", "led.src.ledmodels", "led.src.signalgenerators"]
+heavy_modules = ["cv2", "matplotlib", "PIL"]
+
+def measure_import(module_name:str):
+	'''
+	This function imports a module in a fresh Python interpreter and reports how long the import took and which of the slow-to-import libraries it loaded
+
+	Parameters
+	----------
+	module_name : str
+		The dotted name of the module to import, e.g. led.src.actions
+
+	Returns
+	-------
+	dict
+		A dict with the following items
+		* "module" : str - module_name
+		* "import_seconds" : float - the time Python reports for importing module_name and everything it imports
+		* "total_seconds" : float - the wall time of the whole interpreter run, including the interpreter's own start up
+		* "heavy_modules" : list[str] - the members of heavy_modules that were loaded by the import
+		* "slowest" : list[dict] - the ten packages that took the longest to import on their own, each with its "package" name and "seconds"
+	'''
+
+	if (module_name == None):
+		raise Exception("module_name argument must be a non-empty string")
+	elif (type(module_name) != str):
+		raise Exception(f"module_name argument must be a non-empty string, not an object of type {type(module_name).__name__}")
+	elif (module_name == ""):
+		raise Exception("module_name argument must be a non-empty string, it is currently empty")
+
+	# The fresh interpreter must be able to find the led package the same way this one does
+	environment = dict(environ)
+	environment["PYTHONPATH"] = pathsep.join([path for path in sys.path if (path != "")])
+
+	# After the import, the fresh interpreter prints which heavy modules ended up loaded as its only line of standard output
+	script = f"import sys, json, {module_name}; print(json.dumps([name for name in {heavy_modules} if (name in sys.modules)]))"
+
+	start = perf_counter()
+	completed = run([sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True, env=environment)
+	total_seconds = perf_counter() - start
+
+	if (completed.returncode != 0):
+		raise Exception(f"module {module_name} could not be imported:\n{completed.stderr[-2000 : ]}")
+
+	# Each -X importtime line is "import time: <self microseconds> | <cumulative microseconds> | <indented package name>"
+	# Only packages that are not indented were imported directly by the script, their cumulative times add up to the whole import
+	top_level = {}
+	self_times = {}
+	for line in completed.stderr.splitlines():
+		fields = line.split("|")
+		if ((len(fields) != 3) or (not fields[0].startswith("import time:")) or (not fields[1].strip().isdigit())):
+			continue
+
+		package = fields[2][1 : ]
+		self_times[package.strip()] = int(fields[0][len("import time:") : ]) / 1000000.0
+		if (not package.startswith(" ")):
+			top_level[package] = int(fields[1]) / 1000000.0
+
+	slowest = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[ : 10]
+
+	return {
+		"module": module_name,
+		"import_seconds": top_level.get(module_name, sum(top_level.values())),
+		"total_seconds": total_seconds,
+		"heavy_modules": json.loads(completed.stdout.strip().splitlines()[-1]),
+		"slowest": [{"package": package, "seconds": seconds} for (package, seconds) in slowest],
+	}
+
+
+def measure_startup(module_names:list=None):
+	'''
+	This function measures the import of each of a set of modules, see measure_import
+
+	Parameters
+	----------
+	module_names : list[str]
+		The dotted names of the modules to measure, defaults to the modules a model run imports
+
+	Returns
+	-------
+	list[dict]
+		One measurement per module, in the same order as module_names
+	'''
+
+	if (module_names == None):
+		module_names = default_modules
+	elif (type(module_names) != list):
+		raise Exception(f"if present, module_names argument must be a list of strings, not an object of type {type(module_names).__name__}")
+
+	return [measure_import(module_name) for module_name in module_names]
+
+
+if (__name__ == "__main__"):
+	# This module was invoked directly, measure the modules named on the command line (or the default set) and print the results as JSON
+	print(json.dumps(measure_startup(sys.argv[1 : ] if (len(sys.argv) > 1) else None), indent=4))
@@ -0,0 +1,677 @@
+import json
+import numpy as np
+
+from io import BytesIO
+from itertools import islice
+from os.path import splitext
+
+from led.src.baseclasses import FrameSink as __BaseSink__
+
+# Define a set of defaults used by the next functions
+csv_chunk_bytes = 4194304
+
+def check_filename(filename:str):
+	'''
+	This function raises an Exception if filename is not a non-empty string
+
+	Parameters
+	----------
+	filename : str
+		The path/name of a file
+	'''
+
+	if (filename == None):
+		raise Exception("filename argument must be a non-empty string")
+	elif (type(filename) != str):
+		raise Exception(f"filename argument must be a non-empty string, not an object of type {type(filename).__name__}")
+	elif (filename == ""):
+		raise Exception("filename argument must be a non-empty string, it is currently empty")
+
+
+def iterate_json_list(filename:str, chunk_characters:int=1048576):
+	'''
+	This generator function reads a JSON-formatted list file and yields its items one at a time, reading the file in chunks instead of all at once
+	This keeps the memory needed to read a huge list (e.g. a frames file or a long recorded signal) down to one item and one chunk of the file
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the JSON-formatted list file
+	chunk_characters : int
+		The number of characters read from the file at a time
+
+	Yields
+	------
+	any
+		Each item in the list, in order
+	'''
+
+	decoder = json.JSONDecoder()
+
+	with open(filename, "r") as file_in:
+		buffer = ""
+		position = 0
+		end_of_file = False
+		started = False
+
+		while (True):
+			# Skip over whitespace and, once inside the list, the commas between items
+			while ((position < len(buffer)) and (buffer[position] in (" \t\r\n," if (started) else " \t\r\n"))):
+				position = position + 1
+
+			complete = position < len(buffer)
+			if (complete):
+				if (not started):
+					if (buffer[position] != "["):
+						raise Exception(f"{filename} must contain a JSON-formatted list")
+
+					started = True
+					position = position + 1
+					continue
+				elif (buffer[position] == "]"):
+					return
+
+				try:
+					(item, end) = decoder.raw_decode(buffer, position)
+
+					# An item is only complete once the character after it is known to end it, otherwise a number cut off at the end of the buffer
+					# (e.g. "3e" of "3e-07") would be decoded as just the part of it that has been read so far
+					complete = (end_of_file) or ((end < len(buffer)) and (buffer[end] in " \t\r\n,]"))
+				except json.JSONDecodeError:
+					if (end_of_file):
+						raise
+
+					complete = False
+
+			if (not complete):
+				# The next item runs past the end of what has been read so far, drop what has already been used and read another chunk
+				if (end_of_file):
+					raise Exception(f"{filename} ended before the end of its JSON-formatted list")
+
+				more = file_in.read(chunk_characters)
+				end_of_file = more == ""
+				buffer = buffer[position : ] + more
+				position = 0
+				continue
+
+			position = end
+			yield item
+
+
+def frames_to_json_list(frames:np.ndarray):
+	'''
+	This function converts a set of data frames to nested lists that can be written as JSON, with None (null) in place of every NaN
+	Frames of gauges hold NaN wherever a gauge has no value, and JSON has no NaN, json.dump would write a bare NaN token that is not valid JSON
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The set of frames
+
+	Returns
+	-------
+	list
+		The frames as nested lists of numbers and None values
+	'''
+
+	frames = np.asarray(frames)
+	if ((frames.dtype.kind in "fc") and (np.isnan(frames).any())):
+		return np.where(np.isnan(frames), None, frames.astype(object)).tolist()
+
+	return frames.tolist()
+
+
+class BinaryFramesWriter(__BaseSink__):
+	'''
+	This class defines a writer that appends data frames to a binary NumPy (.npy) file as they are produced, so a model run never has to hold them all
+	It is also a sink, so it can be handed to led.src.actions.run_model to record the frames of a run while the model is running
+	The frame count in the file's header is kept up to date every time frames are written, so the file can be loaded with load_frames (as a memory-mapped
+	array) at any time, even while the run is still going
+	The file is created as soon as the frame shape and data type are known (when this object is initialized if both are given), and a writer closed before
+	any frames were written still leaves a valid file holding no frames
+	'''
+
+	# The number of digits reserved for the frame count in the file's header, so that the header never changes size when it is re-written
+	count_digits = 20
+
+	filename = None
+	frame_shape = None
+	dtype = None
+	count = 0
+	file_out = None
+	closed = False
+
+	def __init__(self, filename:str, frame_shape:tuple=None, dtype:any=None):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the .npy file to which the frames will be written
+		frame_shape : tuple
+			The shape of a single frame, if not present it is taken from the first frames written
+		dtype : any
+			The numpy data type the frames are stored as, if not present it is taken from the first frames written
+			Frames holding None values (e.g. from gauges) are stored as floats with NaN in place of None
+		'''
+
+		check_filename(filename)
+
+		self.filename = filename
+		self.frame_shape = tuple(frame_shape) if (frame_shape != None) else None
+		self.dtype = np.dtype(dtype) if (dtype is not None) else None
+		self.count = 0
+
+		if ((self.frame_shape != None) and (self.dtype is not None)):
+			self.start()
+
+	def header(self):
+		'''
+		This method builds the .npy file header for the frames written so far, always with the same length
+
+		Returns
+		-------
+		bytes
+			The header, including the .npy magic string and version
+		'''
+
+		shape = "".join([f", {dimension}" for dimension in self.frame_shape]) + ("," if (len(self.frame_shape) == 0) else "")
+		header = "{{'descr': {}, 'fortran_order': False, 'shape': ({:{}d}{}), }}".format(repr(np.lib.format.dtype_to_descr(self.dtype)), self.count, self.count_digits, shape)
+
+		# The .npy format pads its header with spaces and a newline so that the data starts on a 64-byte boundary
+		header_bytes = header.encode("latin1")
+		padding = (-(10 + len(header_bytes) + 1)) % 64
+		header_bytes = header_bytes + (b" " * padding) + b"\n"
+
+		return b"\x93NUMPY\x01\x00" + len(header_bytes).to_bytes(2, "little") + header_bytes
+
+	def start(self):
+		'''
+		This method creates the file and writes its header, once the frame shape and data type are known
+		'''
+
+		self.file_out = open(self.filename, "wb")
+		self.file_out.write(self.header())
+		self.file_out.flush()
+
+	def append(self, frames:np.ndarray):
+		'''
+		This method appends a block of frames to the end of the file
+
+		Parameters
+		----------
+		frames : numpy.ndarray
+			The block of frames to be written, with shape (number of frames, *frame shape)
+		'''
+
+		frames = np.asarray(frames)
+		if (frames.dtype == object):
+			frames = frames.astype(float)
+
+		if (self.file_out == None):
+			# This is the first block of frames, work out anything that was not given when this object was initialized and start the file
+			if (self.frame_shape == None):
+				self.frame_shape = tuple(frames.shape[1 : ])
+			if (self.dtype is None):
+				self.dtype = frames.dtype
+
+			self.start()
+
+		if (tuple(frames.shape[1 : ]) != tuple(self.frame_shape)):
+			raise Exception(f"frames written to {self.filename} must have the shape {self.frame_shape}, not {frames.shape[1 : ]}")
+
+		self.file_out.write(np.ascontiguousarray(frames, dtype=self.dtype).tobytes())
+		self.count = self.count + frames.shape[0]
+
+		# Re-write the header with the new frame count and go back to the end of the file
+		self.file_out.seek(0)
+		self.file_out.write(self.header())
+		self.file_out.seek(0, 2)
+		self.file_out.flush()
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, appending the chunk's data frames to the file
+		'''
+
+		if (frames is not None):
+			self.append(frames)
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, closing the file
+		If no frames were ever written, the file is still created, holding no frames (of shape () and type float if neither was known)
+		'''
+
+		if ((self.file_out == None) and (not self.closed)):
+			self.frame_shape = self.frame_shape if (self.frame_shape != None) else ()
+			self.dtype = self.dtype if (self.dtype is not None) else np.dtype(float)
+			self.start()
+
+		if (self.file_out != None):
+			self.file_out.close()
+			self.file_out = None
+
+		self.closed = True
+
+
+class TimeSeriesWriter(__BaseSink__):
+	'''
+	This class defines a writer that appends the time series of a model run to a file as it is produced, instead of dumping one giant JSON list at the end
+	It is also a sink, so it can be handed to led.src.actions.run_model to record the time series of a run while the model is running
+	The format depends on the file's extension
+	* .ndjson or .jsonl - newline-delimited JSON, one value (or, for gauges, one list of values) per line
+	* .npy - a typed binary column of floats that can be loaded as a memory-mapped array, missing (None) values are stored as NaN
+	'''
+
+	filename = None
+	binary_writer = None
+	file_out = None
+	count = 0
+
+	def __init__(self, filename:str):
+		'''
+		Parameters
+		----------
+		filename : str
+			The path/name of the file to which the time series will be written, it must end with .ndjson, .jsonl or .npy
+		'''
+
+		check_filename(filename)
+
+		extension = splitext(filename)[1].lower()
+		if (extension == ".npy"):
+			self.binary_writer = BinaryFramesWriter(filename, dtype=float)
+		elif (extension in [".ndjson", ".jsonl"]):
+			self.file_out = open(filename, "w")
+		else:
+			raise Exception(f"filename argument must end with .ndjson, .jsonl or .npy to be written as a streaming time series, {filename} does not")
+
+		self.filename = filename
+		self.count = 0
+
+	def append(self, time_series:list):
+		'''
+		This method appends a block of time series values to the end of the file
+
+		Parameters
+		----------
+		time_series : list[any]
+			The block of values, either numbers or (for gauges) lists of numbers
+		'''
+
+		if (len(time_series) == 0):
+			return
+
+		if (self.binary_writer != None):
+			self.binary_writer.append(np.asarray(time_series, dtype=float))
+		else:
+			self.file_out.write("".join([json.dumps(value) + "\n" for value in time_series]))
+			self.file_out.flush()
+
+		self.count = self.count + len(time_series)
+
+	def write(self, frames:any=None, rgb_frames:any=None, brg_frames:any=None, time_series:list=None):
+		'''
+		This method overrides the same method from the superclass, appending the chunk's time series values to the file
+		'''
+
+		if (time_series != None):
+			self.append(list(time_series))
+
+	def close(self):
+		'''
+		This method overrides the same method from the superclass, closing the file
+		'''
+
+		if (self.binary_writer != None):
+			self.binary_writer.close()
+
+		if (self.file_out != None):
+			self.file_out.close()
+			self.file_out = None
+
+
+def iterate_time_series(filename:str):
+	'''
+	This generator function lazily reads a time series file in any of the formats written by led.src.actions.save_time_series and yields one record at a time
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the time series file, its format is determined from its extension (.ndjson, .jsonl, .npy or .json)
+
+	Yields
+	------
+	any
+		Each value (or, for gauges, each list of values) in the time series, in order
+		Values read from a .npy column are floats, with NaN where the original value was None
+	'''
+
+	check_filename(filename)
+
+	extension = splitext(filename)[1].lower()
+	if (extension in [".ndjson", ".jsonl"]):
+		with open(filename, "r") as file_in:
+			for line in file_in:
+				if (line.strip() != ""):
+					yield json.loads(line)
+	elif (extension == ".npy"):
+		column = np.load(filename, mmap_mode="r")
+		for start in range(0, column.shape[0], 4096):
+			yield from column[start : start + 4096].tolist()
+	else:
+		yield from iterate_json_list(filename)
+
+
+def load_time_series_column(filename:str):
+	'''
+	This function memory-maps a time series saved as a typed binary column (.npy), so none of it is read until it is used
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the .npy time series file
+
+	Returns
+	-------
+	numpy.ndarray
+		A read-only memory-mapped array of shape (number of samples, ) or, for gauges, (number of samples, number of gauges)
+	'''
+
+	check_filename(filename)
+
+	if (splitext(filename)[1].lower() != ".npy"):
+		raise Exception(f"only .npy time series files can be memory-mapped, {filename} is not one")
+
+	return np.load(filename, mmap_mode="r")
+
+
+def split_csv_header(data:bytes, column:any, filename:str):
+	'''
+	This function works out which column of a CSV file to read from the start of the file, and takes the header row off of it if there is one
+	The first row is a header row if the column is given by name, or if it does not hold a number (or an empty field) in the column
+
+	Parameters
+	----------
+	data : bytes
+		The start of the file, made of whole lines, it must hold at least one line that is not blank
+	column : any
+		The column to read, either its zero-based position (int) or its name in the header row (str)
+	filename : str
+		The path/name of the CSV file, used in error messages
+
+	Returns
+	-------
+	int
+		The zero-based position of the column
+	bytes
+		data without its header row
+	'''
+
+	start = len(data) - len(data.lstrip())
+	end = data.find(b"\n", start)
+	end = len(data) if (end < 0) else end + 1
+	fields = [field.strip(b" \"'\r\n").decode("utf-8", errors="replace") for field in data[start : end].split(b",")]
+
+	if (type(column) == str):
+		# The column was given by name, so the first row must be a header row that holds it
+		if (column not in fields):
+			raise Exception(f"column argument {column} is not one of the columns in the header row of {filename}")
+
+		return (fields.index(column), data[end : ])
+
+	if (column >= len(fields)):
+		raise Exception(f"column argument {column} is beyond the last column of {filename}")
+
+	try:
+		float(fields[column]) if (fields[column] != "") else None
+	except ValueError:
+		# The first row is a header row, skip it
+		return (column, data[end : ])
+
+	return (column, data)
+
+
+def parse_csv_column(data:bytes, index:int, filename:str):
+	'''
+	This function parses one column of numbers out of a chunk of whole CSV lines in one vectorized pass
+	numpy's C parser reads the chunk when every row is complete, rows with empty or missing fields are split apart instead and their fields converted
+	to floats all at once
+
+	Parameters
+	----------
+	data : bytes
+		The chunk of lines, without a header row
+	index : int
+		The zero-based position of the column
+	filename : str
+		The path/name of the CSV file, used in error messages
+
+	Returns
+	-------
+	numpy.ndarray
+		The column's values as a one-dimensional array of floats, empty and missing fields are NaN
+	'''
+
+	if (data.strip() == b""):
+		return np.empty(0, dtype=float)
+
+	try:
+		return np.loadtxt(BytesIO(data), dtype=float, delimiter=",", usecols=index, comments=None, quotechar='"', ndmin=1)
+	except ValueError:
+		pass
+
+	lines = [line.split(b",") for line in data.split(b"\n") if (line.strip() != b"")]
+	fields = [line[index].strip(b" \"'\r") if (index < len(line)) else b"" for line in lines]
+	fields = np.array([field if (field != b"") else b"nan" for field in fields], dtype=bytes)
+
+	try:
+		return fields.astype(float)
+	except ValueError:
+		raise Exception(f"{filename} holds at least one value in column {index} that is not a number")
+
+
+def iterate_csv_column(filename:str, column:any=None, values_per_block:int=65536):
+	'''
+	This generator function reads one column of numbers out of a CSV file and yields them a block at a time
+	The file is read in large chunks of whole lines, each of which is parsed in one vectorized pass (see parse_csv_column)
+	If the first row does not hold a number in the column, it is taken to be a header row
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the CSV file
+	column : any
+		The column to read, either its zero-based position (int) or its name in the header row (str), defaults to the first column
+	values_per_block : int
+		The largest number of values in each block
+
+	Yields
+	------
+	numpy.ndarray
+		Each block of values as a one-dimensional array of floats, empty fields are NaN
+	'''
+
+	check_filename(filename)
+
+	if (column == None):
+		column = 0
+	elif (type(column) not in [int, str]):
+		raise Exception(f"if present, column argument must be an int or a str, not an object of type {type(column).__name__}")
+
+	with open(filename, "rb") as file_in:
+		index = None
+		remainder = b""
+		while (True):
+			data = file_in.read(csv_chunk_bytes)
+			end_of_file = data == b""
+
+			# Only whole lines are parsed, the part of a line at the end of the chunk is kept for the next one
+			data = remainder + data
+			remainder = b""
+			if (not end_of_file):
+				cut = data.rfind(b"\n") + 1
+				(data, remainder) = (data[ : cut], data[cut : ])
+
+			if ((index == None) and (data.strip() != b"")):
+				(index, data) = split_csv_header(data, column, filename)
+
+			if (index != None):
+				values = parse_csv_column(data, index, filename)
+				for start in range(0, values.shape[0], values_per_block):
+					yield values[start : start + values_per_block]
+
+			if (end_of_file):
+				return
+
+
+def iterate_signal_blocks(filename:str, column:any=None, values_per_block:int=65536):
+	'''
+	This generator function reads a recorded signal out of a text file and yields its values a block at a time, without ever loading the whole file
+	The format depends on the file's extension
+	* .csv - one column of a CSV file (see iterate_csv_column)
+	* .ndjson or .jsonl - one value per line
+	* anything else - a JSON-formatted list of values
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the signal file
+	column : any
+		For a CSV file, the column to read (see iterate_csv_column), ignored for every other format
+	values_per_block : int
+		The number of values in each block
+
+	Yields
+	------
+	numpy.ndarray
+		Each block of values as a one-dimensional array of floats, missing (None) values are NaN
+	'''
+
+	check_filename(filename)
+
+	if (splitext(filename)[1].lower() == ".csv"):
+		yield from iterate_csv_column(filename, column, values_per_block)
+		return
+
+	values = iterate_time_series(filename)
+	while (True):
+		block = [np.nan if (value == None) else value for value in islice(values, values_per_block)]
+		if (len(block) == 0):
+			return
+
+		try:
+			yield np.array(block, dtype=float)
+		except (TypeError, ValueError):
+			raise Exception(f"{filename} must only contain numbers, it holds at least one value that is not a number")
+
+
+def save_frames_binary(frames:np.ndarray, filename:str):
+	'''
+	This function saves a whole set of data frames to a binary file, the format depends on the file's extension
+	* .npy - a plain NumPy array file that can be loaded as a memory-mapped array
+	* .npz - a compressed NumPy archive holding the frames as "frames"
+	* .rle - a run-length and delta encoded frames file, for mostly static runs (see led.src.deltaframes)
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The set of frames that contain the values from an LED model for a series of time-varying data
+	filename : str
+		The path/name of the file to which frames will be written
+	'''
+
+	check_filename(filename)
+
+	extension = splitext(filename)[1].lower()
+	if (extension == ".npy"):
+		writer = BinaryFramesWriter(filename, tuple(frames.shape[1 : ]))
+		writer.append(frames)
+		writer.close()
+	elif (extension == ".npz"):
+		np.savez_compressed(filename, frames=(frames.astype(float) if (frames.dtype == object) else frames))
+	elif (extension == ".rle"):
+		# Imported here, led.src.deltaframes depends on this module
+		from led.src.deltaframes import save_frames_delta
+		save_frames_delta(frames, filename)
+	else:
+		raise Exception(f"filename argument must end with .npy, .npz or .rle to be saved as a binary frames file, {filename} does not")
+
+
+def load_frames(filename:str, memory_map:bool=True):
+	'''
+	This function loads a set of data frames saved by led.src.actions.save_frames in any of its formats
+
+	Parameters
+	----------
+	filename : str
+		The path/name of the frames file, its format is determined from its extension (.npy, .npz, .rle or .json)
+	memory_map : bool
+		Whether a .npy file is loaded as a read-only memory-mapped array (the default) instead of being read into memory, and whether a .rle file is
+		loaded as a lazy led.src.deltaframes.DeltaFrames view, which decodes frames as they are indexed, instead of being decoded into memory
+
+	Returns
+	-------
+	numpy.ndarray
+		The set of frames (a led.src.deltaframes.DeltaFrames view for a memory-mapped .rle file)
+	'''
+
+	check_filename(filename)
+
+	return_frames = None
+
+	extension = splitext(filename)[1].lower()
+	if (extension == ".npy"):
+		return_frames = np.load(filename, mmap_mode=("r" if (memory_map) else None))
+	elif (extension == ".npz"):
+		with np.load(filename) as archive:
+			return_frames = archive["frames"]
+	elif (extension == ".rle"):
+		from led.src.deltaframes import DeltaFrames
+		return_frames = DeltaFrames(filename)
+		if (not memory_map):
+			return_frames = return_frames[ : ]
+	else:
+		with open(filename, "r") as file_in:
+			return_frames = np.array(json.load(file_in))
+
+	return return_frames
+
+
+def convert_json_frames(json_filename:str, binary_filename:str, frames_per_block:int=4096):
+	'''
+	This function converts a JSON-formatted frames file (as written by earlier versions of led.src.actions.save_frames) to a binary .npy frames file
+	The JSON file is read a frame at a time and written a block of frames at a time, so it never has to be loaded into memory all at once
+
+	Parameters
+	----------
+	json_filename : str
+		The path/name of the JSON-formatted frames file
+	binary_filename : str
+		The path/name of the .npy file to be written
+	frames_per_block : int
+		The number of frames gathered before they are written to the .npy file
+
+	Returns
+	-------
+	int
+		The number of frames converted
+	'''
+
+	check_filename(json_filename)
+	check_filename(binary_filename)
+
+	writer = BinaryFramesWriter(binary_filename)
+	block = []
+	for frame in iterate_json_list(json_filename):
+		block.append(frame)
+		if (len(block) >= frames_per_block):
+			writer.append(np.array(block, dtype=float))
+			block = []
+
+	if ((block != []) or (writer.count == 0)):
+		writer.append(np.array(block, dtype=float))
+
+	writer.close()
+
+	return writer.count
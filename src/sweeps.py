@@ -0,0 +1,298 @@
+'''
+This module runs many variants of the same project (a parameter "sweep"), e.g. quarterwave across wavelengths, amplitudes and phases, or repeater across
+scaling factors
+Every combination of the values in a parameter grid becomes one job, and the jobs are spread across worker processes (one per core by default) that each
+pay the interpreter and import start-up only once
+Each job runs the project's own main() with the command-line arguments it would have been given by led.bat, so it is configured by exactly the same
+Configuration object, and each variant's outputs are written under a name that is unique to its combination of parameters
+Command line call -- python -m led.src.sweeps <<sweep file>> [<<number of workers>>]
+'''
+
+import importlib.util
+import json
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from os import cpu_count
+from os.path import abspath, splitext
+from pathlib import Path
+from time import perf_counter
+
+from led.src.video import video_modes
+
+# The destination file arguments shared by every project's configuration (see led.src.baseclasses.Configuration), each one mapped to the name of the
+# module-level default in the project's main.py that the unique per-job file name is built from
+output_arguments = {
+	"--time_series": "default_time_series_file",
+	"--frames": "default_frames_file",
+	"--image": "default_image_file",
+	"--video": "default_video_file",
+}
+
+# The spellings of the video output mode argument (see led.src.baseclasses.Configuration), which changes the extension of the video file
+video_mode_arguments = ["--video-mode", "--video_mode", "--videomode"]
+
+def expand_grid(grid:dict):
+	'''
+	This function expands a parameter grid into the list of every combination of its values
+
+	Parameters
+	----------
+	grid : dict
+		The command-line arguments being swept (e.g. "-w"), each one mapped to the list of values that it takes
+
+	Returns
+	-------
+	list[dict]
+		One dict per combination, mapping each argument to a single value, in the order that itertools.product generates them
+	'''
+
+	if (grid == None):
+		raise Exception("grid argument must be a dict of lists")
+	elif (type(grid) != dict):
+		raise Exception(f"grid argument must be a dict of lists, not an object of type {type(grid).__name__}")
+
+	for (argument, values) in grid.items():
+		if ((type(values) != list) or (len(values) == 0)):
+			raise Exception(f"the values of grid argument {argument} must be a non-empty list")
+
+	return [dict(zip(grid.keys(), combination)) for combination in product(*grid.values())]
+
+
+def job_label(combination:dict):
+	'''
+	This function builds the part of a job's file names that is unique to its combination of parameters, e.g. "w20_a1.5" for {"-w": 20, "-a": 1.5}
+
+	Parameters
+	----------
+	combination : dict
+		The command-line arguments being swept, each one mapped to this job's value
+
+	Returns
+	-------
+	str
+		The label, which only contains characters that are safe in a file name
+	'''
+
+	parts = []
+	for (argument, value) in combination.items():
+		text = f"{argument.lstrip('-')}{value if (type(value) != bool) else ''}"
+		parts.append("".join([character if (character.isalnum() or (character in ".-")) else "-" for character in text]))
+
+	return "_".join(parts)
+
+
+def command_line(arguments:dict):
+	'''
+	This function converts a dict of command-line arguments into the list of strings that the project's argument parser expects
+
+	Parameters
+	----------
+	arguments : dict
+		Each argument (e.g. "-w") mapped to its value, a value of True is a flag that is given without a value and a value of False or None is left out
+
+	Returns
+	-------
+	list[str]
+		The command-line arguments
+	'''
+
+	return_arguments = []
+	for (argument, value) in arguments.items():
+		if ((value == None) or (value is False)):
+			continue
+
+		return_arguments.append(argument)
+		if (value is not True):
+			return_arguments.append(str(value))
+
+	return return_arguments
+
+
+def load_module(name:str, filename:Path):
+	'''
+	This function imports a Python file as a module with the given name
+	'''
+
+	specification = importlib.util.spec_from_file_location(name, filename)
+	module = importlib.util.module_from_spec(specification)
+	sys.modules[name] = module
+	specification.loader.exec_module(module)
+
+	return module
+
+
+def run_job(project_folder:str, arguments:list):
+	'''
+	This function runs a project's main() once, as if it had been called by led.bat with the given command-line arguments
+	It is the function that the worker processes run for every job, a job whose arguments are rejected by the project's configuration raises an Exception
+	holding the configuration's errors, like any other job that fails
+
+	Parameters
+	----------
+	project_folder : str
+		The folder of the project, holding its main.py and configuration.py
+	arguments : list[str]
+		The command-line arguments that follow the project folder
+
+	Returns
+	-------
+	float
+		The wall time that the job took
+	'''
+
+	start = perf_counter()
+
+	# The project's main.py imports "configuration" as a top-level module, so that name must point at this project's configuration.py, even if the same
+	# worker process ran a different project before
+	project_path = Path(project_folder)
+	configuration_module = load_module("configuration", project_path / "configuration.py")
+
+	# A project's main() only prints the errors of a configuration that rejected its arguments and returns, so the configurations it builds are recorded
+	# to tell whether the job actually ran (the configuration module was just loaded for this job, so wrapping its class's initialization only affects it)
+	configurations = []
+	project_initialization = configuration_module.Configuration.__init__
+
+	def recorded_initialization(configuration:any, **kwargs):
+		project_initialization(configuration, **kwargs)
+		configurations.append(configuration)
+
+	configuration_module.Configuration.__init__ = recorded_initialization
+	main_module = load_module(f"sweep_{project_path.name}_main", project_path / "main.py")
+
+	saved_argv = sys.argv
+	sys.argv = [str(project_path / "main.py"), project_folder, *arguments]
+	try:
+		main_module.main()
+	finally:
+		sys.argv = saved_argv
+
+	for configuration in configurations:
+		if (not configuration.configured):
+			raise Exception(f"the project's configuration rejected the job's arguments: {'; '.join(configuration.errors)}")
+
+	return perf_counter() - start
+
+
+def sweep_jobs(project_folder:str, grid:dict, arguments:dict=None):
+	'''
+	This function builds the set of jobs for a parameter sweep
+
+	Parameters
+	----------
+	project_folder : str
+		The folder of the project being swept
+	grid : dict
+		The command-line arguments being swept, each one mapped to the list of values that it takes
+	arguments : dict
+		Optional command-line arguments shared by every job, each one mapped to its value (see command_line)
+
+	Returns
+	-------
+	list[dict]
+		One job per combination of the values in grid, each with a unique "label", its "parameters" and its full list of command-line "arguments"
+		Every job is headless and writes its outputs to files whose names end in its label
+	'''
+
+	project_path = Path(project_folder)
+	if (not (project_path / "main.py").is_file()):
+		raise Exception(f"project_folder argument {project_folder} must be a folder holding a project's main.py")
+
+	if (arguments == None):
+		arguments = {}
+	elif (type(arguments) != dict):
+		raise Exception(f"if present, arguments argument must be a dict, not an object of type {type(arguments).__name__}")
+
+	# Read the default output file names out of the project's main.py without running it, so that each job's names can be built from them
+	defaults = {}
+	with open(project_path / "main.py") as file_in:
+		for line in file_in:
+			for (argument, default_name) in output_arguments.items():
+				if (line.startswith(f"{default_name} = ")):
+					defaults[argument] = line.split("=", 1)[1].strip().strip("\"'")
+
+	return_jobs = []
+	for combination in expand_grid(grid):
+		label = job_label(combination)
+
+		job_arguments = dict(arguments)
+		job_arguments.update(combination)
+		job_arguments["--headless"] = True
+		# A job's video is saved with the extension of its video output mode (an image sequence in a folder with no extension), if it has one
+		video_mode = ([job_arguments[argument] for argument in video_mode_arguments if (argument in job_arguments)] + [None])[0]
+		for (argument, default_file) in defaults.items():
+			(root, extension) = splitext(default_file)
+			if ((argument == "--video") and (video_mode in video_modes)):
+				extension = video_modes[video_mode]["extension"]
+
+			job_arguments[argument] = f"{root}_{label}{extension}"
+
+		return_jobs.append({"label": label, "parameters": combination, "arguments": command_line(job_arguments)})
+
+	return return_jobs
+
+
+def run_sweep(project_folder:str, grid:dict, arguments:dict=None, workers:int=None):
+	'''
+	This function runs every combination of a parameter grid through a project, spreading the jobs across a pool of worker processes
+
+	Parameters
+	----------
+	project_folder : str
+		The folder of the project being swept
+	grid : dict
+		The command-line arguments being swept, each one mapped to the list of values that it takes
+	arguments : dict
+		Optional command-line arguments shared by every job, each one mapped to its value
+	workers : int
+		The number of worker processes, defaults to the number of cores
+
+	Returns
+	-------
+	dict
+		The report of the sweep, holding its "project", "workers", "total_seconds" and one element of "jobs" per job (in the order the jobs were built)
+		with the job's "label", "parameters", "arguments", "seconds" and "error" (None for a job that ran without an Exception)
+	'''
+
+	project_folder = abspath(project_folder)
+	jobs = sweep_jobs(project_folder, grid, arguments)
+	workers = cpu_count() if (workers == None) else max(int(workers), 1)
+
+	start = perf_counter()
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = {executor.submit(run_job, project_folder, job["arguments"]): job for job in jobs}
+
+		for future in as_completed(futures):
+			job = futures[future]
+			try:
+				job["seconds"] = future.result()
+				job["error"] = None
+			except BaseException as e:
+				# A job that fails (including one whose arguments were rejected by the project's configuration) does not stop the rest of the sweep
+				job["seconds"] = None
+				job["error"] = f"{type(e).__name__}: {e}"
+
+			print(f"{job['label']:<40} {'FAILED - ' + job['error'] if (job['error'] != None) else format(job['seconds'], '.3f') + ' s'}")
+
+	return {
+		"project": project_folder,
+		"workers": workers,
+		"total_seconds": perf_counter() - start,
+		"jobs": jobs,
+	}
+
+
+if (__name__ == "__main__"):
+	# This module was invoked directly, run the sweep described by a JSON-formatted sweep file and print the report as JSON
+	# The sweep file is an object with a "project" folder, a "grid" object and an optional "arguments" object, e.g.
+	# {"project": "quarterwave", "arguments": {"-l": 300}, "grid": {"-w": [20, 40, 80], "-a": [1.0, 2.0]}}
+	if (len(sys.argv) < 2):
+		print("ERROR - A sweep file is required, e.g. python -m led.src.sweeps sweep.json")
+		sys.exit(1)
+
+	with open(sys.argv[1]) as file_in:
+		sweep = json.load(file_in)
+
+	report = run_sweep(sweep["project"], sweep["grid"], sweep.get("arguments"), int(sys.argv[2]) if (len(sys.argv) > 2) else None)
+	print(json.dumps(report, indent=4))
@@ -0,0 +1,259 @@
+'''
+This module encodes long videos in parallel
+The frames are split into segments that are encoded concurrently in worker processes, each segment into its own video file, and the segment files are
+then joined into one video by FFmpeg's concat demuxer, which copies the encoded frames as they are (no second, lossy encoding pass)
+The FFmpeg executable is found on the PATH or, failing that, from the optional imageio-ffmpeg package; without one, videos are encoded in a single process
+It also defines the video output modes, the lossy mp4v video used so far, lossless FFV1 and PNG-codec videos and lossless PNG or raw image sequences
+'''
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count, remove
+from os.path import abspath, dirname, join, splitext
+from shutil import which
+from subprocess import run
+from tempfile import TemporaryDirectory
+
+from led.src.sinks import FrameSequenceSink, VideoSink
+
+# The video output modes, each one either a video CODEC in OpenCV (cv2) and the extension of the container it is saved in, or the format of an image
+# sequence saved as one file per frame in a folder
+# mp4v is lossy, its compression bleeds the colors of neighbouring LEDs together, every other mode keeps each pixel exactly as it was colorized
+video_modes = {
+	"mp4v": {"codec": "mp4v", "extension": ".mp4", "lossless": False},
+	"ffv1": {"codec": "FFV1", "extension": ".mkv", "lossless": True},
+	"png": {"codec": "png ", "extension": ".mov", "lossless": True},
+	"png-sequence": {"image_format": "png", "extension": "", "lossless": True},
+	"raw-sequence": {"image_format": "raw", "extension": "", "lossless": True},
+}
+
+# Define a set of defaults used by the next functions
+default_video_mode = "mp4v"
+default_segment_frames = 2048
+
+def video_mode_filename(filename:str, mode:str):
+	'''
+	This function changes the extension of a video file name to the one used by a video output mode, an image sequence's file name loses its extension and
+	becomes the name of the folder that its images are saved in
+
+	Parameters
+	----------
+	filename : str
+		The video file name, e.g. a project's default video file
+	mode : str
+		The video output mode, one of the keys of video_modes
+
+	Returns
+	-------
+	str
+		The file (or folder) name that the video is saved under
+	'''
+
+	return f"{splitext(filename)[0]}{video_modes[mode]['extension']}"
+
+
+def video_sink(filename:str, mode:str=None, frame_shape:tuple=None, frames_per_second:int=None, workers:int=None):
+	'''
+	This function builds the sink that saves the BRG-colorized frames of a model run in a video output mode as they arrive
+
+	Parameters
+	----------
+	filename : str
+		The name of the video file, or of the folder an image sequence is saved in
+	mode : str
+		The video output mode, one of the keys of video_modes, defaults to a pre-determined value
+	frame_shape : tuple
+		For a video, the (width, height) of a single frame of video, if not present it is worked out from the first chunk of frames
+	frames_per_second : int
+		For a video, the speed of the video
+	workers : int
+		For an image sequence, the number of threads that save images concurrently
+
+	Returns
+	-------
+	led.src.baseclasses.FrameSink
+		A led.src.sinks.VideoSink or, for an image sequence, a led.src.sinks.FrameSequenceSink
+	'''
+
+	mode = default_video_mode if (mode == None) else mode
+	if (mode not in video_modes):
+		raise Exception(f"if present, mode argument must be one of {', '.join(video_modes.keys())}, not {mode}")
+
+	if ("image_format" in video_modes[mode]):
+		return FrameSequenceSink(filename, video_modes[mode]["image_format"], workers)
+
+	return VideoSink(filename, frame_shape, video_modes[mode]["codec"], frames_per_second)
+
+
+def save_frame_sequence(frames:np.ndarray, folder:str, image_format:str, workers:int=None):
+	'''
+	This function saves a set of BRG-colorized frames as an image sequence, one file per frame, the frames are handed to a pool of threads a chunk at a time
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The BRG-colorized frames
+	folder : str
+		The folder the images are saved in, it is created if it does not exist
+	image_format : str
+		The format of each image, see led.src.sinks.FrameSequenceSink
+	workers : int
+		The number of threads that save images concurrently, defaults to the number of cores
+
+	Returns
+	-------
+	int
+		The number of images saved
+	'''
+
+	sequence_sink = FrameSequenceSink(folder, image_format, workers)
+	try:
+		sequence_sink.write(brg_frames=frames)
+	finally:
+		sequence_sink.close()
+
+	return sequence_sink.count
+
+def find_ffmpeg():
+	'''
+	This function looks for an FFmpeg executable, first on the PATH and then in the optional imageio-ffmpeg package
+
+	Returns
+	-------
+	str
+		The path to the FFmpeg executable, or None if there is not one
+	'''
+
+	ffmpeg = which("ffmpeg")
+	if (ffmpeg == None):
+		try:
+			import imageio_ffmpeg
+
+			ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
+		except Exception:
+			ffmpeg = None
+
+	return ffmpeg
+
+
+def encode_segment(frames:np.ndarray, filename:str, frame_shape:tuple, codec:str, frames_per_second:int):
+	'''
+	This function encodes one segment of frames into its own video file, it is the function that the worker processes run
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The segment's BRG-colorized frames
+	filename : str
+		The name of the segment's video file
+	frame_shape : tuple
+		The (width, height) of a single frame of video
+	codec : str
+		The identifier in OpenCV (cv2) of the CODEC that will generate the frames of video
+	frames_per_second : int
+		The speed of the video
+
+	Returns
+	-------
+	str
+		filename, once the segment has been written
+	'''
+
+	out_video = VideoSink(filename, frame_shape, codec, frames_per_second)
+	out_video.write(brg_frames=frames)
+	out_video.close()
+
+	return filename
+
+
+def concatenate_videos(segment_files:list, filename:str, ffmpeg:str=None):
+	'''
+	This function joins a set of video files that were encoded with the same settings into one video file, without encoding the frames again
+
+	Parameters
+	----------
+	segment_files : list[str]
+		The video files, in the order that they are joined, the list of files that FFmpeg reads is written (and removed) in the folder of the first one
+	filename : str
+		The name of the joined video file
+	ffmpeg : str
+		The path to the FFmpeg executable, defaults to the one found by find_ffmpeg
+	'''
+
+	ffmpeg = ffmpeg if (ffmpeg != None) else find_ffmpeg()
+	if (ffmpeg == None):
+		raise Exception("an FFmpeg executable is needed to join video files, none was found on the PATH or in the imageio-ffmpeg package")
+
+	if (len(segment_files) == 0):
+		raise Exception(f"at least one video file is needed to join into {filename}")
+
+	# The concat demuxer reads the list of files to join from a text file, every path in it is absolute and quoted
+	# It is written alongside the segments (for save_video_segments, in their temporary folder) so that it is never left next to the joined video
+	list_file = join(dirname(abspath(segment_files[0])), "segments.txt")
+	with open(list_file, "w") as file_out:
+		for segment_file in segment_files:
+			file_out.write("file '{}'\n".format(abspath(segment_file).replace("'", "'\\''")))
+
+	try:
+		completed = run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", list_file, "-c", "copy", filename], capture_output=True, text=True)
+		if (completed.returncode != 0):
+			raise Exception(f"FFmpeg could not join the video segments into {filename}:\n{completed.stderr}")
+	finally:
+		remove(list_file)
+
+
+def save_video_segments(frames:np.ndarray, filename:str, frame_shape:tuple, codec:str, frames_per_second:int, workers:int=None, segment_frames:int=None):
+	'''
+	This function encodes a set of frames into a video file by splitting them into segments, encoding the segments concurrently in worker processes and
+	joining the encoded segments into one file
+	When there is no FFmpeg executable to join the segments with, or the frames are too few to split, the frames are encoded in this process instead
+
+	Parameters
+	----------
+	frames : numpy.ndarray
+		The BRG-colorized frames
+	filename : str
+		The name of the file to which the video will be saved
+	frame_shape : tuple
+		The (width, height) of a single frame of video
+	codec : str
+		The identifier in OpenCV (cv2) of the CODEC that will generate the frames of video
+	frames_per_second : int
+		The speed of the video
+	workers : int
+		The number of worker processes, defaults to the number of cores
+	segment_frames : int
+		The smallest number of frames in a segment, defaults to a pre-determined value; there are never more segments than workers
+
+	Returns
+	-------
+	int
+		The number of segments that were encoded, one when the frames were encoded in this process
+	'''
+
+	workers = cpu_count() if (workers == None) else max(int(workers), 1)
+	segment_frames = default_segment_frames if (segment_frames == None) else max(int(segment_frames), 1)
+
+	segments = min(workers, frames.shape[0] // segment_frames)
+	ffmpeg = find_ffmpeg() if (segments > 1) else None
+
+	if (ffmpeg == None):
+		encode_segment(frames, filename, frame_shape, codec, frames_per_second)
+		return 1
+
+	# Split the frames into nearly equal segments, each encoded into a file with the same extension (and so the same container) as the final video
+	boundaries = np.linspace(0, frames.shape[0], segments + 1).astype(int)
+	extension = splitext(filename)[1]
+
+	with TemporaryDirectory() as segment_folder:
+		segment_files = [f"{segment_folder}/segment_{i:04d}{extension}" for i in range(segments)]
+
+		with ProcessPoolExecutor(max_workers=segments) as executor:
+			futures = [executor.submit(encode_segment, frames[boundaries[i] : boundaries[i + 1]], segment_files[i], frame_shape, codec, frames_per_second) for i in range(segments)]
+			for future in futures:
+				future.result()
+
+		concatenate_videos(segment_files, filename, ffmpeg)
+
+	return segments